@@ -5,10 +5,11 @@ All Watchers (Gmail, WhatsApp, FileSystem, etc.) inherit from BaseWatcher.
 Pattern from: F:\\Watcher\\watcher.md
 """
 
-import time
+import asyncio
 import logging
 import signal
 import sys
+import threading
 from pathlib import Path
 from abc import ABC, abstractmethod
 
@@ -35,6 +36,8 @@ class BaseWatcher(ABC):
         - create_action_file(item) -> Path : write a .md file to Needs_Action/
 
     The run() loop handles timing, error recovery, and graceful shutdown.
+    Push-driven subclasses call wake() to cut the current sleep short and
+    poll immediately; check_interval then acts as a safety-net poll.
     """
 
     def __init__(self, vault_path: str, check_interval: int = 60):
@@ -45,6 +48,7 @@ class BaseWatcher(ABC):
         self.check_interval = check_interval
         self.logger        = setup_logging(self.__class__.__name__)
         self._running      = True
+        self._wake         = threading.Event()
 
         self._ensure_folders()
         self._register_signals()
@@ -82,6 +86,23 @@ class BaseWatcher(ABC):
     def _handle_signal(self, signum, frame) -> None:
         self.logger.info(f"Received signal {signum} — shutting down gracefully.")
         self._running = False
+        self._wake.set()
+
+    def wake(self) -> None:
+        """Skip the rest of the current sleep so the next poll runs now.
+
+        Safe to call from any thread (webhook receivers, browser callbacks).
+        A wake that arrives mid-poll makes the following sleep return at once.
+        """
+        self._wake.set()
+
+    def _sleep(self, seconds: float) -> None:
+        """Wait between polls until the interval elapses or wake() is called.
+
+        Override when the watcher must keep servicing something while idle
+        (e.g. pumping Playwright events so page callbacks can fire).
+        """
+        self._wake.wait(seconds)
 
     def shutdown(self) -> None:
         """Override in subclass to release resources on exit."""
@@ -120,30 +141,113 @@ class BaseWatcher(ABC):
         )
 
         while self._running:
+            self._wake.clear()
             try:
-                items = self.check_for_updates()
-
-                if items:
-                    self.logger.info(f"Found {len(items)} new item(s) to process.")
-
-                for item in items:
-                    if not self._running:
-                        break
-                    try:
-                        path = self.create_action_file(item)
-                        if path:
-                            self.logger.info(f"Action file created: {path.name}")
-                    except Exception as item_err:
-                        self.logger.error(
-                            f"Failed to process item: {item_err}", exc_info=True
-                        )
-
+                self._process_items(self.check_for_updates())
             except Exception as poll_err:
                 self.logger.error(f"Poll error: {poll_err}", exc_info=True)
 
             if self._running:
                 self.logger.debug(f"Sleeping {self.check_interval}s until next poll…")
-                time.sleep(self.check_interval)
+                self._sleep(self.check_interval)
 
         self.shutdown()
         self.logger.info(f"{self.__class__.__name__} stopped.")
+
+    def _process_items(self, items: list) -> None:
+        """Write an action file per item; one bad item never stops the rest."""
+        if items:
+            self.logger.info(f"Found {len(items)} new item(s) to process.")
+
+        for item in items:
+            if not self._running:
+                break
+            try:
+                path = self.create_action_file(item)
+                if path:
+                    self.logger.info(f"Action file created: {path.name}")
+            except Exception as item_err:
+                self.logger.error(
+                    f"Failed to process item: {item_err}", exc_info=True
+                )
+
+
+class AsyncWatcherMixin(ABC):
+    """
+    asyncio run loop for watchers built on async libraries (playwright.async_api).
+
+    Mix in ahead of a concrete watcher and implement:
+        - async check_for_updates_async() -> list
+        - async shutdown_async()            (optional)
+
+    create_action_file() is reused unchanged (small local file writes).
+    run_async() polls, processes and sleeps like BaseWatcher.run(), but
+    awaits instead of blocking, so many watchers can share one event loop.
+    wake() stays callable from any thread.
+    """
+
+    _loop: asyncio.AbstractEventLoop | None = None
+    _async_wake: asyncio.Event | None = None
+
+    def _register_signals(self) -> None:
+        # Signals are handled by the event loop (run_async(handle_signals=True))
+        # or by whoever owns the loop (the orchestrator).
+        pass
+
+    def _handle_signal(self, signum, frame) -> None:
+        super()._handle_signal(signum, frame)
+        self.wake()
+
+    def wake(self) -> None:
+        super().wake()
+        if self._loop and self._async_wake:
+            self._loop.call_soon_threadsafe(self._async_wake.set)
+
+    @abstractmethod
+    async def check_for_updates_async(self) -> list:
+        """Poll the source (awaiting I/O) and return a list of new raw items."""
+        pass
+
+    async def shutdown_async(self) -> None:
+        """Override to release async resources on exit."""
+        pass
+
+    async def _sleep_async(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._async_wake.wait(), seconds)
+        except TimeoutError:
+            pass
+
+    async def run_async(self, handle_signals: bool = False) -> None:
+        """
+        Async loop: poll → process → sleep → repeat. Cancelling the task
+        (orchestrator shutdown) still runs shutdown_async().
+        """
+        self._loop = asyncio.get_running_loop()
+        self._async_wake = asyncio.Event()
+        if handle_signals:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    self._loop.add_signal_handler(sig, self._handle_signal, sig, None)
+                except NotImplementedError:
+                    pass    # Windows — Ctrl-C cancels asyncio.run() instead
+
+        self.logger.info(
+            f"Starting {self.__class__.__name__} (asyncio) "
+            f"| vault={self.vault_path} "
+            f"| interval={self.check_interval}s"
+        )
+        try:
+            while self._running:
+                self._async_wake.clear()
+                try:
+                    self._process_items(await self.check_for_updates_async())
+                except Exception as poll_err:
+                    self.logger.error(f"Poll error: {poll_err}", exc_info=True)
+
+                if self._running:
+                    self.logger.debug(f"Sleeping {self.check_interval}s until next poll…")
+                    await self._sleep_async(self.check_interval)
+        finally:
+            await self.shutdown_async()
+            self.logger.info(f"{self.__class__.__name__} stopped.")
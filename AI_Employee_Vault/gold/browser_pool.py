@@ -0,0 +1,333 @@
+"""
+browser_pool.py — Gold Tier shared Chromium for Playwright watchers
+
+By default the WhatsApp watcher runs its own persistent Chromium and the
+LinkedIn watcher launches a fresh one on every poll. When the orchestrator
+runs both, that is two or three Chromium process trees on one VM.
+
+BrowserBroker owns ONE Chromium for the whole process and hands out:
+
+  persistent_context()  The browser's default context, backed by the broker's
+                        user-data-dir (the WhatsApp session folder), for a
+                        watcher whose login lives in IndexedDB/localStorage.
+  connect()             A Browser handle on the shared Chromium; contexts the
+                        caller creates with browser.new_context() are
+                        isolated from each other (LinkedIn restores its own
+                        storage_state JSON into one).
+
+Sync Playwright objects are bound to the thread that created them, and the
+orchestrator runs every watcher in its own thread. So the broker does not
+share Playwright objects. It starts Chromium as a plain subprocess with a
+DevTools port, and each watcher thread attaches through its own
+sync_playwright() with chromium.connect_over_cdp(). A background thread
+health-checks the endpoint and relaunches Chromium if it dies or hangs.
+
+Enable from the orchestrator with BROWSER_SHARED=true. Standalone watcher
+runs (python whatsapp_watcher.py) are unaffected.
+
+Security: the DevTools port has no authentication. It binds 127.0.0.1 only,
+on a random port (--remote-debugging-port=0), but any process on the same
+machine that finds it can attach and drive the logged-in WhatsApp and
+LinkedIn sessions. A private Playwright launch uses a pipe instead. The
+broker makes the profile folder (which holds DevToolsActivePort, the file
+naming the port) readable by its owner only. Still, use BROWSER_SHARED only
+on a single-user machine or VM where every local process is trusted.
+
+Usage:
+    from browser_pool import BrowserBroker
+
+    broker = BrowserBroker.configure(user_data_dir="whatsapp_session")
+    ...
+    # inside a watcher thread
+    broker = BrowserBroker.shared()
+    browser = broker.connect(pw)
+    context = browser.new_context(storage_state=saved)
+    ...
+    browser.close()     # disconnects and drops this caller's contexts only
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Optional
+
+from browser_profile import launch_args
+
+logger = logging.getLogger(__name__)
+
+#: Desktop Chrome UA — headless Chromium's default "HeadlessChrome" UA is
+#: refused by WhatsApp Web.
+DESKTOP_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/121.0.0.0 Safari/537.36"
+)
+
+# What Playwright itself passes to Chromium, minus flags that only make sense
+# over --remote-debugging-pipe.
+BASE_ARGS: list[str] = [
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-sync",
+    "--disable-popup-blocking",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--password-store=basic",
+    "--use-mock-keychain",
+]
+
+HEALTH_CHECK_S    = 30      # seconds between endpoint probes
+LAUNCH_TIMEOUT_S  = 30      # wait for DevToolsActivePort after launch
+CONNECT_TIMEOUT_S = 60      # clients wait this long for a (re)launching browser
+
+
+def _resolve_executable() -> str:
+    """
+    Chromium binary Playwright installed. Resolved in a throwaway thread:
+    sync_playwright() refuses to start in a thread that already runs one.
+    """
+    override = os.getenv("BROWSER_EXECUTABLE")
+    if override:
+        return override
+
+    result: dict[str, Any] = {}
+
+    def _probe() -> None:
+        try:
+            from playwright.sync_api import sync_playwright
+            with sync_playwright() as pw:
+                result["path"] = pw.chromium.executable_path
+        except Exception as exc:
+            result["error"] = exc
+
+    t = threading.Thread(target=_probe, name="BrowserBroker:probe", daemon=True)
+    t.start()
+    t.join(LAUNCH_TIMEOUT_S)
+    if "path" not in result:
+        raise RuntimeError(f"Could not locate Playwright Chromium: {result.get('error', 'timeout')}")
+    return result["path"]
+
+
+class BrowserBroker:
+    """
+    One Chromium per process, shared by every Playwright watcher.
+
+    Args:
+        user_data_dir: Profile folder for the default (persistent) context.
+                       None uses a throwaway temp profile.
+        headless:      Launch without a window. Default True.
+        extra_args:    Additional Chromium flags.
+    """
+
+    _instance: Optional["BrowserBroker"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        user_data_dir: Optional[str | Path] = None,
+        headless: bool = True,
+        extra_args: tuple[str, ...] = (),
+    ):
+        self._temp_dir = None
+        if user_data_dir is None:
+            self._temp_dir = tempfile.TemporaryDirectory(prefix="ai-employee-chromium-")
+            user_data_dir = self._temp_dir.name
+        self.user_data_dir = Path(user_data_dir).resolve()
+        self.headless = headless
+        self.extra_args = tuple(extra_args)
+
+        self.relaunches = 0
+        self._proc: Optional[subprocess.Popen] = None
+        self._port: Optional[int] = None
+        self._lock = threading.RLock()
+        self._ready = threading.Event()
+        self._stop = threading.Event()
+        self._health_thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Process-wide singleton
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def configure(cls, **kwargs: Any) -> "BrowserBroker":
+        """Create (once) and start the shared broker. Later calls return it."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                broker = cls(**kwargs)
+                broker.start()      # raises → watchers keep launching their own
+                atexit.register(broker.stop)
+                cls._instance = broker
+            return cls._instance
+
+    @classmethod
+    def shared(cls) -> Optional["BrowserBroker"]:
+        """The configured broker, or None when watchers should launch their own."""
+        return cls._instance
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Launch Chromium and start the health-check thread."""
+        self._executable = _resolve_executable()
+        with self._lock:
+            self._launch()
+        self._health_thread = threading.Thread(
+            target=self._health_loop, name="BrowserBroker:health", daemon=True
+        )
+        self._health_thread.start()
+
+    def stop(self) -> None:
+        """Stop health checks and terminate Chromium (profile is flushed on SIGTERM)."""
+        self._stop.set()
+        with self._lock:
+            self._terminate()
+        if self._temp_dir:
+            self._temp_dir.cleanup()
+
+    def recycle(self, reason: str) -> None:
+        """
+        Restart Chromium on the same profile. Every connected watcher sees
+        its pages close and reconnects on its next poll.
+        """
+        with self._lock:
+            logger.warning("Relaunching shared Chromium — %s", reason)
+            self._terminate()
+            self._launch()
+            self.relaunches += 1
+
+    def _launch(self) -> None:
+        port_file = self.user_data_dir / "DevToolsActivePort"
+        port_file.unlink(missing_ok=True)
+        self.user_data_dir.mkdir(parents=True, exist_ok=True)
+        # Owner-only: other local users must not read DevToolsActivePort (or
+        # the session cookies next to it). No-op beyond read-only on Windows.
+        try:
+            os.chmod(self.user_data_dir, 0o700)
+        except OSError as exc:
+            logger.warning("Could not restrict %s to its owner: %s", self.user_data_dir, exc)
+
+        args = [
+            self._executable,
+            f"--user-data-dir={self.user_data_dir}",
+            "--remote-debugging-port=0",
+            "--remote-debugging-address=127.0.0.1",
+            f"--user-agent={DESKTOP_USER_AGENT}",
+            "--window-size=1280,900",
+            "--lang=en-GB",
+            *BASE_ARGS,
+            *launch_args("--no-sandbox", "--disable-blink-features=AutomationControlled",
+                         *self.extra_args),
+        ]
+        if self.headless:
+            args.append("--headless=new")
+        args.append("about:blank")
+
+        self._proc = subprocess.Popen(
+            args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+
+        # Chromium writes the chosen port to <profile>/DevToolsActivePort
+        deadline = time.monotonic() + LAUNCH_TIMEOUT_S
+        while time.monotonic() < deadline:
+            if self._proc.poll() is not None:
+                raise RuntimeError(f"Chromium exited on launch (code {self._proc.returncode})")
+            try:
+                self._port = int(port_file.read_text().splitlines()[0])
+                break
+            except (OSError, ValueError, IndexError):
+                time.sleep(0.2)
+        else:
+            self._terminate()
+            raise RuntimeError("Chromium did not open a DevTools port in time")
+
+        self._ready.set()
+        logger.info(
+            "Shared Chromium up (pid=%d, port=%d, profile=%s, headless=%s)",
+            self._proc.pid, self._port, self.user_data_dir, self.headless,
+        )
+
+    def _terminate(self) -> None:
+        self._ready.clear()
+        proc, self._proc = self._proc, None
+        if proc and proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        self._port = None
+
+    # ------------------------------------------------------------------
+    # Health checks
+    # ------------------------------------------------------------------
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._proc.pid if self._proc else None
+
+    def healthy(self) -> bool:
+        """True if Chromium is running and its DevTools endpoint answers."""
+        if not self._proc or self._proc.poll() is not None or not self._port:
+            return False
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{self._port}/json/version", timeout=5):
+                return True
+        except OSError:
+            return False
+
+    def _health_loop(self) -> None:
+        while not self._stop.wait(HEALTH_CHECK_S):
+            with self._lock:
+                if self._stop.is_set() or self.healthy():
+                    continue
+                try:
+                    self.recycle("health check failed")
+                except Exception as exc:
+                    logger.error("Shared Chromium relaunch failed: %s", exc)
+
+    # ------------------------------------------------------------------
+    # Client API — call from the watcher's own thread
+    # ------------------------------------------------------------------
+
+    def endpoint(self, timeout: float = CONNECT_TIMEOUT_S) -> str:
+        """CDP endpoint URL, waiting for a relaunch in progress."""
+        if not self._ready.wait(timeout):
+            raise RuntimeError("Shared Chromium is not available")
+        return f"http://127.0.0.1:{self._port}"
+
+    def connect(self, pw: Any) -> Any:
+        """
+        Attach the caller's Playwright instance. browser.close() on the
+        result disconnects and closes only the contexts this caller created.
+        """
+        return pw.chromium.connect_over_cdp(self.endpoint())
+
+    def owns(self, user_data_dir: str | Path) -> bool:
+        """True if user_data_dir is this broker's persistent profile."""
+        return Path(user_data_dir).resolve() == self.user_data_dir
+
+    def persistent_context(self, pw: Any, user_data_dir: str | Path) -> Optional[tuple[Any, Any]]:
+        """
+        (browser, default context) when user_data_dir is the broker's
+        profile, else None — the caller then launches its own persistent
+        context as before (one profile per Chromium).
+        """
+        if not self.owns(user_data_dir):
+            return None
+        browser = self.connect(pw)
+        return browser, browser.contexts[0]
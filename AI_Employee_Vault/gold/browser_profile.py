@@ -0,0 +1,390 @@
+"""
+browser_profile.py — Gold Tier lean Chromium profile for Playwright watchers
+
+The WhatsApp and LinkedIn watchers only read text (chat previews,
+notification cards), yet a default Chromium downloads every avatar, image,
+video, web font and analytics beacon on the page. This module provides:
+
+  LEAN_CHROMIUM_ARGS      Launch flags that switch off GPU compositing,
+                          shared-memory use and other background services
+                          Playwright does not already disable.
+  block_heavy_resources() Blocks images, media, fonts and trackers for one
+                          page. Blocking happens inside the browser through
+                          CDP Network.setBlockedURLs, so no request makes a
+                          round trip to Python. A Python-side page.route()
+                          handler would stall requests while the sync API
+                          sits idle between polls. On non-Chromium browsers
+                          it falls back to page.route() by resource type.
+  process_tree_usage()    RSS/PSS and CPU time of a process tree (default:
+                          this process's children), read from /proc.
+  find_browser_pid()      The Chromium browser process for a profile dir, so
+                          one watcher's browser can be measured on its own.
+  js_heap_mb()            Used JS heap of a page, via CDP.
+
+block_heavy_resources_async() and js_heap_mb_async() are the same helpers
+for playwright.async_api pages (the *_async watchers).
+
+Set BROWSER_LEAN=false in .env to launch a stock browser (e.g. to compare,
+or when debugging a layout problem with --no-headless).
+
+Measure before/after on the target VM:
+    python browser_profile.py --url https://web.whatsapp.com \\
+        --session whatsapp_session --seconds 120
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+#: Master switch — false launches browsers exactly as before.
+LEAN_ENABLED = os.getenv("BROWSER_LEAN", "true").lower() == "true"
+
+#: Added to each watcher's own args. Playwright already passes
+#: --disable-background-networking, --disable-sync, --disable-extensions,
+#: --mute-audio, --no-first-run etc.; --disable-features is deliberately NOT
+#: set here because Chromium keeps only the last occurrence and would drop
+#: Playwright's own list.
+LEAN_CHROMIUM_ARGS: list[str] = [
+    "--disable-gpu",
+    "--disable-gpu-compositing",
+    "--disable-software-rasterizer",
+    "--disable-dev-shm-usage",          # small /dev/shm on containers/VMs
+    "--disable-domain-reliability",
+    "--disable-breakpad",
+    "--disable-notifications",
+    "--disable-speech-api",
+    "--no-pings",
+    "--renderer-process-limit=2",
+]
+
+# URL patterns blocked inside the browser (CDP wildcard syntax).
+IMAGE_URL_PATTERNS: list[str] = [
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.ico*",
+    "*pps.whatsapp.net/*",              # WhatsApp profile pictures
+    "*media.licdn.com/dms/image/*",     # LinkedIn avatars and post images
+]
+MEDIA_URL_PATTERNS: list[str] = [
+    "*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*", "*.ogg*", "*.opus*",
+    "*mmg.whatsapp.net/*",              # WhatsApp media downloads
+    "*dms.licdn.com/playlist/*",        # LinkedIn video
+]
+FONT_URL_PATTERNS: list[str] = ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"]
+TRACKER_URL_PATTERNS: list[str] = [
+    "*google-analytics.com/*",
+    "*googletagmanager.com/*",
+    "*doubleclick.net/*",
+    "*px.ads.linkedin.com/*",
+    "*linkedin.com/li/track*",
+    "*linkedin.com/li/tscp*",
+    "*dit.whatsapp.net/*",              # WhatsApp telemetry
+    "*crashlogs.whatsapp.net/*",
+]
+
+# Fallback (non-CDP) blocking by Playwright resource type
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+TRACKER_HOST_FRAGMENTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "px.ads.linkedin.com", "/li/track", "/li/tscp",
+    "dit.whatsapp.net", "crashlogs.whatsapp.net",
+)
+
+
+def launch_args(*own_args: str) -> list[str]:
+    """Return the watcher's own launch args plus LEAN_CHROMIUM_ARGS (if enabled)."""
+    args = list(own_args)
+    if LEAN_ENABLED:
+        args += [a for a in LEAN_CHROMIUM_ARGS if a not in args]
+    return args
+
+
+def blocked_url_patterns(block_images: bool = True) -> list[str]:
+    """All CDP block patterns; images can be kept for headful logins/CAPTCHAs."""
+    patterns = MEDIA_URL_PATTERNS + FONT_URL_PATTERNS + TRACKER_URL_PATTERNS
+    if block_images:
+        patterns = IMAGE_URL_PATTERNS + patterns
+    return patterns
+
+
+def block_heavy_resources(page: Any, block_images: bool = True) -> bool:
+    """
+    Stop `page` from downloading media, fonts, trackers (and images unless
+    block_images=False). Returns True when blocking was installed.
+
+    Call once per page, before its first navigation. The blocking persists
+    across navigations of that page.
+    """
+    if not LEAN_ENABLED:
+        return False
+
+    patterns = blocked_url_patterns(block_images)
+    try:
+        cdp = page.context.new_cdp_session(page)
+        cdp.send("Network.enable")
+        cdp.send("Network.setBlockedURLs", {"urls": patterns})
+        logger.debug("Blocking %d URL pattern(s) via CDP", len(patterns))
+        return True
+    except Exception as exc:
+        logger.debug("CDP blocking unavailable (%s) — falling back to page.route()", exc)
+
+    types = BLOCKED_RESOURCE_TYPES if block_images else BLOCKED_RESOURCE_TYPES - {"image"}
+
+    def _route(route: Any) -> None:
+        request = route.request
+        if request.resource_type in types or any(f in request.url for f in TRACKER_HOST_FRAGMENTS):
+            route.abort()
+        else:
+            route.continue_()
+
+    try:
+        page.route("**/*", _route)
+        return True
+    except Exception as exc:
+        logger.warning("Could not install resource blocking: %s", exc)
+        return False
+
+
+async def block_heavy_resources_async(page: Any, block_images: bool = True) -> bool:
+    """block_heavy_resources() for a playwright.async_api page."""
+    if not LEAN_ENABLED:
+        return False
+
+    patterns = blocked_url_patterns(block_images)
+    try:
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Network.enable")
+        await cdp.send("Network.setBlockedURLs", {"urls": patterns})
+        logger.debug("Blocking %d URL pattern(s) via CDP", len(patterns))
+        return True
+    except Exception as exc:
+        logger.debug("CDP blocking unavailable (%s) — falling back to page.route()", exc)
+
+    types = BLOCKED_RESOURCE_TYPES if block_images else BLOCKED_RESOURCE_TYPES - {"image"}
+
+    # An async handler runs on the event loop, which never sits idle the way
+    # a sync Playwright thread does between polls
+    async def _route(route: Any) -> None:
+        request = route.request
+        if request.resource_type in types or any(f in request.url for f in TRACKER_HOST_FRAGMENTS):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    try:
+        await page.route("**/*", _route)
+        return True
+    except Exception as exc:
+        logger.warning("Could not install resource blocking: %s", exc)
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Resource measurement (Linux /proc — no psutil dependency)
+# ---------------------------------------------------------------------------
+
+def _read_stat(pid: int) -> Optional[tuple[int, float, int]]:
+    """Return (ppid, cpu_seconds, rss_bytes) for pid, or None if it vanished."""
+    try:
+        raw = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return None
+    # comm (field 2) may contain spaces and parentheses — split after the last ')'
+    fields = raw[raw.rfind(")") + 2:].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    ppid = int(fields[1])
+    cpu_s = (int(fields[11]) + int(fields[12])) / ticks
+    rss = int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+    return ppid, cpu_s, rss
+
+
+def _read_pss(pid: int) -> Optional[int]:
+    """Proportional set size in bytes (shared pages split between sharers)."""
+    try:
+        for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines():
+            if line.startswith("Pss:"):
+                return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def find_browser_pid(user_data_dir: str | Path) -> Optional[int]:
+    """
+    PID of the Chromium browser process launched with --user-data-dir equal
+    to user_data_dir (a persistent context's session folder). Renderer and
+    GPU processes carry the same flag; the browser is the one whose parent
+    does not. Returns None when not found or /proc is unavailable.
+    """
+    proc = Path("/proc")
+    if not proc.exists():
+        return None
+
+    target = Path(user_data_dir).resolve()
+    matches: set[int] = set()
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            argv = (entry / "cmdline").read_bytes().split(b"\0")
+        except OSError:
+            continue
+        for arg in argv:
+            if arg.startswith(b"--user-data-dir="):
+                value = arg[len(b"--user-data-dir="):].decode(errors="replace")
+                if Path(value).resolve() == target:
+                    matches.add(int(entry.name))
+                break
+
+    for pid in matches:
+        stat = _read_stat(pid)
+        if stat and stat[0] not in matches:
+            return pid
+    return None
+
+
+def js_heap_mb(page: Any) -> Optional[float]:
+    """Used JS heap of `page` in MB (CDP Runtime.getHeapUsage), or None."""
+    try:
+        cdp = page.context.new_cdp_session(page)
+        try:
+            usage = cdp.send("Runtime.getHeapUsage")
+        finally:
+            cdp.detach()
+        return round(usage["usedSize"] / 1_048_576, 1)
+    except Exception as exc:
+        logger.debug("JS heap sample failed: %s", exc)
+        return None
+
+
+async def js_heap_mb_async(page: Any) -> Optional[float]:
+    """js_heap_mb() for a playwright.async_api page."""
+    try:
+        cdp = await page.context.new_cdp_session(page)
+        try:
+            usage = await cdp.send("Runtime.getHeapUsage")
+        finally:
+            await cdp.detach()
+        return round(usage["usedSize"] / 1_048_576, 1)
+    except Exception as exc:
+        logger.debug("JS heap sample failed: %s", exc)
+        return None
+
+
+def process_tree_usage(root_pid: Optional[int] = None, include_root: bool = False) -> Optional[dict]:
+    """
+    Sum memory and CPU over every descendant of root_pid (default: this
+    process, i.e. the Playwright driver and all Chromium processes).
+
+    Returns {"processes", "rss_mb", "pss_mb", "cpu_s"} or None when /proc is
+    unavailable (non-Linux). rss_mb double-counts pages Chromium processes
+    share; pss_mb is the better figure for "how much RAM does this cost".
+    """
+    if not Path("/proc/self/stat").exists():
+        return None
+
+    root_pid = root_pid or os.getpid()
+    stats: dict[int, tuple[int, float, int]] = {}
+    for entry in Path("/proc").iterdir():
+        if entry.name.isdigit():
+            stat = _read_stat(int(entry.name))
+            if stat:
+                stats[int(entry.name)] = stat
+
+    children: dict[int, list[int]] = {}
+    for pid, (ppid, _, _) in stats.items():
+        children.setdefault(ppid, []).append(pid)
+
+    tree, stack = [], list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, []))
+    if include_root and root_pid in stats:
+        tree.append(root_pid)
+
+    rss = sum(stats[p][2] for p in tree)
+    pss = sum((_read_pss(p) or stats[p][2]) for p in tree)
+    cpu = sum(stats[p][1] for p in tree)
+    return {
+        "processes": len(tree),
+        "rss_mb":    round(rss / 1_048_576, 1),
+        "pss_mb":    round(pss / 1_048_576, 1),
+        "cpu_s":     round(cpu, 2),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Before/after benchmark
+# ---------------------------------------------------------------------------
+
+def _bench(url: str, session: Optional[str], seconds: int, lean: bool, headless: bool) -> dict:
+    from playwright.sync_api import sync_playwright
+
+    global LEAN_ENABLED
+    LEAN_ENABLED = lean
+    with sync_playwright() as pw:
+        args = launch_args("--no-sandbox", "--disable-blink-features=AutomationControlled")
+        if session:
+            context = pw.chromium.launch_persistent_context(session, headless=headless, args=args)
+            browser = None
+        else:
+            browser = pw.chromium.launch(headless=headless, args=args)
+            context = browser.new_context()
+        page = context.pages[0] if context.pages else context.new_page()
+        block_heavy_resources(page, block_images=headless)
+
+        start = process_tree_usage() or {}
+        page.goto(url, wait_until="domcontentloaded")
+        # Sample while the page settles and idles, keeping the peak
+        peak_pss = 0.0
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            page.wait_for_timeout(5_000)
+            sample = process_tree_usage() or {}
+            peak_pss = max(peak_pss, sample.get("pss_mb", 0.0))
+        end = process_tree_usage() or {}
+
+        context.close()
+        if browser:
+            browser.close()
+
+    return {
+        "processes":   end.get("processes"),
+        "rss_mb":      end.get("rss_mb"),
+        "pss_mb":      end.get("pss_mb"),
+        "peak_pss_mb": peak_pss,
+        "cpu_s":       round(end.get("cpu_s", 0.0) - start.get("cpu_s", 0.0), 2),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Compare browser RSS/CPU with the stock vs lean Chromium profile"
+    )
+    parser.add_argument("--url", default="https://web.whatsapp.com")
+    parser.add_argument("--session", default=None,
+                        help="Persistent profile dir (e.g. whatsapp_session) so the page is logged in")
+    parser.add_argument("--seconds", type=int, default=120, help="Idle time per run (default: 120)")
+    parser.add_argument("--no-headless", action="store_true")
+    args = parser.parse_args()
+
+    if process_tree_usage() is None:
+        print("Measurement needs Linux /proc", file=sys.stderr)
+        sys.exit(1)
+
+    results = {}
+    for label, lean in (("stock", False), ("lean", True)):
+        print(f"Running {label} profile for {args.seconds}s against {args.url} ...")
+        results[label] = _bench(args.url, args.session, args.seconds, lean, not args.no_headless)
+
+    print(f"\n{'metric':<14}{'stock':>10}{'lean':>10}")
+    for key in ("processes", "rss_mb", "pss_mb", "peak_pss_mb", "cpu_s"):
+        print(f"{key:<14}{results['stock'][key]!s:>10}{results['lean'][key]!s:>10}")
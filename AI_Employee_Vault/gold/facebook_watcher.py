@@ -10,16 +10,55 @@ Polls via Meta Graph API for:
 
 Creates structured .md files in Needs_Action/ for Claude to process.
 
+A poll is one HTTP round trip: every read above is a sub-request of a single
+Graph batch request (POST with batch=[...]). Comments come nested in the
+feed/media edges (field expansion), not one request per post. Each
+sub-request succeeds or fails on its own, so a missing permission for one
+edge does not lose the others. Requests go through the shared keep-alive
+/ HTTP/2 pool (http_pool.py), and every sub-request is revalidated with
+its last ETag, so an unchanged edge answers 304 without a body.
+
+Polling is incremental. The newest message / comment time seen is stored
+per stream (last_message_time, last_comment_time, last_ig_comment_time),
+edges are read newest first, and reading stops at that cursor. While a page
+is entirely newer than the cursor, its next page (Graph `after` cursor) is
+fetched in a follow-up batch — so a comment storm is read to the end
+instead of being cut at the first NESTED_LIMIT, and a quiet poll stays
+small. A storm deeper than MAX_ROUNDS pages saves its unread pages
+(resume_pages), each with the cursor it must read down to; the next poll
+continues from them while its own walk stops at the advanced cursor. On
+the very first run only the first page is read.
+
+Every poll also records its numbers (Page likes, IG followers, messages and
+comments seen) in the metrics store and refreshes the trend section of
+Social_Analytics/Facebook_Instagram_Summary.md (social_analytics.py).
+
+Webhook mode (opt-in, --webhook-port): a local receiver (webhook_server.py)
+accepts Meta webhook deliveries — Page messages, Page feed comments,
+Instagram comments — checks their X-Hub-Signature-256 against the app
+secret, and the events are written to Needs_Action/ right away. The Graph
+poll then only runs every check_interval as a reconciliation pass, picking
+up anything a delivery missed; seen IDs keep the two from writing the same
+event twice.
+
 State is persisted in .facebook_watcher_state.json.
 
 Requirements:
   - A Facebook Developer App with pages_messaging, pages_read_engagement,
     instagram_manage_comments, instagram_manage_insights permissions
   - A long-lived Page Access Token (never expires, unlike short-lived user tokens)
+  - Webhook mode only: the App Secret (META_APP_SECRET) and a verify token of
+    your choosing (META_VERIFY_TOKEN), entered in the App's Webhooks settings
 
 Usage:
     python facebook_watcher.py
     python facebook_watcher.py --vault /path/to/gold --interval 600
+    python facebook_watcher.py --webhook-port 8766 --interval 1800
+
+    Webhook mode: subscribe the App's Page (messages, feed) and Instagram
+    (comments) webhooks to https://<your-tunnel>/meta/webhook. Try it
+    locally without Meta:
+    python webhook_replay.py meta --port 8766 --app-secret <secret>
 
 Dependencies (install via uv):
     uv sync
@@ -27,16 +66,25 @@ Dependencies (install via uv):
 
 import argparse
 import hashlib
+import hmac
 import json
 import os
+import sqlite3
 import sys
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
+from urllib.parse import urlencode
 
 import httpx
 
 from base_watcher import BaseWatcher
 from audit_logger import log_action, log_watcher_start, log_watcher_stop, log_error
+from http_pool import ETagCache, shared_client
+from metrics_store import METRICS_DB_NAME, MetricsStore
+from social_analytics import render_summary
+from webhook_server import WebhookRequest, WebhookServer
 
 # ---------------------------------------------------------------------------
 # Meta Graph API base
@@ -44,6 +92,46 @@ from audit_logger import log_action, log_watcher_start, log_watcher_stop, log_er
 GRAPH_API_BASE = "https://graph.facebook.com/v19.0"
 STATE_FILE_NAME = ".facebook_watcher_state.json"
 
+CONVERSATIONS = 10      # conversations per page (sorted by last activity)
+FEED_POSTS    = 5       # latest Page posts whose comments are watched
+IG_MEDIA      = 5       # latest Instagram posts whose comments are watched
+NESTED_LIMIT  = 10      # messages/comments per conversation/post in the first batch
+PAGE_LIMIT    = 100     # per follow-up page, once more new items are known to exist
+MAX_ROUNDS    = 10      # batch round trips per poll (first batch + follow-up pages)
+SEEN_IDS_MAX  = 1000    # dedupe window for items at the cursor's timestamp
+
+MESSAGE_FIELDS    = "id,created_time,message,from"
+FB_COMMENT_FIELDS = "id,created_time,message,from"
+IG_COMMENT_FIELDS = "id,timestamp,text,username"
+
+# poll → (state cursor, metric series, log label, noun)
+POLLS = {
+    "page_messages": ("last_message_time",    "facebook.messages",  "Page messages",      "FB message(s)"),
+    "page_comments": ("last_comment_time",    "facebook.comments",  "Page comments",      "FB comment(s)"),
+    "ig_comments":   ("last_ig_comment_time", "instagram.comments", "Instagram comments", "IG comment(s)"),
+}
+
+
+# Webhook event type → the poll that also finds it
+EVENT_POLLS = {"fb_message": "page_messages", "fb_comment": "page_comments", "ig_comment": "ig_comments"}
+
+# ---------------------------------------------------------------------------
+# Webhook ingestion (opt-in) — Meta App Webhooks (page: messages, feed;
+# instagram: comments) → http://<host>:<port>/meta/webhook. Deliveries are
+# written immediately; check_interval becomes a reconciliation poll.
+# ---------------------------------------------------------------------------
+WEBHOOK_PATH = "/meta/webhook"
+
+
+class GraphAPIError(Exception):
+    """A Graph API (sub-)request answered with an error."""
+
+    def __init__(self, code: int, body: dict | None):
+        error = (body or {}).get("error") or {}
+        self.code = code
+        self.error = error
+        super().__init__(f"HTTP {code}: {error.get('message') or 'no response (batch timeout)'}")
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
@@ -63,25 +151,60 @@ def _load_state(vault_path: Path) -> dict:
         "last_ig_follower_count": 0,
         "seen_message_ids": [],
         "seen_comment_ids": [],
+        "resume_pages": [],
     }
 
 
 def _save_state(vault_path: Path, state: dict) -> None:
     # Keep seen ID lists bounded to avoid file bloat
-    state["seen_message_ids"] = state["seen_message_ids"][-200:]
-    state["seen_comment_ids"] = state["seen_comment_ids"][-200:]
+    state["seen_message_ids"] = state["seen_message_ids"][-SEEN_IDS_MAX:]
+    state["seen_comment_ids"] = state["seen_comment_ids"][-SEEN_IDS_MAX:]
     state_file = vault_path / STATE_FILE_NAME
     state_file.write_text(json.dumps(state, indent=2), encoding="utf-8")
 
 
+def _graph_time(value: str | None) -> float | None:
+    """Epoch seconds of a Graph timestamp ("2024-05-01T10:00:00+0000")."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z").timestamp()
+    except ValueError:
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            return None
+
+
+def _webhook_time(epoch: float | None) -> str:
+    """Graph-style timestamp for the epoch seconds in a webhook event (now if absent)."""
+    moment = datetime.fromtimestamp(epoch, timezone.utc) if epoch else datetime.now(timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S+0000")
+
+
 # ---------------------------------------------------------------------------
 # Watcher class
 # ---------------------------------------------------------------------------
 
 class FacebookWatcher(BaseWatcher):
-    """Polls Meta Graph API for Facebook Page and Instagram activity."""
-
-    def __init__(self, vault_path: str, check_interval: int = 600):
+    """
+    Polls Meta Graph API for Facebook Page and Instagram activity.
+
+    Args:
+        vault_path:     Root of the Obsidian vault.
+        check_interval: Seconds between Graph polls. Default 600.
+        webhook_port:   Start a local receiver for Meta webhooks on this
+                        port. Default None (poll only). Needs META_APP_SECRET.
+        webhook_host:   Interface for the receiver. Default 127.0.0.1.
+    """
+
+    def __init__(
+        self,
+        vault_path: str,
+        check_interval: int = 600,
+        webhook_port: int | None = None,
+        webhook_host: str = "127.0.0.1",
+    ):
         super().__init__(vault_path, check_interval)
         self.state = _load_state(self.vault_path)
 
@@ -95,167 +218,399 @@ class FacebookWatcher(BaseWatcher):
             )
             sys.exit(1)
 
-        self._http = httpx.Client(timeout=30.0)
+        self._http = shared_client()
+        self._etags = ETagCache()       # Graph sub-requests, keyed by relative URL
+        self.metrics = MetricsStore(self.vault_path / METRICS_DB_NAME)
+
+        # Per-poll scratch, reset by check_for_updates()
+        self._pending: dict[str, tuple] = {}            # next batch round
+        self._floor: str | None = None                  # cursor of the page being walked
+        self._found: dict[str, list[dict]] = {}         # poll → new items
+        self._newest: dict[str, tuple[float, str]] = {} # poll → newest timestamp seen
+        self._counts: dict[str, dict | Exception] = {}  # fan/follower count responses
+
+        # Webhook ingestion — the receiver thread queues parsed events and
+        # wakes the run loop, which writes them and polls Graph only when
+        # check_interval has passed since the last poll
+        self.app_secret   = os.environ.get("META_APP_SECRET", "")
+        self.verify_token = os.environ.get("META_VERIFY_TOKEN", "")
+        self._pushed: list[dict] = []
+        self._push_lock = threading.Lock()
+        self._last_poll = float("-inf")
+        self._webhook_server: WebhookServer | None = None
+        if webhook_port:
+            if not self.app_secret:
+                self.logger.error("Webhook mode needs META_APP_SECRET in .env to verify deliveries")
+                sys.exit(1)
+            self._webhook_server = WebhookServer(
+                webhook_port, {WEBHOOK_PATH: self._handle_webhook}, host=webhook_host
+            )
+            self._webhook_server.start()
 
     # ------------------------------------------------------------------
     # Graph API helpers
     # ------------------------------------------------------------------
 
-    def _graph_get(self, path: str, params: dict | None = None) -> dict:
-        """Make a GET request to the Graph API and return the JSON response."""
-        full_params = {"access_token": self.page_token}
-        if params:
-            full_params.update(params)
-        resp = self._http.get(f"{GRAPH_API_BASE}/{path}", params=full_params)
-        resp.raise_for_status()
-        return resp.json()
+    def _graph_batch(self, requests: dict[str, tuple[str, dict]]) -> dict[str, dict | Exception]:
+        """
+        Send several GETs as one Graph batch request.
+
+        Args:
+            requests: name → (path, params) of each GET.
+
+        Returns name → decoded JSON body, or the exception for that
+        sub-request (a failed batch call is the exception for every name).
+        """
+        names = list(requests)
+        urls = [f"{path}?{urlencode(params)}" if params else path for path, params in requests.values()]
+        batch = []
+        for url in urls:
+            sub = {"method": "GET", "relative_url": url}
+            # Revalidate what we already have — an unchanged edge answers 304, no body
+            validators = self._etags.validators(url)
+            if validators:
+                sub["headers"] = [f"{name}: {value}" for name, value in validators.items()]
+            batch.append(sub)
+        try:
+            resp = self._http.post(
+                f"{GRAPH_API_BASE}/",
+                data={
+                    "access_token": self.page_token,
+                    "batch": json.dumps(batch),
+                    "include_headers": "true",
+                },
+            )
+            resp.raise_for_status()
+            answers = resp.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            return {name: exc for name in names}
+
+        results: dict[str, dict | Exception] = {}
+        for name, url, answer in zip(names, urls, answers):
+            # A sub-request Meta could not finish in time comes back as null
+            code = (answer or {}).get("code", 0)
+            raw = answer.get("body") if answer else None
+            if code == 304 and (entry := self._etags.cached(url)):
+                raw, code = entry["content"], 200
+            elif code == 200 and raw:
+                headers = {h["name"].lower(): h["value"] for h in answer.get("headers") or []}
+                self._etags.store(url, headers, raw)
+            try:
+                body = json.loads(raw) if raw else None
+            except ValueError:
+                body = None
+            results[name] = body if code == 200 and body is not None else GraphAPIError(code, body)
+        return results
 
     # ------------------------------------------------------------------
     # Poll
     # ------------------------------------------------------------------
 
-    def check_for_updates(self) -> list[dict]:
-        """Poll Facebook/Instagram for new events."""
-        items: list[dict] = []
+    def _queue(self, poll: str, path: str, params: dict, handler, floor: str | None = None) -> None:
+        """
+        Add a GET to the next batch round; handler(poll, data, path, params).
+        floor: the cursor its walk stops at (None — the poll's stored cursor).
+        """
+        self._pending[f"{poll}:{path}?{params.get('after', '')}"] = (path, params, handler, floor)
+
+    def _queue_first_requests(self) -> None:
+        """The first batch: every edge of a poll, comments nested newest first."""
+        self._queue(
+            "page_messages", f"{self.page_id}/conversations",
+            {"fields": f"updated_time,messages.limit({NESTED_LIMIT}){{{MESSAGE_FIELDS}}}",
+             "limit": CONVERSATIONS},
+            self._on_conversations,
+        )
+        self._queue(
+            "page_comments", f"{self.page_id}/feed",
+            {"fields": f"comments.order(reverse_chronological).limit({NESTED_LIMIT})"
+                       f"{{{FB_COMMENT_FIELDS}}}",
+             "limit": FEED_POSTS},
+            self._on_feed,
+        )
+        self._queue("page_fans", self.page_id, {"fields": "fan_count"}, self._on_count)
+        if self.ig_id:
+            self._queue(
+                "ig_comments", f"{self.ig_id}/media",
+                {"fields": f"id,comments.limit({NESTED_LIMIT}){{{IG_COMMENT_FIELDS}}}",
+                 "limit": IG_MEDIA},
+                self._on_media,
+            )
+            self._queue("ig_followers", self.ig_id, {"fields": "followers_count"}, self._on_count)
 
-        try:
-            items.extend(self._poll_page_messages())
-        except Exception as exc:
-            self.logger.warning("Page messages poll failed: %s", exc)
-            log_error("facebook_watcher", "page_messages", str(exc))
+    def check_for_updates(self) -> list[dict]:
+        """
+        Webhook events received since the last call, plus a Graph poll when
+        it is due: always without a webhook receiver, otherwise once
+        check_interval has passed since the previous poll.
+        """
+        with self._push_lock:
+            pushed, self._pushed = self._pushed, []
+        items = self._take_pushed(pushed) if pushed else []
+        if not pushed or time.monotonic() - self._last_poll >= self.check_interval:
+            items += self._poll_graph()
+        return items
 
-        try:
-            items.extend(self._poll_page_comments())
-        except Exception as exc:
-            self.logger.warning("Page comments poll failed: %s", exc)
-            log_error("facebook_watcher", "page_comments", str(exc))
+    def _sleep(self, seconds: float) -> None:
+        # Webhook wakes must not push the reconciliation poll further out
+        if self._webhook_server:
+            seconds = max(0.0, self._last_poll + seconds - time.monotonic())
+        self._wake.wait(seconds)
+
+    def _poll_graph(self) -> list[dict]:
+        """
+        Poll Facebook/Instagram for new events: one batch request, then one
+        batch per round of follow-up pages while pages are still newer than
+        the stored cursors.
+        """
+        self._last_poll = time.monotonic()
+        polls = [poll for poll in POLLS if poll != "ig_comments" or self.ig_id]
+        self._found = {poll: [] for poll in polls}
+        self._newest = {}
+        self._counts = {}
+        self._pending = {}
+        self._queue_first_requests()
+        # Pages an earlier poll ran out of round trips for: [poll, path, params, handler, floor]
+        resumed = self.state.get("resume_pages") or []
+        for poll, path, params, handler, floor in resumed:
+            if poll in polls:
+                self._queue(poll, path, params, getattr(self, handler), floor)
+
+        failed: set[str] = set()
+        rounds = 0
+        while self._pending and rounds < MAX_ROUNDS:
+            rounds += 1
+            pending, self._pending = self._pending, {}
+            results = self._graph_batch(
+                {key: (path, params) for key, (path, params, *_) in pending.items()}
+            )
+            for key, (path, params, handler, floor) in pending.items():
+                poll = key.split(":", 1)[0]
+                if poll in failed:
+                    continue
+                try:
+                    result = results[key]
+                    if isinstance(result, Exception):
+                        raise result
+                    self._floor = floor
+                    handler(poll, result, path, params)
+                except Exception as exc:
+                    if poll not in POLLS:           # follower counts — checked below
+                        self._counts[poll] = exc
+                        continue
+                    failed.add(poll)
+                    self.logger.warning("%s poll failed: %s", POLLS[poll][2], exc)
+                    log_error("facebook_watcher", poll, str(exc))
+
+        self._floor = None
+
+        # Save the unread pages with the cursor they must read down to, so
+        # the next poll continues there (and its own walk stops at the new
+        # cursor). A failed poll keeps its cursor and retries what it resumed.
+        resume = []
+        for key, (path, params, handler, floor) in self._pending.items():
+            poll = key.split(":", 1)[0]
+            if poll not in failed:
+                resume.append([poll, path, params, handler.__name__, floor or self.state[POLLS[poll][0]]])
+        for poll in sorted({page[0] for page in resume}):
+            self.logger.warning(
+                "%s: still more after %d round trips — continuing from there next poll",
+                POLLS[poll][2], MAX_ROUNDS,
+            )
+        self.state["resume_pages"] = resume + [page for page in resumed if page[0] in failed]
 
-        if self.ig_id:
-            try:
-                items.extend(self._poll_ig_comments())
-            except Exception as exc:
-                self.logger.warning("Instagram comments poll failed: %s", exc)
-                log_error("facebook_watcher", "ig_comments", str(exc))
+        items: list[dict] = []
+        # Events seen per poll — a failed poll records nothing (a gap, not a zero)
+        counts: dict[str, int] = {}
+        for poll in polls:
+            cursor_key, series, _, noun = POLLS[poll]
+            found = self._found[poll]
+            items.extend(found)
+            if found:
+                self.logger.info("Found %d new %s", len(found), noun)
+            if poll in failed:
+                # Cursor kept: the next poll walks back here again (seen IDs dedupe)
+                continue
+            counts[series] = len(found)
+            # Only ever forward: a poll that read nothing but resumed (older)
+            # pages must not pull the cursor back below what it already passed
+            stamp, created = self._newest.get(poll, (None, None))
+            if stamp is not None and stamp > (_graph_time(self.state.get(cursor_key)) or float("-inf")):
+                self.state[cursor_key] = created
 
         try:
-            follower_item = self._check_follower_counts()
+            follower_item = self._check_follower_counts(
+                self._counts.get("page_fans"), self._counts.get("ig_followers")
+            )
             if follower_item:
                 items.append(follower_item)
         except Exception as exc:
             self.logger.warning("Follower count check failed: %s", exc)
 
+        self._record_metrics(counts)
         _save_state(self.vault_path, self.state)
         return items
 
-    def _poll_page_messages(self) -> list[dict]:
-        """Fetch new messages to the Facebook Page inbox."""
-        data = self._graph_get(
-            f"{self.page_id}/conversations",
-            {"fields": "messages{id,created_time,message,from}", "limit": 10},
-        )
-        items = []
-        conversations = data.get("data", [])
-
-        for conv in conversations:
-            messages = conv.get("messages", {}).get("data", [])
-            for msg in messages:
-                msg_id = msg.get("id")
-                if msg_id in self.state["seen_message_ids"]:
-                    continue
-
-                # Skip messages sent by the Page itself
-                sender = msg.get("from", {})
-                if str(sender.get("id")) == str(self.page_id):
-                    self.state["seen_message_ids"].append(msg_id)
-                    continue
-
-                items.append({
-                    "event_type": "fb_message",
-                    "id": msg_id,
-                    "sender_name": sender.get("name", "Unknown"),
-                    "sender_id": str(sender.get("id", "")),
-                    "text": msg.get("message", ""),
-                    "created_time": msg.get("created_time", datetime.now(timezone.utc).isoformat()),
-                })
-                self.state["seen_message_ids"].append(msg_id)
+    def _record_metrics(self, counts: dict[str, int]) -> None:
+        """Append this poll's counts to the metrics store and refresh the summary."""
+        try:
+            self.metrics.record(counts, kind="counter")
+            render_summary(self.vault_path, "facebook", self.metrics)
+        except (sqlite3.Error, OSError) as exc:
+            self.logger.warning("Could not record Facebook/Instagram metrics: %s", exc)
 
-        if items:
-            self.logger.info("Found %d new FB message(s)", len(items))
-        return items
+    # ------------------------------------------------------------------
+    # Cursor walk — edges are newest first; stop at the stored high-water mark
+    # ------------------------------------------------------------------
 
-    def _poll_page_comments(self) -> list[dict]:
-        """Fetch recent comments on Page posts."""
-        data = self._graph_get(
-            f"{self.page_id}/feed",
-            {"fields": "comments{id,created_time,message,from}", "limit": 5},
+    def _cursor(self, poll: str) -> float | None:
+        return _graph_time(self.state.get(POLLS[poll][0]))
+
+    def _walk(self, poll: str, page: dict, path: str, params: dict, time_key: str, take, handler) -> None:
+        """
+        Hand the entries of one newest-first page to take(poll, entry) until
+        one is older than the poll's cursor. If the whole page was newer,
+        queue the next page (after cursor) for the following batch round.
+        Without a cursor (first run) only the first page is read. Pages
+        resumed from an earlier poll stop at their own saved cursor (floor).
+        """
+        cursor = _graph_time(self._floor) if self._floor else self._cursor(poll)
+        for entry in page.get("data") or []:
+            stamp = _graph_time(entry.get(time_key))
+            if cursor is not None and stamp is not None and stamp < cursor:
+                return      # reached the cursor — older pages were seen before
+            take(poll, entry)
+
+        paging = page.get("paging") or {}
+        after = (paging.get("cursors") or {}).get("after")
+        if cursor is not None and paging.get("next") and after:
+            self._queue(poll, path, {**params, "after": after}, handler, self._floor)
+
+    def _mark_newest(self, poll: str, created: str | None) -> None:
+        stamp = _graph_time(created)
+        if stamp is not None and stamp > self._newest.get(poll, (float("-inf"), ""))[0]:
+            self._newest[poll] = (stamp, created)
+
+    def _on_count(self, poll: str, data: dict, path: str, params: dict) -> None:
+        self._counts[poll] = data
+
+    # Page messages: conversations (by updated_time) → messages
+
+    def _on_conversations(self, poll: str, data: dict, path: str, params: dict) -> None:
+        self._walk(poll, data, path, params, "updated_time", self._take_conversation, self._on_conversations)
+
+    def _take_conversation(self, poll: str, conv: dict) -> None:
+        self._walk(
+            poll, conv.get("messages") or {}, f"{conv['id']}/messages",
+            {"fields": MESSAGE_FIELDS, "limit": PAGE_LIMIT},
+            "created_time", self._take_message, self._on_messages,
         )
-        items = []
-        posts = data.get("data", [])
-
-        for post in posts:
-            comments = post.get("comments", {}).get("data", [])
-            for comment in comments:
-                comment_id = comment.get("id")
-                if comment_id in self.state["seen_comment_ids"]:
-                    continue
-
-                sender = comment.get("from", {})
-                if str(sender.get("id")) == str(self.page_id):
-                    self.state["seen_comment_ids"].append(comment_id)
-                    continue
 
-                items.append({
-                    "event_type": "fb_comment",
-                    "id": comment_id,
-                    "sender_name": sender.get("name", "Unknown"),
-                    "sender_id": str(sender.get("id", "")),
-                    "text": comment.get("message", ""),
-                    "created_time": comment.get("created_time", datetime.now(timezone.utc).isoformat()),
-                    "post_id": post.get("id", ""),
-                })
-                self.state["seen_comment_ids"].append(comment_id)
-
-        if items:
-            self.logger.info("Found %d new FB comment(s)", len(items))
-        return items
-
-    def _poll_ig_comments(self) -> list[dict]:
-        """Fetch recent comments on Instagram posts."""
-        data = self._graph_get(
-            f"{self.ig_id}/media",
-            {"fields": "id,timestamp,comments{id,timestamp,text,username}", "limit": 5},
+    def _on_messages(self, poll: str, data: dict, path: str, params: dict) -> None:
+        self._walk(poll, data, path, params, "created_time", self._take_message, self._on_messages)
+
+    def _take_message(self, poll: str, msg: dict) -> None:
+        msg_id = msg.get("id")
+        # Items already written (e.g. from a webhook) still advance the cursor
+        self._mark_newest(poll, msg.get("created_time"))
+        if msg_id in self.state["seen_message_ids"]:
+            return
+        self.state["seen_message_ids"].append(msg_id)
+
+        # Skip messages sent by the Page itself
+        sender = msg.get("from", {})
+        if str(sender.get("id")) == str(self.page_id):
+            return
+
+        self._found[poll].append({
+            "event_type": "fb_message",
+            "id": msg_id,
+            "sender_name": sender.get("name", "Unknown"),
+            "sender_id": str(sender.get("id", "")),
+            "text": msg.get("message", ""),
+            "created_time": msg.get("created_time", datetime.now(timezone.utc).isoformat()),
+        })
+
+    # Page comments: feed (latest FEED_POSTS posts) → comments
+
+    def _on_feed(self, poll: str, data: dict, path: str, params: dict) -> None:
+        for post in data.get("data") or []:
+            self._on_fb_comments(poll, post.get("comments") or {}, f"{post['id']}/comments", {
+                "fields": FB_COMMENT_FIELDS, "order": "reverse_chronological", "limit": PAGE_LIMIT,
+            })
+
+    def _on_fb_comments(self, poll: str, data: dict, path: str, params: dict) -> None:
+        post_id = path.split("/", 1)[0]
+        self._walk(
+            poll, data, path, params, "created_time",
+            lambda poll, comment: self._take_fb_comment(poll, comment, post_id),
+            self._on_fb_comments,
         )
-        items = []
-        media_list = data.get("data", [])
-
-        for media in media_list:
-            comments = media.get("comments", {}).get("data", [])
-            for comment in comments:
-                comment_id = comment.get("id")
-                if comment_id in self.state["seen_comment_ids"]:
-                    continue
 
-                items.append({
-                    "event_type": "ig_comment",
-                    "id": comment_id,
-                    "username": comment.get("username", "unknown"),
-                    "text": comment.get("text", ""),
-                    "created_time": comment.get("timestamp", datetime.now(timezone.utc).isoformat()),
-                    "media_id": media.get("id", ""),
-                })
-                self.state["seen_comment_ids"].append(comment_id)
-
-        if items:
-            self.logger.info("Found %d new IG comment(s)", len(items))
-        return items
+    def _take_fb_comment(self, poll: str, comment: dict, post_id: str) -> None:
+        comment_id = comment.get("id")
+        self._mark_newest(poll, comment.get("created_time"))
+        if comment_id in self.state["seen_comment_ids"]:
+            return
+        self.state["seen_comment_ids"].append(comment_id)
+
+        sender = comment.get("from", {})
+        if str(sender.get("id")) == str(self.page_id):
+            return
+
+        self._found[poll].append({
+            "event_type": "fb_comment",
+            "id": comment_id,
+            "sender_name": sender.get("name", "Unknown"),
+            "sender_id": str(sender.get("id", "")),
+            "text": comment.get("message", ""),
+            "created_time": comment.get("created_time", datetime.now(timezone.utc).isoformat()),
+            "post_id": post_id,
+        })
+
+    # Instagram comments: media (latest IG_MEDIA posts) → comments
+
+    def _on_media(self, poll: str, data: dict, path: str, params: dict) -> None:
+        for media in data.get("data") or []:
+            self._on_ig_comments(poll, media.get("comments") or {}, f"{media['id']}/comments", {
+                "fields": IG_COMMENT_FIELDS, "limit": PAGE_LIMIT,
+            })
+
+    def _on_ig_comments(self, poll: str, data: dict, path: str, params: dict) -> None:
+        media_id = path.split("/", 1)[0]
+        self._walk(
+            poll, data, path, params, "timestamp",
+            lambda poll, comment: self._take_ig_comment(poll, comment, media_id),
+            self._on_ig_comments,
+        )
 
-    def _check_follower_counts(self) -> dict | None:
+    def _take_ig_comment(self, poll: str, comment: dict, media_id: str) -> None:
+        comment_id = comment.get("id")
+        self._mark_newest(poll, comment.get("timestamp"))
+        if comment_id in self.state["seen_comment_ids"]:
+            return
+        self.state["seen_comment_ids"].append(comment_id)
+
+        self._found[poll].append({
+            "event_type": "ig_comment",
+            "id": comment_id,
+            "username": comment.get("username", "unknown"),
+            "text": comment.get("text", ""),
+            "created_time": comment.get("timestamp", datetime.now(timezone.utc).isoformat()),
+            "media_id": media_id,
+        })
+
+    def _check_follower_counts(
+        self, page_data: dict | Exception, ig_data: dict | Exception | None
+    ) -> dict | None:
         """Check for significant changes in Page fan count or IG follower count."""
         changes: dict = {}
 
         # Facebook Page likes/fans
-        page_data = self._graph_get(self.page_id, {"fields": "fan_count"})
+        if isinstance(page_data, Exception):
+            raise page_data
         fb_count = page_data.get("fan_count", 0)
+        gauges = {"facebook.fans": fb_count}
         fb_prev = self.state.get("last_page_fan_count", 0)
         if abs(fb_count - fb_prev) >= 10:
             changes["facebook"] = {"previous": fb_prev, "current": fb_count, "change": fb_count - fb_prev}
@@ -263,17 +618,160 @@ class FacebookWatcher(BaseWatcher):
 
         # Instagram followers
         if self.ig_id:
-            ig_data = self._graph_get(self.ig_id, {"fields": "followers_count"})
+            if isinstance(ig_data, Exception):
+                raise ig_data
             ig_count = ig_data.get("followers_count", 0)
+            gauges["instagram.followers"] = ig_count
             ig_prev = self.state.get("last_ig_follower_count", 0)
             if abs(ig_count - ig_prev) >= 10:
                 changes["instagram"] = {"previous": ig_prev, "current": ig_count, "change": ig_count - ig_prev}
             self.state["last_ig_follower_count"] = ig_count
 
+        try:
+            self.metrics.record(gauges, kind="gauge")
+        except sqlite3.Error as exc:
+            self.logger.warning("Could not record follower counts: %s", exc)
+
         if changes:
             return {"event_type": "follower_change", "changes": changes, "timestamp": datetime.now(timezone.utc).isoformat()}
         return None
 
+    # ------------------------------------------------------------------
+    # Webhook ingestion
+    # ------------------------------------------------------------------
+
+    def _handle_webhook(self, req: WebhookRequest) -> tuple[int, str]:
+        """
+        GET is Meta's subscription handshake: echo hub.challenge when
+        hub.verify_token matches META_VERIFY_TOKEN. POST is an event
+        delivery, accepted only with a valid X-Hub-Signature-256 (HMAC-SHA256
+        of the raw body, keyed with the app secret). Meta retries anything
+        but a 200, so only forged or malformed deliveries are rejected.
+        """
+        if req.method == "GET":
+            token = req.query.get("hub.verify_token", "").encode()
+            if (
+                req.query.get("hub.mode") == "subscribe"
+                and self.verify_token
+                and hmac.compare_digest(token, self.verify_token.encode())
+            ):
+                return 200, req.query.get("hub.challenge", "")
+            return 403, "verification failed"
+
+        expected = "sha256=" + hmac.new(self.app_secret.encode(), req.body, hashlib.sha256).hexdigest()
+        if not hmac.compare_digest(req.headers.get("x-hub-signature-256", "").encode(), expected.encode()):
+            self.logger.warning("Rejected Meta webhook with a missing or bad X-Hub-Signature-256")
+            return 403, "bad signature"
+
+        try:
+            events = self._parse_webhook(req.json())
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            self.logger.warning("Rejected malformed Meta webhook payload: %s", exc)
+            return 400, "malformed payload"
+
+        if events:
+            with self._push_lock:
+                self._pushed.extend(events)
+            self.logger.info("Meta webhook: %d event(s) queued", len(events))
+            self.wake()
+        return 200, "EVENT_RECEIVED"
+
+    def _parse_webhook(self, payload: dict) -> list[dict]:
+        """
+        Turn one delivery into items shaped like the poll's. Only new
+        messages and added comments for this Page / IG account are kept;
+        echoes of the Page's own messages and comments are dropped.
+        """
+        items: list[dict] = []
+        page_id = str(self.page_id)
+        kind = payload.get("object")
+        for entry in payload.get("entry") or []:
+            owner = str(entry.get("id", ""))
+
+            if kind == "page" and owner == page_id:
+                for event in entry.get("messaging") or []:
+                    msg = event.get("message") or {}
+                    sender_id = str((event.get("sender") or {}).get("id", ""))
+                    if not msg.get("mid") or msg.get("is_echo") or sender_id == page_id:
+                        continue
+                    items.append({
+                        "event_type": "fb_message",
+                        "id": msg["mid"],
+                        "sender_name": None,        # not in the payload — resolved on write
+                        "sender_id": sender_id,
+                        "text": msg.get("text", ""),
+                        "created_time": _webhook_time((event.get("timestamp") or 0) / 1000),
+                    })
+                for change in entry.get("changes") or []:
+                    value = change.get("value") or {}
+                    if (
+                        change.get("field") != "feed"
+                        or value.get("item") != "comment"
+                        or value.get("verb") != "add"
+                        or not value.get("comment_id")
+                    ):
+                        continue
+                    sender = value.get("from") or {}
+                    if str(sender.get("id")) == page_id:
+                        continue
+                    items.append({
+                        "event_type": "fb_comment",
+                        "id": value["comment_id"],
+                        "sender_name": sender.get("name", "Unknown"),
+                        "sender_id": str(sender.get("id", "")),
+                        "text": value.get("message", ""),
+                        "created_time": _webhook_time(value.get("created_time")),
+                        "post_id": value.get("post_id", ""),
+                    })
+
+            elif kind == "instagram" and self.ig_id and owner == str(self.ig_id):
+                for change in entry.get("changes") or []:
+                    value = change.get("value") or {}
+                    if change.get("field") != "comments" or not value.get("id"):
+                        continue
+                    items.append({
+                        "event_type": "ig_comment",
+                        "id": value["id"],
+                        "username": (value.get("from") or {}).get("username", "unknown"),
+                        "text": value.get("text", ""),
+                        "created_time": _webhook_time(entry.get("time")),
+                        "media_id": (value.get("media") or {}).get("id", ""),
+                    })
+        return items
+
+    def _take_pushed(self, events: list[dict]) -> list[dict]:
+        """
+        Keep the webhook events not written before, mark them seen and count
+        them. Cursors are left alone: only a Graph poll can vouch that
+        nothing older was missed.
+        """
+        items: list[dict] = []
+        counts: dict[str, int] = {}
+        for event in events:
+            seen = self.state["seen_message_ids" if event["event_type"] == "fb_message" else "seen_comment_ids"]
+            if event["id"] in seen:
+                continue
+            seen.append(event["id"])
+            items.append(event)
+            series = POLLS[EVENT_POLLS[event["event_type"]]][1]
+            counts[series] = counts.get(series, 0) + 1
+
+        self._resolve_senders(items)
+        if items:
+            self.logger.info("Meta webhook: %d new event(s), written without a Graph poll", len(items))
+            self._record_metrics(counts)
+        _save_state(self.vault_path, self.state)
+        return items
+
+    def _resolve_senders(self, items: list[dict]) -> None:
+        """Look up the names of message senders (one batch request for all)."""
+        unnamed = [item for item in items if item["event_type"] == "fb_message" and not item["sender_name"]]
+        ids = sorted({item["sender_id"] for item in unnamed})
+        results = self._graph_batch({sid: (sid, {"fields": "name"}) for sid in ids}) if ids else {}
+        for item in unnamed:
+            found = results.get(item["sender_id"])
+            item["sender_name"] = (found.get("name") if isinstance(found, dict) else None) or "Unknown"
+
     # ------------------------------------------------------------------
     # File creation
     # ------------------------------------------------------------------
@@ -442,15 +940,17 @@ _Add triage notes here._
         lines += [
             f"",
             f"## Action",
-            f"Update `Social_Analytics/Facebook_Instagram_Summary.md` with new counts.",
+            f"`Social_Analytics/Facebook_Instagram_Summary.md` already shows the new counts and",
+            f"their trend (generated by `social_analytics.py`) — no manual update needed.",
         ]
         file_path.write_text("\n".join(lines), encoding="utf-8")
         log_action("facebook_follower_change", "facebook_watcher", "Social_Analytics/Facebook_Instagram_Summary.md")
         return file_path
 
     def shutdown(self) -> None:
+        if self._webhook_server:
+            self._webhook_server.stop()
         _save_state(self.vault_path, self.state)
-        self._http.close()
         log_watcher_stop("facebook_watcher")
 
 
@@ -465,12 +965,21 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Facebook/Instagram Watcher for Gold AI Employee")
     parser.add_argument("--vault", default=vault_default)
     parser.add_argument("--interval", type=int, default=int(os.environ.get("FACEBOOK_INTERVAL", 600)))
+    parser.add_argument("--webhook-port", type=int, default=None,
+                        help="Receive Meta webhooks on this local port (needs META_APP_SECRET)")
+    parser.add_argument("--webhook-host", default="127.0.0.1",
+                        help="Interface for the webhook receiver (default: 127.0.0.1)")
     args = parser.parse_args()
 
     load_dotenv(Path(args.vault) / ".env")
 
     log_watcher_start("facebook_watcher")
-    watcher = FacebookWatcher(vault_path=args.vault, check_interval=args.interval)
+    watcher = FacebookWatcher(
+        vault_path=args.vault,
+        check_interval=args.interval,
+        webhook_port=args.webhook_port,
+        webhook_host=args.webhook_host,
+    )
     watcher.run()
 
 
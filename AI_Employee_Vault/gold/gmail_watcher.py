@@ -2,38 +2,61 @@
 gmail_watcher.py — Gmail Watcher for the Silver-tier AI Employee.
 
 Polls Gmail for unread important emails every 120 seconds.
-Creates a structured .md file in Needs_Action/ for each new message.
+Creates one structured .md file in Needs_Action/ per Gmail thread. Replies
+that arrive while the thread file is still pending are appended to it
+instead of producing a new file, so Claude drafts one reply per conversation.
 
 Architecture: Perception layer (Watcher) → Needs_Action/ → Claude (Reasoning) → Done/
 
+Multiple mailboxes (e.g. sales, billing, founder) can be watched by one
+watcher: they share credentials.json and a pooled HTTP session, are polled
+concurrently, and each keeps its own token_<name>.json and dedup state.
+
 Silver tier: HITL threshold is £50. New contacts always escalate to Pending_Approval/.
 Typically started by scheduler.py at 8 AM daily.
 
 Usage:
     python gmail_watcher.py
     python gmail_watcher.py --vault /path/to/silver --interval 120
+    python gmail_watcher.py --accounts sales billing founder
+    python gmail_watcher.py --push-port 8765 --interval 900
+
+    Push mode: point a Pub/Sub push subscription at
+    https://<your-tunnel>/gmail/push?token=<secret>; each notification
+    triggers an immediate fetch. Try it locally without Google:
+    python webhook_replay.py gmail --port 8765
 
-    First run will open a browser for Google OAuth consent.
-    Subsequent runs use the saved token.json automatically.
+    First run will open a browser for Google OAuth consent (once per mailbox).
+    Subsequent runs use the saved token.json / token_<name>.json automatically.
 
 Dependencies (install via uv):
     uv sync
 """
 
 import base64
+import hashlib
 import json
+import os
 import re
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 
+import httplib2
+import requests
+from google.auth.exceptions import RefreshError
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from googleapiclient.errors import HttpError
 
 from base_watcher import BaseWatcher
+from webhook_server import WebhookRequest, WebhookServer
 
 # ---------------------------------------------------------------------------
 # Gmail OAuth scope — read-only is sufficient for a watcher
@@ -49,17 +72,187 @@ URGENT_KEYWORDS = {
     "final notice", "action required", "time sensitive",
 }
 
+# ---------------------------------------------------------------------------
+# Follow-up messages in a thread are inserted just above this heading
+# ---------------------------------------------------------------------------
+THREAD_APPEND_MARKER = "## Suggested Actions"
+
+# ---------------------------------------------------------------------------
+# Mailboxes — "default" keeps the original token.json / state file names
+# ---------------------------------------------------------------------------
+DEFAULT_ACCOUNT = "default"
+HTTP_TIMEOUT_S  = 30
+
+# ---------------------------------------------------------------------------
+# Gmail API discovery document — cached on disk and in-process so startup and
+# watchdog restarts don't re-read and re-parse it every time
+# ---------------------------------------------------------------------------
+DISCOVERY_CACHE_FILE      = ".gmail_discovery_cache.json"
+DISCOVERY_CACHE_MAX_AGE_S = 7 * 24 * 3600
+DISCOVERY_URL             = "https://gmail.googleapis.com/$discovery/rest?version=v1"
+
+_discovery_doc: dict | None = None
+_discovery_lock = threading.Lock()
+
+# ---------------------------------------------------------------------------
+# Attachment stage (opt-in) — files are stored once under
+# Attachments/<sha256[:2]>/<sha256><ext>, so the same PDF sent to several
+# threads is written to disk a single time. Limits apply per message.
+# ---------------------------------------------------------------------------
+ATTACHMENTS_DIR      = "Attachments"
+ATTACHMENT_MAX_COUNT = int(os.environ.get("GMAIL_ATTACHMENT_MAX_COUNT", "5"))
+ATTACHMENT_MAX_BYTES = int(os.environ.get("GMAIL_ATTACHMENT_MAX_MB", "15")) * 1024 * 1024
+ATTACHMENT_WORKERS   = 4
+
+# ---------------------------------------------------------------------------
+# Push ingestion (opt-in) — Gmail → Pub/Sub topic → push subscription →
+# http://<host>:<port>/gmail/push. Each notification triggers an immediate
+# users.history.list() from the mailbox's last history ID (persisted with its
+# state); check_interval becomes a slow safety-net poll of the full list.
+# ---------------------------------------------------------------------------
+PUSH_PATH            = "/gmail/push"
+WATCH_RENEW_MARGIN_S = 24 * 3600   # users.watch() expires after 7 days
+
+
+class PooledHttp:
+    """
+    Minimal httplib2.Http stand-in that sends googleapiclient requests over a
+    shared requests.Session, so every mailbox reuses one keep-alive pool.
+
+    Each instance owns one account's credentials and refreshes them on its
+    own (on expiry, or once on a 401), calling on_refresh so the caller can
+    persist the new token.
+    """
+
+    def __init__(self, session: requests.Session, credentials, on_refresh=None):
+        self._session    = session
+        self.credentials = credentials
+        self._on_refresh = on_refresh
+        self._lock       = threading.Lock()
+
+    def _refresh(self, force: bool = False) -> None:
+        with self._lock:
+            if force or not self.credentials.valid:
+                self.credentials.refresh(Request(self._session))
+                if self._on_refresh:
+                    self._on_refresh(self.credentials)
+
+    def request(self, uri, method="GET", body=None, headers=None,
+                redirections=5, connection_type=None):
+        self._refresh()
+        for attempt in (1, 2):
+            req_headers = dict(headers or {})
+            self.credentials.apply(req_headers)
+            resp = self._session.request(
+                method, uri, data=body, headers=req_headers,
+                timeout=HTTP_TIMEOUT_S, allow_redirects=redirections > 0,
+            )
+            if resp.status_code != 401 or attempt == 2:
+                break
+            self._refresh(force=True)
+        info = {"status": str(resp.status_code), **resp.headers}
+        return httplib2.Response(info), resp.content
+
+    def warm_up(self, logger, account_name: str) -> None:
+        """
+        Refresh an expired token ahead of the first request. Run in a
+        background thread at startup; a failure is logged here and left for
+        request() to retry and surface.
+        """
+        try:
+            self._refresh()
+        except (RefreshError, requests.RequestException) as e:
+            logger.warning(f"[{account_name}] Background token refresh failed: {e}")
+
+    def close(self) -> None:
+        """No-op — the shared session outlives any one account."""
+        pass
+
+
+class GmailAccount:
+    """
+    One watched mailbox: its token file, Gmail service, and dedup state.
+
+    The "default" account uses token.json and .gmail_watcher_state.json so
+    single-mailbox vaults keep working unchanged. Named accounts use
+    token_<name>.json and .gmail_watcher_state_<name>.json.
+    """
+
+    def __init__(self, name: str, vault_path: Path):
+        self.name = name
+        suffix = "" if name == DEFAULT_ACCOUNT else f"_{name}"
+        self.token_path = vault_path / f"token{suffix}.json"
+        self.state_path = vault_path / f".gmail_watcher_state{suffix}.json"
+        self.service = None
+
+        # Persisted across restarts: processed message IDs, the
+        # thread → action file index, the mailbox address (used to route
+        # push notifications to this account), the users.watch() expiry, and
+        # the history ID push-triggered polls read from
+        self.processed_ids: set[str] = set()
+        self.thread_files: dict[str, str] = {}
+        self.email_address: str | None = None
+        self.watch_expires = 0.0   # epoch seconds; users.watch() registration
+        self.history_id: str | None = None
+
+    def load_state(self) -> None:
+        """Load processed IDs and the thread index from this account's state file."""
+        if self.state_path.exists():
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+            self.processed_ids = set(data.get("processed_ids", []))
+            self.thread_files = dict(data.get("thread_files", {}))
+            self.email_address = data.get("email_address")
+            self.watch_expires = float(data.get("watch_expires", 0.0))
+            self.history_id = data.get("history_id")
+
+    def save_state(self) -> None:
+        """Persist processed IDs to disk after every successful file creation."""
+        self.state_path.write_text(
+            json.dumps(
+                {
+                    "processed_ids": sorted(self.processed_ids),
+                    "thread_files": self.thread_files,
+                    "email_address": self.email_address,
+                    "watch_expires": self.watch_expires,
+                    "history_id":    self.history_id,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+    def save_token(self, creds) -> None:
+        """Persist refreshed credentials so the next run skips the browser."""
+        self.token_path.write_text(creds.to_json(), encoding="utf-8")
+
 
 class GmailWatcher(BaseWatcher):
     """
-    Watches Gmail for unread important messages and writes each one
-    as a structured .md file into the vault's Needs_Action/ folder.
+    Watches one or more Gmail mailboxes for unread important messages and
+    writes them as structured .md files into the vault's Needs_Action/ folder.
+
+    All mailboxes share one OAuth client (credentials.json) and one pooled
+    HTTP session, and are polled concurrently. Each keeps its own token and
+    dedup state.
 
     Args:
         vault_path:       Root of the Obsidian vault (current directory).
         credentials_path: Path to credentials.json downloaded from Google Cloud Console.
                           Defaults to credentials.json in the vault root.
         check_interval:   Seconds between Gmail polls. Default 120.
+        accounts:         Mailbox names, e.g. ["sales", "billing", "founder"].
+                          Default: one mailbox using token.json.
+        attachments:      Download attachments into content-addressed storage
+                          under Attachments/ and link them from the action
+                          file. Default False.
+        push_port:        Start a local receiver for Gmail Pub/Sub push
+                          notifications on this port. Default None (poll only).
+        push_token:       Shared secret the push subscription URL must carry
+                          as ?token=... Default None (no check).
+        push_topic:       Pub/Sub topic (projects/<id>/topics/<name>) to
+                          register with users.watch(). Default None — assume
+                          the watch is registered elsewhere.
+        push_host:        Interface for the push receiver. Default 127.0.0.1.
     """
 
     def __init__(
@@ -67,34 +260,69 @@ class GmailWatcher(BaseWatcher):
         vault_path: str = ".",
         credentials_path: str | None = None,
         check_interval: int = 120,
+        accounts: list[str] | None = None,
+        attachments: bool = False,
+        push_port: int | None = None,
+        push_token: str | None = None,
+        push_topic: str | None = None,
+        push_host: str = "127.0.0.1",
     ):
         super().__init__(vault_path, check_interval)
+        self.attachments_enabled = attachments
+        self.attachments_dir = self.vault_path / ATTACHMENTS_DIR
 
-        # Resolve credentials and token paths
+        # Resolve credentials path (shared OAuth client for every mailbox)
         self.credentials_path = (
             Path(credentials_path)
             if credentials_path
             else self.vault_path / "credentials.json"
         )
-        self.token_path = self.vault_path / "token.json"
 
-        # State file persists processed IDs across restarts
-        self.state_path = self.vault_path / ".gmail_watcher_state.json"
-        self.processed_ids: set[str] = self._load_state()
+        # One keep-alive pool for every mailbox's API traffic
+        names = accounts or [DEFAULT_ACCOUNT]
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=4, pool_maxsize=max(10, 2 * len(names))
+        )
+        self._session.mount("https://", adapter)
+        self._pool = ThreadPoolExecutor(
+            max_workers=len(names), thread_name_prefix="GmailPoll"
+        )
+        self._attachment_pool = ThreadPoolExecutor(
+            max_workers=ATTACHMENT_WORKERS, thread_name_prefix="GmailAttach"
+        )
 
-        # Authenticate and build the Gmail API service
-        self.service = self._authenticate()
+        self.accounts: dict[str, GmailAccount] = {}
+        for name in names:
+            account = GmailAccount(name, self.vault_path)
+            self._load_state(account)
+            account.service = self._authenticate(account)
+            self.accounts[name] = account
+
+        # Push ingestion — accounts named in notifications are polled on the
+        # next wake; a timer wake (nothing pushed) polls every account
+        self.push_token = push_token
+        self.push_topic = push_topic
+        self._pending_push: set[str] = set()
+        self._push_lock = threading.Lock()
+        self._push_server: WebhookServer | None = None
+        if push_port:
+            self._push_server = WebhookServer(
+                push_port, {PUSH_PATH: self._handle_push}, host=push_host
+            )
+            self._push_server.start()
 
     # ------------------------------------------------------------------
     # Authentication
     # ------------------------------------------------------------------
 
-    def _authenticate(self):
+    def _authenticate(self, account: GmailAccount):
         """
-        OAuth2 flow:
-          1. Load existing token.json if present.
-          2. Refresh expired token automatically.
-          3. If no token, open browser for user consent and save token.json.
+        OAuth2 flow for one mailbox:
+          1. Load the account's saved token file if present.
+          2. Refresh expired token in a background thread (off the startup
+             critical path — the first API call waits for it if needed).
+          3. If no token, open browser for user consent and save the token.
         """
         if not self.credentials_path.exists():
             self.logger.error(
@@ -106,52 +334,88 @@ class GmailWatcher(BaseWatcher):
 
         creds = None
 
-        if self.token_path.exists():
-            self.logger.info("Loading saved token from token.json")
-            creds = Credentials.from_authorized_user_file(str(self.token_path), SCOPES)
+        if account.token_path.exists():
+            self.logger.info(f"[{account.name}] Loading saved token from {account.token_path.name}")
+            creds = Credentials.from_authorized_user_file(str(account.token_path), SCOPES)
 
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                self.logger.info("Refreshing expired access token…")
-                creds.refresh(Request())
-            else:
-                self.logger.info(
-                    "No valid token found — launching browser for Google OAuth consent…"
-                )
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    str(self.credentials_path), SCOPES
-                )
-                creds = flow.run_local_server(port=0)
+        refresh_later = bool(creds and creds.expired and creds.refresh_token)
+
+        if not creds or (not creds.valid and not refresh_later):
+            self.logger.info(
+                f"[{account.name}] No valid token found — launching browser "
+                "for Google OAuth consent (sign in to this mailbox)…"
+            )
+            flow = InstalledAppFlow.from_client_secrets_file(
+                str(self.credentials_path), SCOPES
+            )
+            creds = flow.run_local_server(port=0)
 
             # Persist the token so next run skips the browser
-            self.token_path.write_text(creds.to_json(), encoding="utf-8")
-            self.logger.info(f"Token saved to {self.token_path}")
+            account.save_token(creds)
+            self.logger.info(f"[{account.name}] Token saved to {account.token_path}")
+
+        http = PooledHttp(self._session, creds, on_refresh=account.save_token)
+        if refresh_later:
+            self.logger.info(f"[{account.name}] Access token expired — refreshing in background…")
+            threading.Thread(
+                target=http.warm_up, args=(self.logger, account.name),
+                name=f"GmailToken-{account.name}", daemon=True,
+            ).start()
+
+        self.logger.info(f"[{account.name}] Gmail API authenticated successfully.")
+        return build_from_document(self._discovery_document(), http=http)
+
+    def _discovery_document(self) -> dict:
+        """
+        Return the parsed Gmail v1 discovery document.
+
+        Lookup order: in-process copy (watchdog restarts) → vault disk cache
+        (younger than DISCOVERY_CACHE_MAX_AGE_S) → the copy bundled with
+        google-api-python-client → Google's discovery endpoint. A freshly
+        loaded document is written back to the disk cache.
+        """
+        global _discovery_doc
+        with _discovery_lock:
+            if _discovery_doc is not None:
+                return _discovery_doc
 
-        self.logger.info("Gmail API authenticated successfully.")
-        return build("gmail", "v1", credentials=creds)
+            cache_path = self.vault_path / DISCOVERY_CACHE_FILE
+            doc = None
+            try:
+                if time.time() - cache_path.stat().st_mtime < DISCOVERY_CACHE_MAX_AGE_S:
+                    doc = json.loads(cache_path.read_text(encoding="utf-8"))
+            except (OSError, json.JSONDecodeError):
+                doc = None
+
+            if doc is None:
+                raw = get_static_doc("gmail", "v1")
+                if raw is None:
+                    resp = self._session.get(DISCOVERY_URL, timeout=HTTP_TIMEOUT_S)
+                    resp.raise_for_status()
+                    raw = resp.text
+                doc = json.loads(raw)
+                try:
+                    cache_path.write_text(raw, encoding="utf-8")
+                except OSError as e:
+                    self.logger.warning(f"Could not write discovery cache ({e})")
+
+            _discovery_doc = doc
+            return doc
 
     # ------------------------------------------------------------------
     # State persistence (processed IDs survive restarts)
     # ------------------------------------------------------------------
 
-    def _load_state(self) -> set[str]:
-        """Load the set of already-processed Gmail message IDs from disk."""
-        if self.state_path.exists():
-            try:
-                data = json.loads(self.state_path.read_text(encoding="utf-8"))
-                ids = set(data.get("processed_ids", []))
-                self.logger.info(f"Loaded {len(ids)} previously processed ID(s) from state.")
-                return ids
-            except (json.JSONDecodeError, KeyError) as e:
-                self.logger.warning(f"Could not read state file ({e}), starting fresh.")
-        return set()
-
-    def _save_state(self) -> None:
-        """Persist processed IDs to disk after every successful file creation."""
-        self.state_path.write_text(
-            json.dumps({"processed_ids": sorted(self.processed_ids)}, indent=2),
-            encoding="utf-8",
-        )
+    def _load_state(self, account: GmailAccount) -> None:
+        """Load an account's processed IDs and thread index, or start fresh."""
+        try:
+            account.load_state()
+            self.logger.info(
+                f"[{account.name}] Loaded {len(account.processed_ids)} "
+                "previously processed ID(s) from state."
+            )
+        except (json.JSONDecodeError, KeyError) as e:
+            self.logger.warning(f"[{account.name}] Could not read state file ({e}), starting fresh.")
 
     # ------------------------------------------------------------------
     # BaseWatcher interface — check_for_updates
@@ -159,113 +423,468 @@ class GmailWatcher(BaseWatcher):
 
     def check_for_updates(self) -> list:
         """
-        Query Gmail for unread important messages.
-        Returns only messages not yet in processed_ids.
+        Poll mailboxes concurrently for unread important messages.
+
+        After a push notification only the notified mailboxes are polled;
+        otherwise (the check_interval timer fired) every mailbox is.
+        Returns one item per thread — {"account", "thread_id", "message_ids"} —
+        holding only messages not yet processed for that account, oldest first.
         """
+        with self._push_lock:
+            pushed, self._pending_push = self._pending_push, set()
+        targets = [self.accounts[n] for n in pushed] if pushed else list(self.accounts.values())
+
+        futures = {
+            account.name: self._pool.submit(self._poll_account, account, bool(pushed))
+            for account in targets
+        }
+        items = []
+        for name, future in futures.items():
+            # One broken mailbox (e.g. a revoked token) must not cost the others their poll
+            try:
+                items.extend(future.result())
+            except Exception as e:
+                self.logger.error(f"[{name}] Gmail poll failed: {e}", exc_info=True)
+        return items
+
+    def _poll_account(self, account: GmailAccount, pushed: bool = False) -> list:
+        """
+        List one mailbox and group its new messages by thread.
+
+        A push-triggered poll reads only the messages added since the
+        account's history ID; the full unread-important list is fetched on
+        timer polls, and when that history is unavailable.
+        """
+        messages = self._list_history(account) if pushed and account.history_id else None
+        if self._push_server:
+            # After _list_history: a history ID it dropped (404) is re-taken here
+            self._ensure_push_registration(account)
+
+        if messages is None:
+            try:
+                result = (
+                    account.service.users()
+                    .messages()
+                    .list(userId="me", q="is:unread is:important", maxResults=20)
+                    .execute()
+                )
+            except (HttpError, RefreshError, requests.RequestException) as e:
+                self.logger.error(f"[{account.name}] Gmail API error during list: {e}")
+                return []
+            messages = result.get("messages", [])
+
+        new_messages = [m for m in messages if m["id"] not in account.processed_ids]
+
+        # Coalesce by thread. Gmail lists newest first, so walk the list in
+        # reverse to keep each thread's messages in arrival order.
+        threads: dict[str, list[str]] = {}
+        for m in reversed(new_messages):
+            threads.setdefault(m.get("threadId") or m["id"], []).append(m["id"])
+
+        self.logger.info(
+            f"[{account.name}] Gmail poll complete: {len(messages)} important unread, "
+            f"{len(new_messages)} new across {len(threads)} thread(s)."
+        )
+        return [
+            {"account": account.name, "thread_id": thread_id, "message_ids": ids}
+            for thread_id, ids in threads.items()
+        ]
+
+    def _list_history(self, account: GmailAccount) -> list[dict] | None:
+        """
+        Unread important messages added since account.history_id, newest
+        first like messages.list, and move history_id up to the mailbox's
+        current one. Returns None when the full list has to be used instead:
+        the start ID is older than Gmail keeps history for (404 — the ID is
+        dropped so a fresh one is taken), or the call failed.
+
+        Anything missed here (e.g. a message marked important only after it
+        arrived) is still picked up by the next timer poll's full list.
+        """
+        added: dict[str, dict] = {}
+        page_token = None
         try:
-            result = (
-                self.service.users()
-                .messages()
-                .list(userId="me", q="is:unread is:important", maxResults=20)
-                .execute()
-            )
+            while True:
+                resp = (
+                    account.service.users()
+                    .history()
+                    .list(
+                        userId="me",
+                        startHistoryId=account.history_id,
+                        historyTypes=["messageAdded"],
+                        pageToken=page_token,
+                    )
+                    .execute()
+                )
+                for record in resp.get("history", []):
+                    for entry in record.get("messagesAdded", []):
+                        msg = entry.get("message", {})
+                        if {"UNREAD", "IMPORTANT"} <= set(msg.get("labelIds", [])):
+                            added[msg["id"]] = msg
+                page_token = resp.get("nextPageToken")
+                if not page_token:
+                    break
         except HttpError as e:
-            self.logger.error(f"Gmail API error during list: {e}")
-            return []
+            if e.resp.status == 404:
+                self.logger.info(
+                    f"[{account.name}] History {account.history_id} has expired — "
+                    "falling back to a full list."
+                )
+                account.history_id = None
+            else:
+                self.logger.warning(f"[{account.name}] Gmail API error during history list: {e}")
+            return None
+        except (RefreshError, requests.RequestException) as e:
+            self.logger.warning(f"[{account.name}] Gmail API error during history list: {e}")
+            return None
 
-        messages = result.get("messages", [])
-        new_messages = [m for m in messages if m["id"] not in self.processed_ids]
+        account.history_id = resp.get("historyId") or account.history_id
+        account.save_state()
+        # History is oldest first
+        return list(reversed(added.values()))
 
+    # ------------------------------------------------------------------
+    # Push ingestion
+    # ------------------------------------------------------------------
+
+    def _handle_push(self, req: WebhookRequest) -> tuple[int, str]:
+        """
+        Accept one Pub/Sub push envelope:
+            {"message": {"data": base64({"emailAddress", "historyId"}), ...},
+             "subscription": "..."}
+        Queues the matching mailbox (all mailboxes if the address is unknown)
+        and wakes the run loop. Any 2xx acks the message; Pub/Sub retries
+        everything else, so only malformed payloads are rejected.
+        """
+        if req.method != "POST":
+            return 405, "POST only"
+        if self.push_token and req.query.get("token") != self.push_token:
+            return 403, "bad token"
+
+        try:
+            envelope = req.json()
+            data = json.loads(base64.b64decode(envelope["message"]["data"]))
+            address = str(data.get("emailAddress", "")).lower()
+        except (ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Rejected malformed Gmail push payload: {e}")
+            return 400, "malformed payload"
+
+        names = [
+            a.name for a in self.accounts.values()
+            if a.email_address and a.email_address.lower() == address
+        ] or list(self.accounts)
+        with self._push_lock:
+            self._pending_push.update(names)
         self.logger.info(
-            f"Gmail poll complete: {len(messages)} important unread, "
-            f"{len(new_messages)} new."
+            f"Gmail push for {address or 'unknown address'} "
+            f"(historyId {data.get('historyId', '?')}) → polling {names}"
         )
-        return new_messages
+        self.wake()
+        return 204, ""
+
+    def _ensure_push_registration(self, account: GmailAccount) -> None:
+        """
+        Learn the mailbox address (once, persisted) so notifications can be
+        routed, take a starting history ID for push-triggered polls if there
+        is none, and (re)register users.watch() when a topic is configured.
+        """
+        try:
+            if not account.email_address or not account.history_id:
+                profile = account.service.users().getProfile(userId="me").execute()
+                if not account.email_address:
+                    account.email_address = profile.get("emailAddress", "").lower() or None
+                if not account.history_id:
+                    # Taken before this poll's full list, so nothing falls between the two
+                    account.history_id = profile.get("historyId")
+                account.save_state()
+
+            if self.push_topic and time.time() > account.watch_expires - WATCH_RENEW_MARGIN_S:
+                resp = (
+                    account.service.users()
+                    .watch(userId="me", body={"topicName": self.push_topic, "labelIds": ["INBOX"]})
+                    .execute()
+                )
+                account.watch_expires = int(resp.get("expiration", 0)) / 1000
+                account.save_state()
+                self.logger.info(f"[{account.name}] Gmail push watch registered on {self.push_topic}")
+        except (HttpError, RefreshError, requests.RequestException) as e:
+            self.logger.warning(f"[{account.name}] Push registration failed: {e}")
 
     # ------------------------------------------------------------------
     # BaseWatcher interface — create_action_file
     # ------------------------------------------------------------------
 
-    def create_action_file(self, message: dict) -> Path | None:
+    def create_action_file(self, thread: dict) -> Path | None:
         """
-        Fetch full message details from Gmail API and write a structured
-        .md file to Needs_Action/.
+        Fetch the thread's new messages from Gmail API and write them to the
+        thread's action file in Needs_Action/.
+
+        If the thread already has an action file that is still pending
+        (not moved out of Needs_Action/ and status unchanged), the messages
+        are appended to it. Otherwise a fresh file is created.
 
         Frontmatter fields: type, gmail_id, thread_id, from, subject,
-                            date_sent, received, priority, status, source.
+                            date_sent, received, priority, status, source,
+                            message_count, account.
         """
-        msg_id = message["id"]
+        account   = self.accounts[thread.get("account", DEFAULT_ACCOUNT)]
+        thread_id = thread["thread_id"]
+
+        emails = [
+            e for e in (self._fetch_email(account, mid) for mid in thread["message_ids"])
+            if e
+        ]
+        if not emails:
+            return None
+
+        filepath = self._pending_thread_file(account, thread_id)
+        try:
+            if filepath:
+                content = self._append_messages(
+                    filepath.read_text(encoding="utf-8"), emails
+                )
+            else:
+                filepath, content = self._render_thread_file(account, thread_id, emails[0])
+                content = self._append_messages(content, emails[1:])
+            filepath.write_text(content, encoding="utf-8")
+        except OSError as e:
+            self.logger.error(f"Failed to write thread file for {thread_id}: {e}")
+            return None
+
+        # ---- Mark as processed and persist state ----
+        account.processed_ids.update(e["id"] for e in emails)
+        account.thread_files[thread_id] = filepath.name
+        account.save_state()
+
+        latest = emails[-1]
+        self.logger.info(
+            f"[{account.name}] Updated: {filepath.name} | +{len(emails)} message(s) | "
+            f"From: {latest['sender'][:50]} | Priority: {latest['priority']}"
+        )
+        return filepath
+
+    # ------------------------------------------------------------------
+    # Thread file helpers
+    # ------------------------------------------------------------------
 
-        # ---- Fetch full message ----
+    def _fetch_email(self, account: GmailAccount, msg_id: str) -> dict | None:
+        """Fetch one full message and reduce it to the fields we render."""
         try:
             msg = (
-                self.service.users()
+                account.service.users()
                 .messages()
                 .get(userId="me", id=msg_id, format="full")
                 .execute()
             )
-        except HttpError as e:
-            self.logger.error(f"Failed to fetch message {msg_id}: {e}")
+        except (HttpError, requests.RequestException) as e:
+            self.logger.error(f"[{account.name}] Failed to fetch message {msg_id}: {e}")
             return None
 
         # ---- Extract headers ----
         raw_headers = msg.get("payload", {}).get("headers", [])
         headers = {h["name"]: h["value"] for h in raw_headers}
 
-        sender      = headers.get("From", "Unknown")
-        subject     = headers.get("Subject", "(No Subject)")
-        date_sent   = headers.get("Date", "")
-        message_hdr = headers.get("Message-ID", "")
-        thread_id   = msg.get("threadId", "")
-        snippet     = msg.get("snippet", "")
-
-        # ---- Extract body text ----
+        subject   = headers.get("Subject", "(No Subject)")
+        snippet   = msg.get("snippet", "")
         body_text = self._extract_body(msg.get("payload", {}))
-        body_preview = self._truncate(body_text or snippet, max_chars=2000)
 
-        # ---- Determine priority ----
-        priority = self._detect_priority(subject, body_text, snippet)
+        attachments = []
+        if self.attachments_enabled:
+            attachments = self._store_attachments(
+                account, msg_id, self._attachment_parts(msg.get("payload", {}))
+            )
+
+        return {
+            "id":           msg_id,
+            "sender":       headers.get("From", "Unknown"),
+            "subject":      subject,
+            "date_sent":    headers.get("Date", ""),
+            "message_hdr":  headers.get("Message-ID", ""),
+            "body_preview": self._truncate(body_text or snippet, max_chars=2000),
+            "priority":     self._detect_priority(subject, body_text, snippet),
+            "attachments":  attachments,
+        }
+
+    # ------------------------------------------------------------------
+    # Attachment stage
+    # ------------------------------------------------------------------
+
+    def _attachment_parts(self, payload: dict) -> list[dict]:
+        """Walk the payload tree and collect every part that carries a filename."""
+        found = []
+        if payload.get("filename"):
+            body = payload.get("body", {})
+            found.append({
+                "filename":      payload["filename"],
+                "mime_type":     payload.get("mimeType", "application/octet-stream"),
+                "size":          int(body.get("size", 0)),
+                "attachment_id": body.get("attachmentId"),
+                "data":          body.get("data"),
+            })
+        for part in payload.get("parts", []):
+            found.extend(self._attachment_parts(part))
+        return found
+
+    def _store_attachments(
+        self, account: GmailAccount, msg_id: str, parts: list[dict]
+    ) -> list[dict]:
+        """
+        Apply the per-message count and size limits using the sizes Gmail
+        reports, then download the accepted parts concurrently.
+
+        Returns one entry per part, in message order: either stored
+        ({"filename", "mime_type", "size", "path"}) or skipped
+        ({"filename", "mime_type", "size", "skipped": reason}).
+        """
+        results: list[dict] = []
+        futures = {}
+        budget = ATTACHMENT_MAX_BYTES
+
+        for part in parts:
+            entry = {k: part[k] for k in ("filename", "mime_type", "size")}
+            if not part["data"] and not part["attachment_id"]:
+                # Filename but no body (e.g. a 0-byte file) — nothing to fetch
+                entry["skipped"] = "empty attachment"
+            elif len(futures) >= ATTACHMENT_MAX_COUNT:
+                entry["skipped"] = f"over {ATTACHMENT_MAX_COUNT}-attachment limit"
+            elif part["size"] > budget:
+                entry["skipped"] = f"over {ATTACHMENT_MAX_BYTES // (1024 * 1024)} MB per-message limit"
+            else:
+                budget -= part["size"]
+                futures[len(results)] = self._attachment_pool.submit(
+                    self._download_attachment, account, msg_id, part
+                )
+            results.append(entry)
+
+        for index, future in futures.items():
+            try:
+                results[index].update(future.result())
+            except Exception as e:
+                # One bad part must not cost the message — mark it and move on
+                self.logger.warning(
+                    f"[{account.name}] Attachment {results[index]['filename']!r} "
+                    f"on {msg_id} failed: {e}"
+                )
+                results[index]["skipped"] = "download failed"
+        return results
+
+    def _download_attachment(self, account: GmailAccount, msg_id: str, part: dict) -> dict:
+        """
+        Fetch one attachment and store it under its SHA-256. An existing file
+        with the same hash is reused as-is. Returns {"path", "size"} with the
+        path relative to the vault root.
+        """
+        data = part["data"]
+        if not data:
+            resp = (
+                account.service.users()
+                .messages()
+                .attachments()
+                .get(userId="me", messageId=msg_id, id=part["attachment_id"])
+                .execute()
+            )
+            data = resp.get("data", "")
+
+        raw = base64.urlsafe_b64decode(data)
+        if len(raw) > ATTACHMENT_MAX_BYTES:
+            raise ValueError(f"decoded size {len(raw)} exceeds per-message limit")
+
+        digest = hashlib.sha256(raw).hexdigest()
+        ext    = re.sub(r"[^\w.]", "", Path(part["filename"]).suffix.lower())[:10]
+        path   = self.attachments_dir / digest[:2] / f"{digest}{ext}"
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(raw)
+            tmp.replace(path)
+        else:
+            self.logger.debug(f"Attachment {part['filename']!r} already stored as {path.name}")
+
+        return {"path": path.relative_to(self.vault_path).as_posix(), "size": len(raw)}
+
+    @staticmethod
+    def _render_attachments(attachments: list[dict]) -> str:
+        """Markdown list of attachment links (relative to Needs_Action/ and Done/)."""
+        if not attachments:
+            return ""
+        lines = []
+        for a in attachments:
+            size_kb = max(1, a["size"] // 1024)
+            if a.get("path"):
+                lines.append(f"- [{a['filename']}](../{a['path']}) — {a['mime_type']}, {size_kb} KB")
+            else:
+                lines.append(f"- {a['filename']} — {a['mime_type']}, {size_kb} KB (not stored: {a['skipped']})")
+        return "**Attachments:**\n\n" + "\n".join(lines) + "\n\n"
+
+    def _pending_thread_file(self, account: GmailAccount, thread_id: str) -> Path | None:
+        """
+        Return the thread's action file if it can still be appended to.
+
+        A file counts as claimed once Claude has moved it out of
+        Needs_Action/ or changed its status from pending — later replies
+        then start a new file rather than editing work in progress.
+        """
+        name = account.thread_files.get(thread_id)
+        if not name:
+            return None
+        path = self.needs_action / name
+        try:
+            text = path.read_text(encoding="utf-8")
+        except OSError:
+            text = ""
+        if re.search(r"^status: pending$", text, re.MULTILINE):
+            return path
+        account.thread_files.pop(thread_id, None)
+        return None
+
+    def _render_thread_file(
+        self, account: GmailAccount, thread_id: str, email: dict
+    ) -> tuple[Path, str]:
+        """Build the filename and initial content for a new thread file."""
+        sender  = email["sender"]
+        subject = email["subject"]
 
         # ---- Build filename ----
         date_slug    = datetime.now().strftime("%Y-%m-%d")
         subject_slug = self._slugify(subject, max_len=45)
-        filename     = f"EMAIL_{date_slug}_{subject_slug}_{msg_id[:8]}.md"
-        filepath     = self.needs_action / filename
+        filename     = f"EMAIL_{date_slug}_{subject_slug}_{thread_id[:8]}.md"
 
         # ---- Timestamps ----
         received_iso = datetime.now(timezone.utc).isoformat()
 
-        # ---- Write .md file ----
         content = f"""\
 ---
 type: email
-gmail_id: "{msg_id}"
+gmail_id: "{email['id']}"
 thread_id: "{thread_id}"
-message_id_header: "{message_hdr}"
+message_id_header: "{email['message_hdr']}"
 from: "{self._escape_yaml(sender)}"
 subject: "{self._escape_yaml(subject)}"
-date_sent: "{date_sent}"
+date_sent: "{email['date_sent']}"
 received: "{received_iso}"
-priority: {priority}
+priority: {email['priority']}
 status: pending
 source: gmail
+account: "{account.name}"
+message_count: 1
 ---
 
 # {subject}
 
 **From:** {sender}
-**Date:** {date_sent}
+**Date:** {email['date_sent']}
 **Subject:** {subject}
 
 ---
 
 ## Email Body
 
-{body_preview}
+{email['body_preview']}
 
----
+{self._render_attachments(email['attachments'])}---
 
-## Suggested Actions
+{THREAD_APPEND_MARKER}
 
 - [ ] Reply to sender
 - [ ] Forward to relevant party
@@ -284,21 +903,70 @@ source: gmail
 
 *Captured by GmailWatcher at {received_iso}*
 """
+        return self.needs_action / filename, content
 
-        try:
-            filepath.write_text(content, encoding="utf-8")
-        except OSError as e:
-            self.logger.error(f"Failed to write file {filename}: {e}")
-            return None
+    def _append_messages(self, content: str, emails: list[dict]) -> str:
+        """
+        Insert each email as a follow-up section above Suggested Actions and
+        point the frontmatter at the newest message (so replies thread
+        correctly). Priority only ever escalates.
+        """
+        if not emails:
+            return content
+
+        count = int(self._frontmatter_value(content, "message_count") or 1)
+        priority = self._frontmatter_value(content, "priority") or "high"
+
+        blocks = []
+        for email in emails:
+            count += 1
+            if email["priority"] == "urgent":
+                priority = "urgent"
+            blocks.append(
+                f"## Follow-up {count - 1} — {email['sender']}\n\n"
+                f"**Date:** {email['date_sent']}\n\n"
+                f"{email['body_preview']}\n\n"
+                f"{self._render_attachments(email['attachments'])}"
+                f"---\n\n"
+            )
 
-        # ---- Mark as processed and persist state ----
-        self.processed_ids.add(msg_id)
-        self._save_state()
+        head, sep, tail = content.rpartition(THREAD_APPEND_MARKER)
+        if not sep:
+            head, tail = content.rstrip() + "\n\n---\n\n", ""
+        content = head + "".join(blocks) + sep + tail
+
+        latest = emails[-1]
+        for key, value in (
+            ("gmail_id",          f'"{latest["id"]}"'),
+            ("message_id_header", f'"{latest["message_hdr"]}"'),
+            ("date_sent",         f'"{latest["date_sent"]}"'),
+            ("priority",          priority),
+            ("message_count",     str(count)),
+            ("updated",           f'"{datetime.now(timezone.utc).isoformat()}"'),
+        ):
+            content = self._set_frontmatter(content, key, value)
+        return content
 
-        self.logger.info(
-            f"Created: {filename} | From: {sender[:50]} | Priority: {priority}"
-        )
-        return filepath
+    @staticmethod
+    def _frontmatter_value(content: str, key: str) -> str | None:
+        """Read one raw scalar from the leading YAML frontmatter block."""
+        _, _, rest = content.partition("---\n")
+        frontmatter, _, _ = rest.partition("\n---")
+        match = re.search(rf"^{re.escape(key)}: (.*)$", frontmatter, re.MULTILINE)
+        return match.group(1).strip().strip('"') if match else None
+
+    @staticmethod
+    def _set_frontmatter(content: str, key: str, value: str) -> str:
+        """Replace (or add) one key in the leading YAML frontmatter block."""
+        lead, sep, rest = content.partition("---\n")
+        frontmatter, end, body = rest.partition("\n---")
+        line = f"{key}: {value}"
+        pattern = rf"^{re.escape(key)}: .*$"
+        if re.search(pattern, frontmatter, re.MULTILINE):
+            frontmatter = re.sub(pattern, lambda _: line, frontmatter, count=1, flags=re.MULTILINE)
+        else:
+            frontmatter = f"{frontmatter}\n{line}"
+        return lead + sep + frontmatter + end + body
 
     # ------------------------------------------------------------------
     # Helper utilities
@@ -368,9 +1036,13 @@ source: gmail
         return text.replace('"', '\\"')
 
     def shutdown(self) -> None:
-        """Clean up the Gmail API HTTP connection on exit."""
+        """Stop the push receiver, the pools, and the shared Gmail HTTP session on exit."""
+        if self._push_server:
+            self._push_server.stop()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._attachment_pool.shutdown(wait=False, cancel_futures=True)
         try:
-            self.service.close()
+            self._session.close()
         except Exception:
             pass
         self.logger.info("Gmail API connection closed.")
@@ -402,11 +1074,48 @@ if __name__ == "__main__":
         default=120,
         help="Seconds between Gmail polls (default: 120)",
     )
+    parser.add_argument(
+        "--accounts",
+        nargs="+",
+        default=None,
+        metavar="NAME",
+        help=(
+            "Mailboxes to watch, each with its own token_<name>.json "
+            "(default: one mailbox using token.json). "
+            "Example: --accounts sales billing founder"
+        ),
+    )
+    parser.add_argument(
+        "--attachments",
+        action="store_true",
+        help="Download attachments into Attachments/ and link them from action files",
+    )
+    parser.add_argument(
+        "--push-port",
+        type=int,
+        default=None,
+        help="Receive Gmail Pub/Sub push notifications on this local port",
+    )
+    parser.add_argument(
+        "--push-token",
+        default=None,
+        help="Require ?token=<value> on push requests",
+    )
+    parser.add_argument(
+        "--push-topic",
+        default=None,
+        help="Pub/Sub topic to register via users.watch() (projects/<id>/topics/<name>)",
+    )
     args = parser.parse_args()
 
     watcher = GmailWatcher(
         vault_path=args.vault,
         credentials_path=args.credentials,
         check_interval=args.interval,
+        accounts=args.accounts,
+        attachments=args.attachments,
+        push_port=args.push_port,
+        push_token=args.push_token,
+        push_topic=args.push_topic,
     )
     watcher.run()
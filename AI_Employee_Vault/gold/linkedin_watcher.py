@@ -10,6 +10,17 @@ Uses Playwright to monitor LinkedIn notifications for:
 Creates structured .md files in Needs_Action/ for each actionable notification.
 Typically started by scheduler.py at 8 AM daily.
 
+The browser and logged-in context are kept alive across polls (like the
+WhatsApp watcher). Each poll loads the notifications and messaging views
+at the same time in two pages of that context, merges their items, then
+parks both pages on about:blank so they idle at ~0% CPU.
+Scraping is incremental: each view keeps a last-seen marker (newest API
+timestamp; in DOM mode the first already-processed card) and stops there,
+so the work per poll follows the amount of new activity.
+.linkedin_session.json is rewritten only when LinkedIn actually changes
+its cookies, and an expired session is detected on navigation and
+re-logged-in in place.
+
 Architecture: Playwright → LinkedIn → Needs_Action/ → Claude → Done/ or Pending_Approval/
 
 Usage:
@@ -18,6 +29,8 @@ Usage:
 
     Set LINKEDIN_EMAIL and LINKEDIN_PASSWORD in .env (or environment).
     Set HEADLESS=false to see the browser window (useful for first login / CAPTCHA).
+    Images, media, fonts and trackers are blocked while headless (see
+    browser_profile.py; BROWSER_LEAN=false launches a stock browser).
 
 Dependencies (install via uv):
     uv sync  (includes playwright)
@@ -29,6 +42,7 @@ import json
 import os
 import re
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -44,6 +58,8 @@ except ImportError:
     sys.exit(1)
 
 from base_watcher import BaseWatcher
+from browser_pool import BrowserBroker
+from browser_profile import block_heavy_resources, launch_args
 
 
 # ---------------------------------------------------------------------------
@@ -60,6 +76,118 @@ URGENT_KEYWORDS = {
     "urgent", "asap", "deadline", "time sensitive", "immediately",
 }
 
+NOTIFICATIONS_URL = "https://www.linkedin.com/notifications/"
+MESSAGING_URL     = "https://www.linkedin.com/messaging/"
+
+# Where LinkedIn sends a browser whose session cookie has expired
+LOGGED_OUT_URL_RE = re.compile(r"linkedin\.com/(login|authwall|uas/login|checkpoint/lg)")
+
+# ---------------------------------------------------------------------------
+# Network capture — LinkedIn's web app loads both views from its Voyager
+# JSON API. Parsing those payloads gives complete text and real URNs and is
+# independent of CSS class names.
+# ---------------------------------------------------------------------------
+
+NOTIFICATIONS_API_RE = re.compile(
+    r"/voyager/api/(voyagerIdentityDashNotificationCards|identity/notificationCards"
+    r"|graphql\?.*voyagerIdentityDashNotificationCards)"
+)
+MESSAGING_API_RE = re.compile(
+    r"/voyager/api/(voyagerMessagingGraphQL/graphql\?.*messengerConversations"
+    r"|messaging/conversations)"
+)
+NOTIFICATION_URN_PREFIXES = ("urn:li:fsd_notificationCard:", "urn:li:fs_notification")
+CONVERSATION_URN_PREFIXES = ("urn:li:msg_conversation:", "urn:li:fs_conversation:")
+API_CAPTURE_TIMEOUT_S     = 10
+
+
+def _walk_json(payload):
+    """Yield every dict nested anywhere in a decoded JSON payload, in document order."""
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+def _text(value) -> str:
+    """Flatten a LinkedIn TextViewModel ({"text": ...}) or plain string."""
+    if isinstance(value, dict):
+        value = value.get("text")
+    return value.strip() if isinstance(value, str) else ""
+
+
+def parse_notification_payload(payload) -> list[dict]:
+    """
+    Extract notification cards from a Voyager notifications response.
+    Returns [{id, text, link, published_at}] keyed by the card's entityUrn,
+    newest first as served (published_at is epoch ms, or None). Works on
+    both normalized ("included") and nested payloads.
+    """
+    cards: dict[str, dict] = {}
+    for node in _walk_json(payload):
+        urn = node.get("entityUrn") or ""
+        if not isinstance(urn, str) or not urn.startswith(NOTIFICATION_URN_PREFIXES):
+            continue
+        parts = [_text(node.get(key)) for key in ("headline", "contentPrimaryText", "subHeadline")]
+        text = "\n".join(p for p in parts if p)
+        if not text:
+            continue
+        action = node.get("cardAction") or {}
+        link = (
+            (action.get("actionTarget") if isinstance(action, dict) else None)
+            or node.get("navigationUrl")
+            or ""
+        )
+        cards.setdefault(urn, {
+            "id":           urn,
+            "text":         text,
+            "link":         link,
+            "published_at": node.get("publishedAt"),
+        })
+    return list(cards.values())
+
+
+def parse_conversation_payload(payload) -> list[dict]:
+    """
+    Extract conversations from a Voyager messaging response.
+    Returns [{id, text, link, unread, last_activity}] where text is
+    "Sender: last message" and last_activity is epoch ms (or None).
+    """
+    conversations: dict[str, dict] = {}
+    for node in _walk_json(payload):
+        urn = node.get("entityUrn") or node.get("backendUrn") or ""
+        if not isinstance(urn, str) or not urn.startswith(CONVERSATION_URN_PREFIXES):
+            continue
+        if "unreadCount" not in node and "read" not in node:
+            continue    # a reference to the conversation, not the conversation itself
+
+        names = []
+        for participant in node.get("conversationParticipants") or []:
+            member = ((participant or {}).get("participantType") or {}).get("member") or {}
+            if member.get("distance") == "SELF":
+                continue
+            name = " ".join(n for n in (_text(member.get("firstName")), _text(member.get("lastName"))) if n)
+            if name:
+                names.append(name)
+
+        messages = (node.get("messages") or {}).get("elements") or []
+        body = _text(messages[0].get("body")) if messages else ""
+        text = f"{', '.join(names) or 'LinkedIn member'}: {body}".strip()
+
+        unread = bool(node.get("unreadCount")) or node.get("read") is False
+        conversations.setdefault(urn, {
+            "id":     urn,
+            "text":   text,
+            "link":   node.get("conversationUrl") or "",
+            "unread": unread,
+            "last_activity": node.get("lastActivityAt"),
+        })
+    return list(conversations.values())
+
 
 class LinkedInWatcher(BaseWatcher):
     """
@@ -72,6 +200,8 @@ class LinkedInWatcher(BaseWatcher):
         vault_path:     Root of the Silver vault.
         check_interval: Seconds between LinkedIn polls. Default 300.
         headless:       Run browser in headless mode. Default True.
+        extract:        "network" (default) parses LinkedIn's API responses
+                        and falls back to the DOM; "dom" scrapes the DOM only.
     """
 
     SESSION_FILE = ".linkedin_session.json"
@@ -81,16 +211,32 @@ class LinkedInWatcher(BaseWatcher):
         vault_path: str = ".",
         check_interval: int = 300,
         headless: bool = True,
+        extract: str = "network",
     ):
         super().__init__(vault_path, check_interval)
 
         self.email    = os.getenv("LINKEDIN_EMAIL", "")
         self.password = os.getenv("LINKEDIN_PASSWORD", "")
         self.headless = headless
+        self.extract  = extract
 
         self.session_path = self.vault_path / self.SESSION_FILE
         self.state_path   = self.vault_path / ".linkedin_watcher_state.json"
+        # Last-seen marker per view (newest API timestamp already handled)
+        self.markers: dict[str, int] = {}
         self.processed_ids: set[str] = self._load_state()
+        # view → (marker value, IDs returned with it); promoted to
+        # self.markers once all those IDs have been processed
+        self._marker_candidates: dict[str, tuple[int, list[str]]] = {}
+
+        # Playwright objects — created by _ensure_browser(), kept across polls
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._page = None           # notifications view
+        self._inbox_page = None     # messaging view
+        # Fingerprint of the cookies last written to session_path
+        self._cookie_fingerprint: str | None = None
 
         if not self.email or not self.password:
             self.logger.error(
@@ -107,6 +253,7 @@ class LinkedInWatcher(BaseWatcher):
             try:
                 data = json.loads(self.state_path.read_text(encoding="utf-8"))
                 ids = set(data.get("processed_ids", []))
+                self.markers = data.get("markers", {})
                 self.logger.info(f"Loaded {len(ids)} processed LinkedIn notification IDs")
                 return ids
             except (json.JSONDecodeError, KeyError) as e:
@@ -115,7 +262,10 @@ class LinkedInWatcher(BaseWatcher):
 
     def _save_state(self) -> None:
         self.state_path.write_text(
-            json.dumps({"processed_ids": sorted(self.processed_ids)}, indent=2),
+            json.dumps(
+                {"processed_ids": sorted(self.processed_ids), "markers": self.markers},
+                indent=2,
+            ),
             encoding="utf-8",
         )
 
@@ -125,31 +275,32 @@ class LinkedInWatcher(BaseWatcher):
 
     def check_for_updates(self) -> list:
         """
-        Launch Playwright, log into LinkedIn, and scrape recent notifications.
+        Refresh the notifications and inbox views in the kept-alive browser
+        (launching and logging in first if needed) and scrape recent items.
         Returns a list of notification dicts for unseen items.
         """
         self.logger.info("Starting LinkedIn poll via Playwright...")
         notifications = []
+        self._promote_markers()
 
-        with sync_playwright() as pw:
-            browser = pw.chromium.launch(headless=self.headless)
-            context = self._get_context(browser)
-            page = context.new_page()
-
-            try:
-                notifications = self._scrape_notifications(page)
-            except PWTimeoutError as e:
-                self.logger.error(f"Playwright timeout during LinkedIn poll: {e}")
-            except Exception as e:
-                self.logger.error(f"LinkedIn poll error: {e}", exc_info=True)
-            finally:
-                # Save updated session state
-                state = context.storage_state()
-                self.session_path.write_text(
-                    json.dumps(state), encoding="utf-8"
-                )
-                browser.close()
-
+        try:
+            notif_page, inbox_page = self._ensure_browser()
+            notifications = self._scrape_views(notif_page, inbox_page)
+            self._save_session_if_changed()
+            # Park the tabs so LinkedIn's scripts don't run between polls
+            for page in (notif_page, inbox_page):
+                page.goto("about:blank")
+        except PWTimeoutError as e:
+            self.logger.error(f"Playwright timeout during LinkedIn poll: {e}")
+        except Exception as e:
+            self.logger.error(f"LinkedIn poll error: {e}", exc_info=True)
+            # Browser/context may be broken — relaunch on the next poll
+            self._teardown()
+
+        return self._unseen(notifications)
+
+    def _unseen(self, notifications: list) -> list:
+        """Items not processed yet, with the per-poll summary log line."""
         new_notifications = [
             n for n in notifications
             if n.get("id") and n["id"] not in self.processed_ids
@@ -160,20 +311,133 @@ class LinkedInWatcher(BaseWatcher):
         )
         return new_notifications
 
+    # ------------------------------------------------------------------
+    # Browser lifecycle (keep-alive across polls)
+    # ------------------------------------------------------------------
+
+    def _ensure_browser(self):
+        """
+        Start Playwright + a logged-in context if not already running.
+        Returns the (notifications, messaging) pages every poll reuses.
+        """
+        if all(p and not p.is_closed() for p in (self._page, self._inbox_page)):
+            return self._page, self._inbox_page
+
+        self._teardown()
+        self.logger.info("Launching Playwright Chromium (kept alive across polls)...")
+        self._playwright = sync_playwright().start()
+
+        # Shared Chromium (BROWSER_SHARED=true) or a private launch
+        broker = BrowserBroker.shared()
+        self._browser = (
+            broker.connect(self._playwright) if broker
+            else self._playwright.chromium.launch(headless=self.headless, args=launch_args())
+        )
+        self._context = self._get_context(self._browser)
+
+        # _get_context() leaves its login page open — reuse it, open the rest
+        pages = list(self._context.pages[:2])
+        while len(pages) < 2:
+            page = self._context.new_page()
+            block_heavy_resources(page, block_images=self.headless)
+            pages.append(page)
+        self._page, self._inbox_page = pages
+        return self._page, self._inbox_page
+
+    def _teardown(self) -> None:
+        """Close Playwright resources (the session file is left as it is)."""
+        try:
+            if self._browser:
+                self._browser.close()   # shared Chromium: disconnects only
+        except Exception:
+            pass
+        try:
+            if self._playwright:
+                self._playwright.stop()
+        except Exception:
+            pass
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._page = None
+        self._inbox_page = None
+
+    @staticmethod
+    def _fingerprint_cookies(cookies: list[dict]) -> str:
+        """
+        Hash of the cookies that identify the session. Expiry timestamps are
+        ignored — LinkedIn slides them on every request, which would
+        otherwise make every poll look like a change.
+        """
+        key = sorted(
+            (c.get("name", ""), c.get("domain", ""), c.get("path", ""), c.get("value", ""))
+            for c in cookies
+        )
+        return hashlib.sha256(json.dumps(key).encode()).hexdigest()
+
+    def _save_session_if_changed(self) -> None:
+        """Write storage_state to session_path only when cookies changed."""
+        fingerprint = self._fingerprint_cookies(self._context.cookies())
+        if fingerprint == self._cookie_fingerprint:
+            return
+        state = self._context.storage_state()
+        self.session_path.write_text(json.dumps(state), encoding="utf-8")
+        self._cookie_fingerprint = fingerprint
+        self.logger.debug("LinkedIn cookies changed — session file updated")
+
+    def _open_views(self, views: list[tuple], relogin: bool = True) -> list:
+        """
+        Navigate several pages at once and return those that loaded.
+
+        Each goto() returns at "commit", so the browser fetches and renders
+        all views concurrently; only then do we wait for each to reach
+        DOMContentLoaded. If LinkedIn bounced any view to its login page,
+        log in again on the first page and reload every view (once).
+        """
+        started = []
+        for page, url in views:
+            try:
+                page.goto(url, wait_until="commit")
+                started.append((page, url))
+            except PWTimeoutError:
+                self.logger.warning(f"{url} did not respond — skipping this view")
+
+        loaded = []
+        for page, url in started:
+            try:
+                page.wait_for_load_state("domcontentloaded")
+                loaded.append(page)
+            except PWTimeoutError:
+                self.logger.warning(f"{url} did not load in time — skipping this view")
+
+        if any(LOGGED_OUT_URL_RE.search(page.url) for page in loaded):
+            if not relogin:
+                raise RuntimeError("LinkedIn still logged out after re-login")
+            self.logger.warning("LinkedIn session expired — logging in again")
+            if not self._login(views[0][0]):
+                raise RuntimeError("LinkedIn re-login failed — see log above")
+            return self._open_views(views, relogin=False)
+        return loaded
+
     def _get_context(self, browser):
         """Return a browser context, restoring saved session if available."""
         if self.session_path.exists():
             try:
                 saved = json.loads(self.session_path.read_text(encoding="utf-8"))
-                return browser.new_context(storage_state=saved)
+                context = browser.new_context(storage_state=saved)
+                self._cookie_fingerprint = self._fingerprint_cookies(saved.get("cookies", []))
+                return context
             except Exception:
                 self.logger.warning("Saved LinkedIn session invalid, logging in fresh")
 
         context = browser.new_context()
         page = context.new_page()
+        block_heavy_resources(page, block_images=self.headless)
         ok = self._login(page)
         if not ok:
+            context.close()
             raise RuntimeError("LinkedIn login failed — see log above")
+        self._cookie_fingerprint = None     # force a save after this poll
         return context
 
     def _login(self, page) -> bool:
@@ -212,13 +476,169 @@ class LinkedInWatcher(BaseWatcher):
             )
             return False
 
-    def _scrape_notifications(self, page) -> list:
+    def _scrape_views(self, notif_page, inbox_page) -> list:
         """
-        Navigate to LinkedIn notifications page and extract recent items.
-        Returns a list of dicts with notification data.
+        Load the notifications and inbox views concurrently and extract
+        recent items from both, merged and de-duplicated by ID.
+
+        In "network" mode items come from LinkedIn's own Voyager API
+        responses (structured data, real URNs), recorded on both pages at
+        once. A view whose payloads cannot be parsed, e.g. after an API
+        change, is scraped from its rendered DOM instead.
         """
-        page.goto("https://www.linkedin.com/notifications/", wait_until="domcontentloaded")
+        network = self.extract == "network"
+        views = [
+            (notif_page, NOTIFICATIONS_URL, NOTIFICATIONS_API_RE),
+            (inbox_page, MESSAGING_URL, MESSAGING_API_RE),
+        ]
+        captured: dict[str, list] = {url: [] for _, url, _ in views}
+
+        listeners = []
+        if network:
+            for page, url, api_re in views:
+                listener = self._response_recorder(api_re, captured[url])
+                page.on("response", listener)
+                listeners.append((page, listener))
+        try:
+            loaded = self._open_views([(page, url) for page, url, _ in views])
+            if network:
+                # The SPA fetches its data right after DOMContentLoaded
+                deadline = time.monotonic() + API_CAPTURE_TIMEOUT_S
+                while (
+                    any(not captured[url] for page, url, _ in views if page in loaded)
+                    and time.monotonic() < deadline
+                ):
+                    notif_page.wait_for_timeout(200)   # pumps events for both pages
+        finally:
+            for page, listener in listeners:
+                page.remove_listener("response", listener)
+
+        items: list[dict] = []
+        if notif_page in loaded:
+            items += self._notifications_from(notif_page, self._decode(captured[NOTIFICATIONS_URL]))
+        if inbox_page in loaded:
+            items += self._inbox_from(inbox_page, self._decode(captured[MESSAGING_URL]))
+        return self._merge(items)
+
+    @staticmethod
+    def _merge(items: list[dict]) -> list[dict]:
+        """De-duplicate items by ID, keeping the first occurrence."""
+        merged: dict[str, dict] = {}
+        for item in items:
+            merged.setdefault(item["id"], item)
+        return list(merged.values())
 
+    @staticmethod
+    def _response_recorder(api_re: re.Pattern, sink: list):
+        """
+        page.on("response") listener that only collects matching responses.
+        Bodies are read afterwards — no Playwright calls inside the handler.
+        """
+        def _on_response(response) -> None:
+            if api_re.search(response.url) and response.ok:
+                sink.append(response)
+        return _on_response
+
+    def _decode(self, responses: list) -> list:
+        """JSON bodies of captured responses (unreadable ones are skipped)."""
+        payloads = []
+        for response in responses:
+            try:
+                payloads.append(response.json())
+            except Exception as e:
+                self.logger.debug(f"Unreadable API response {response.url[:120]}: {e}")
+        return payloads
+
+    def _notifications_from(self, page, payloads: list) -> list:
+        """Notification items from API payloads, or the DOM if none parse."""
+        items = self._notifications_from_payloads(payloads)
+        return items if items is not None else self._scrape_notifications_dom(page)
+
+    def _inbox_from(self, page, payloads: list) -> list:
+        """Unread inbox items from API payloads, or the DOM if none parse."""
+        items = self._inbox_from_payloads(payloads)
+        return items if items is not None else self._scrape_inbox_dom(page)
+
+    def _notifications_from_payloads(self, payloads: list) -> list | None:
+        """Notification items parsed from API payloads; None means use the DOM."""
+        if self.extract != "network":
+            return None
+        cards = [card for payload in payloads for card in parse_notification_payload(payload)]
+        if not cards:
+            self.logger.info("No notification API payload parsed — falling back to DOM scraping")
+            return None
+        return [
+            self._notification_item(card)
+            for card in self._since_marker("notifications", cards, "published_at")
+        ]
+
+    def _inbox_from_payloads(self, payloads: list) -> list | None:
+        """Unread inbox items parsed from API payloads; None means use the DOM."""
+        if self.extract != "network":
+            return None
+        conversations = [
+            conv for payload in payloads for conv in parse_conversation_payload(payload)
+        ]
+        if not conversations:
+            self.logger.info("No messaging API payload parsed — falling back to DOM scraping")
+            return None
+        unread = [conv for conv in conversations if conv["unread"]]
+        return [
+            {
+                "id":       conv["id"],
+                "text":     conv["text"][:800],
+                "link":     conv["link"] or MESSAGING_URL,
+                "category": "inbox_message",
+                "priority": self._detect_priority(conv["text"]),
+            }
+            for conv in self._since_marker("inbox", unread, "last_activity")
+        ]
+
+    def _since_marker(self, view: str, items: list[dict], ts_key: str) -> list[dict]:
+        """
+        Drop items at or before the view's last-seen marker and propose the
+        newest timestamp as the next marker. Items without a timestamp are
+        kept (dedup still applies).
+        """
+        since = self.markers.get(view)
+        fresh = [
+            item for item in items
+            if not (since and item.get(ts_key) and item[ts_key] <= since)
+        ]
+        newest = max((item.get(ts_key) or 0 for item in items), default=0)
+        if newest and newest != since:
+            self._marker_candidates[view] = (newest, [item["id"] for item in fresh])
+        if since:
+            self.logger.debug(f"{view}: {len(fresh)} of {len(items)} item(s) newer than marker")
+        return fresh
+
+    def _promote_markers(self) -> None:
+        """
+        Advance markers proposed last poll once every item returned with
+        them has been processed — a failed action-file write keeps the
+        marker where it was, so the item is offered again.
+        """
+        promoted = False
+        for view, (value, ids) in list(self._marker_candidates.items()):
+            if all(i in self.processed_ids for i in ids):
+                self.markers[view] = value
+                del self._marker_candidates[view]
+                promoted = True
+        if promoted:
+            self._save_state()
+
+    def _notification_item(self, card: dict) -> dict:
+        """Shape a parsed API notification card like the DOM scraper's items."""
+        return {
+            "id":       card["id"],
+            "text":     card["text"][:1000],
+            "link":     card["link"],
+            "category": self._categorise(card["text"]),
+            "priority": self._detect_priority(card["text"]),
+        }
+
+    def _scrape_notifications_dom(self, page) -> list:
+        """DOM fallback: read notification cards from the rendered page."""
         try:
             page.wait_for_selector(
                 ".nt-card-list, .notification-card, [data-urn]",
@@ -234,10 +654,15 @@ class LinkedInWatcher(BaseWatcher):
 
         for i, card in enumerate(cards[:20]):  # limit to 20 most recent
             try:
+                raw_urn  = card.get_attribute("data-urn") or ""
+                # Newest first — everything from an already-processed card down
+                # was seen by an earlier poll
+                if raw_urn in self.processed_ids:
+                    self.logger.debug(f"Notifications: stopped at processed card {i}")
+                    break
                 text     = card.inner_text().strip()
                 # Stable fallback ID: hash of position + first 120 chars of text.
                 # Never use time-based values — they change every poll and break dedup.
-                raw_urn  = card.get_attribute("data-urn") or ""
                 urn      = raw_urn or hashlib.sha256(f"notif:{i}:{text[:120]}".encode()).hexdigest()[:16]
                 link_el  = card.query_selector("a")
                 link     = link_el.get_attribute("href") if link_el else ""
@@ -255,16 +680,11 @@ class LinkedInWatcher(BaseWatcher):
             except Exception as e:
                 self.logger.warning(f"Error scraping notification {i}: {e}")
 
-        # Also check LinkedIn inbox for new messages
-        inbox_items = self._scrape_inbox(page)
-        notifications.extend(inbox_items)
-
         return notifications
 
-    def _scrape_inbox(self, page) -> list:
-        """Scrape unread messages from LinkedIn inbox."""
+    def _scrape_inbox_dom(self, page) -> list:
+        """DOM fallback: read unread conversation cards from the rendered inbox."""
         try:
-            page.goto("https://www.linkedin.com/messaging/", wait_until="domcontentloaded")
             page.wait_for_selector(".msg-conversation-card, .msg-overlay-list-bubble", timeout=8_000)
         except PWTimeoutError:
             return []
@@ -274,13 +694,17 @@ class LinkedInWatcher(BaseWatcher):
 
         for i, card in enumerate(cards[:10]):
             try:
-                text    = card.inner_text().strip()
                 raw_urn = card.get_attribute("data-entity-urn") or ""
+                if raw_urn in self.processed_ids:
+                    # Not a stop marker: a processed conversation keeps its URN
+                    # and jumps back to the top on every new message
+                    continue
+                text    = card.inner_text().strip()
                 urn     = raw_urn or hashlib.sha256(f"msg:{i}:{text[:120]}".encode()).hexdigest()[:16]
                 messages.append({
                     "id":       urn,
                     "text":     text[:800],
-                    "link":     "https://www.linkedin.com/messaging/",
+                    "link":     MESSAGING_URL,
                     "category": "inbox_message",
                     "priority": self._detect_priority(text),
                 })
@@ -429,6 +853,7 @@ source: linkedin
         return slug[:max_len].strip("_") or "notification"
 
     def shutdown(self) -> None:
+        self._teardown()
         self.logger.info("LinkedInWatcher stopped.")
 
 
@@ -445,11 +870,16 @@ if __name__ == "__main__":
     parser.add_argument("--vault", default=".", help="Path to vault root")
     parser.add_argument("--interval", type=int, default=300, help="Poll interval in seconds")
     parser.add_argument("--no-headless", action="store_true", help="Show browser window")
+    parser.add_argument(
+        "--extract", choices=["network", "dom"], default="network",
+        help="network: parse LinkedIn API responses (DOM fallback); dom: DOM scraping only",
+    )
     args = parser.parse_args()
 
     watcher = LinkedInWatcher(
         vault_path=args.vault,
         check_interval=args.interval,
         headless=not args.no_headless,
+        extract=args.extract,
     )
     watcher.run()
@@ -0,0 +1,380 @@
+"""
+linkedin_watcher_async.py — LinkedIn Watcher on playwright.async_api
+
+Same behaviour, state file, session file and action files as
+linkedin_watcher.py, but every browser call is awaited, so the watcher runs
+as a task on an asyncio event loop. The orchestrator's --asyncio mode runs it
+next to AsyncWhatsAppWatcher on one loop.
+
+The notifications and messaging views are loaded with asyncio.gather(): both
+navigations, API captures and DOM fallbacks run concurrently, and the loop
+services the response listeners while it waits (no wait_for_timeout pump).
+
+Payload parsing, markers, categorisation and the cookie fingerprint are
+inherited from LinkedInWatcher unchanged.
+
+Usage:
+    python linkedin_watcher_async.py --interval 300
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import sys
+
+try:
+    from playwright.async_api import async_playwright, TimeoutError as PWTimeoutError
+except ImportError:
+    print("ERROR: playwright not installed. Run: uv run playwright install chromium")
+    sys.exit(1)
+
+from base_watcher import AsyncWatcherMixin
+from browser_pool import BrowserBroker
+from browser_profile import block_heavy_resources_async, launch_args
+from linkedin_watcher import (
+    API_CAPTURE_TIMEOUT_S,
+    LOGGED_OUT_URL_RE,
+    MESSAGING_API_RE,
+    MESSAGING_URL,
+    NOTIFICATIONS_API_RE,
+    NOTIFICATIONS_URL,
+    LinkedInWatcher,
+)
+
+
+class AsyncLinkedInWatcher(AsyncWatcherMixin, LinkedInWatcher):
+    """
+    LinkedInWatcher driven by playwright.async_api. Run with
+    `await watcher.run_async()`; run() is not supported.
+
+    Args: as LinkedInWatcher.
+    """
+
+    # ------------------------------------------------------------------
+    # AsyncWatcherMixin interface
+    # ------------------------------------------------------------------
+
+    async def check_for_updates_async(self) -> list:
+        """Async check_for_updates(): unseen notifications and unread messages."""
+        self.logger.info("Starting LinkedIn poll via Playwright (asyncio)...")
+        notifications = []
+        self._promote_markers()
+
+        try:
+            notif_page, inbox_page = await self._ensure_browser_async()
+            notifications = await self._scrape_views_async(notif_page, inbox_page)
+            await self._save_session_if_changed_async()
+            await asyncio.gather(*(page.goto("about:blank") for page in (notif_page, inbox_page)))
+        except PWTimeoutError as e:
+            self.logger.error(f"Playwright timeout during LinkedIn poll: {e}")
+        except Exception as e:
+            self.logger.error(f"LinkedIn poll error: {e}", exc_info=True)
+            await self._teardown_async()
+
+        return self._unseen(notifications)
+
+    def check_for_updates(self) -> list:
+        raise RuntimeError("AsyncLinkedInWatcher runs under asyncio — use run_async()")
+
+    # ------------------------------------------------------------------
+    # Browser lifecycle (keep-alive across polls)
+    # ------------------------------------------------------------------
+
+    async def _ensure_browser_async(self):
+        """Async _ensure_browser(): the (notifications, messaging) pages."""
+        if all(p and not p.is_closed() for p in (self._page, self._inbox_page)):
+            return self._page, self._inbox_page
+
+        await self._teardown_async()
+        self.logger.info("Launching Playwright Chromium (asyncio, kept alive across polls)...")
+        self._playwright = await async_playwright().start()
+
+        broker = BrowserBroker.shared()
+        if broker:
+            endpoint = await asyncio.to_thread(broker.endpoint)
+            self._browser = await self._playwright.chromium.connect_over_cdp(endpoint)
+        else:
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.headless, args=launch_args()
+            )
+        self._context = await self._get_context_async(self._browser)
+
+        pages = list(self._context.pages[:2])
+        while len(pages) < 2:
+            page = await self._context.new_page()
+            await block_heavy_resources_async(page, block_images=self.headless)
+            pages.append(page)
+        self._page, self._inbox_page = pages
+        return self._page, self._inbox_page
+
+    async def _teardown_async(self) -> None:
+        try:
+            if self._browser:
+                await self._browser.close()
+        except Exception:
+            pass
+        try:
+            if self._playwright:
+                await self._playwright.stop()
+        except Exception:
+            pass
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._page = None
+        self._inbox_page = None
+
+    async def _save_session_if_changed_async(self) -> None:
+        fingerprint = self._fingerprint_cookies(await self._context.cookies())
+        if fingerprint == self._cookie_fingerprint:
+            return
+        state = await self._context.storage_state()
+        self.session_path.write_text(json.dumps(state), encoding="utf-8")
+        self._cookie_fingerprint = fingerprint
+        self.logger.debug("LinkedIn cookies changed — session file updated")
+
+    async def _get_context_async(self, browser):
+        if self.session_path.exists():
+            try:
+                saved = json.loads(self.session_path.read_text(encoding="utf-8"))
+                context = await browser.new_context(storage_state=saved)
+                self._cookie_fingerprint = self._fingerprint_cookies(saved.get("cookies", []))
+                return context
+            except Exception:
+                self.logger.warning("Saved LinkedIn session invalid, logging in fresh")
+
+        context = await browser.new_context()
+        page = await context.new_page()
+        await block_heavy_resources_async(page, block_images=self.headless)
+        if not await self._login_async(page):
+            await context.close()
+            raise RuntimeError("LinkedIn login failed — see log above")
+        self._cookie_fingerprint = None
+        return context
+
+    async def _login_async(self, page) -> bool:
+        """Async _login(). Returns True on success, False on failure."""
+        self.logger.info("Logging into LinkedIn...")
+        await page.goto("https://www.linkedin.com/login", wait_until="domcontentloaded")
+        await page.fill("#username", self.email)
+        await page.fill("#password", self.password)
+        await page.click('[type="submit"]')
+        try:
+            await page.wait_for_url(
+                re.compile(r"linkedin\.com/(feed|home|checkpoint|mynetwork)"),
+                timeout=45_000,
+            )
+            if "checkpoint" in page.url:
+                self.logger.warning(
+                    "LinkedIn checkpoint/CAPTCHA page detected. "
+                    "Complete it in the browser window, then wait..."
+                )
+                try:
+                    await page.wait_for_url(re.compile(r"linkedin\.com/feed"), timeout=60_000)
+                except PWTimeoutError:
+                    self.logger.error("Checkpoint not completed in time — will retry next poll")
+                    return False
+            self.logger.info("LinkedIn login successful")
+            return True
+        except PWTimeoutError:
+            self.logger.error(
+                "LinkedIn login timed out. "
+                "Run with --no-headless to complete any verification manually."
+            )
+            return False
+
+    # ------------------------------------------------------------------
+    # Scraping — both views concurrently
+    # ------------------------------------------------------------------
+
+    async def _open_view(self, page, url: str) -> bool:
+        try:
+            await page.goto(url, wait_until="domcontentloaded")
+            return True
+        except PWTimeoutError:
+            self.logger.warning(f"{url} did not load in time — skipping this view")
+            return False
+
+    async def _open_views_async(self, views: list[tuple], relogin: bool = True) -> list:
+        """Async _open_views(): navigate every page at once, re-login once if bounced."""
+        ok = await asyncio.gather(*(self._open_view(page, url) for page, url in views))
+        loaded = [page for (page, _), done in zip(views, ok) if done]
+
+        if any(LOGGED_OUT_URL_RE.search(page.url) for page in loaded):
+            if not relogin:
+                raise RuntimeError("LinkedIn still logged out after re-login")
+            self.logger.warning("LinkedIn session expired — logging in again")
+            if not await self._login_async(views[0][0]):
+                raise RuntimeError("LinkedIn re-login failed — see log above")
+            return await self._open_views_async(views, relogin=False)
+        return loaded
+
+    async def _scrape_views_async(self, notif_page, inbox_page) -> list:
+        """Async _scrape_views(): load, capture and extract both views concurrently."""
+        network = self.extract == "network"
+        views = [
+            (notif_page, NOTIFICATIONS_URL, NOTIFICATIONS_API_RE),
+            (inbox_page, MESSAGING_URL, MESSAGING_API_RE),
+        ]
+        captured: dict[str, list] = {url: [] for _, url, _ in views}
+
+        listeners = []
+        if network:
+            for page, url, api_re in views:
+                listener = self._response_recorder(api_re, captured[url])
+                page.on("response", listener)
+                listeners.append((page, listener))
+        try:
+            loaded = await self._open_views_async([(page, url) for page, url, _ in views])
+            if network:
+                loop = asyncio.get_running_loop()
+                deadline = loop.time() + API_CAPTURE_TIMEOUT_S
+                while (
+                    any(not captured[url] for page, url, _ in views if page in loaded)
+                    and loop.time() < deadline
+                ):
+                    await asyncio.sleep(0.2)
+        finally:
+            for page, listener in listeners:
+                page.remove_listener("response", listener)
+
+        async def _notifications() -> list:
+            if notif_page not in loaded:
+                return []
+            items = self._notifications_from_payloads(
+                await self._decode_async(captured[NOTIFICATIONS_URL])
+            )
+            return items if items is not None else await self._scrape_notifications_dom_async(notif_page)
+
+        async def _inbox() -> list:
+            if inbox_page not in loaded:
+                return []
+            items = self._inbox_from_payloads(await self._decode_async(captured[MESSAGING_URL]))
+            return items if items is not None else await self._scrape_inbox_dom_async(inbox_page)
+
+        notifications, inbox = await asyncio.gather(_notifications(), _inbox())
+        return self._merge(notifications + inbox)
+
+    async def _decode_async(self, responses: list) -> list:
+        """JSON bodies of captured responses, read concurrently."""
+        bodies = await asyncio.gather(
+            *(response.json() for response in responses), return_exceptions=True
+        )
+        payloads = []
+        for response, body in zip(responses, bodies):
+            if isinstance(body, Exception):
+                self.logger.debug(f"Unreadable API response {response.url[:120]}: {body}")
+            else:
+                payloads.append(body)
+        return payloads
+
+    async def _scrape_notifications_dom_async(self, page) -> list:
+        """Async _scrape_notifications_dom()."""
+        try:
+            await page.wait_for_selector(
+                ".nt-card-list, .notification-card, [data-urn]",
+                timeout=10_000
+            )
+        except PWTimeoutError:
+            self.logger.warning("Notification list not found — LinkedIn layout may have changed")
+            return []
+
+        notifications = []
+        cards = await page.query_selector_all(".nt-card-list .nt-card, .notification-card")
+
+        for i, card in enumerate(cards[:20]):
+            try:
+                raw_urn  = await card.get_attribute("data-urn") or ""
+                if raw_urn in self.processed_ids:
+                    self.logger.debug(f"Notifications: stopped at processed card {i}")
+                    break
+                text     = (await card.inner_text()).strip()
+                urn      = raw_urn or hashlib.sha256(f"notif:{i}:{text[:120]}".encode()).hexdigest()[:16]
+                link_el  = await card.query_selector("a")
+                link     = await link_el.get_attribute("href") if link_el else ""
+
+                notifications.append({
+                    "id":       urn,
+                    "text":     text[:1000],
+                    "link":     link,
+                    "category": self._categorise(text),
+                    "priority": self._detect_priority(text),
+                })
+            except Exception as e:
+                self.logger.warning(f"Error scraping notification {i}: {e}")
+
+        return notifications
+
+    async def _scrape_inbox_dom_async(self, page) -> list:
+        """Async _scrape_inbox_dom()."""
+        try:
+            await page.wait_for_selector(".msg-conversation-card, .msg-overlay-list-bubble", timeout=8_000)
+        except PWTimeoutError:
+            return []
+
+        messages = []
+        cards = await page.query_selector_all(
+            ".msg-conversation-card--unread, .msg-conversation-card[aria-label*='unread']"
+        )
+
+        for i, card in enumerate(cards[:10]):
+            try:
+                raw_urn = await card.get_attribute("data-entity-urn") or ""
+                if raw_urn in self.processed_ids:
+                    # Not a stop marker: a processed conversation keeps its URN
+                    # and jumps back to the top on every new message
+                    continue
+                text    = (await card.inner_text()).strip()
+                urn     = raw_urn or hashlib.sha256(f"msg:{i}:{text[:120]}".encode()).hexdigest()[:16]
+                messages.append({
+                    "id":       urn,
+                    "text":     text[:800],
+                    "link":     MESSAGING_URL,
+                    "category": "inbox_message",
+                    "priority": self._detect_priority(text),
+                })
+            except Exception as e:
+                self.logger.warning(f"Error scraping inbox card {i}: {e}")
+
+        return messages
+
+    # ------------------------------------------------------------------
+    # Graceful shutdown
+    # ------------------------------------------------------------------
+
+    async def shutdown_async(self) -> None:
+        await self._teardown_async()
+        self.logger.info("AsyncLinkedInWatcher stopped.")
+
+    def shutdown(self) -> None:
+        # Playwright objects belong to the event loop — shutdown_async() closes them
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="AsyncLinkedInWatcher — LinkedIn watcher on playwright.async_api"
+    )
+    parser.add_argument("--vault", default=".", help="Path to vault root")
+    parser.add_argument("--interval", type=int, default=300, help="Poll interval in seconds")
+    parser.add_argument("--no-headless", action="store_true", help="Show browser window")
+    parser.add_argument(
+        "--extract", choices=["network", "dom"], default="network",
+        help="network: parse LinkedIn API responses (DOM fallback); dom: DOM scraping only",
+    )
+    args = parser.parse_args()
+
+    watcher = AsyncLinkedInWatcher(
+        vault_path=args.vault,
+        check_interval=args.interval,
+        headless=not args.no_headless,
+        extract=args.extract,
+    )
+    asyncio.run(watcher.run_async(handle_signals=True))
@@ -0,0 +1,205 @@
+"""
+metrics_store.py — Gold Tier append-only time-series store (SQLite)
+
+Watchers record the numbers they already fetch on every poll (follower
+counts, mentions, comments...) so Social_Analytics/ summaries can show
+trends instead of a single "last count". The store is one SQLite file in
+the vault root; SQLite ships with Python, handles the Twitter and Facebook
+watcher threads writing at the same time, and keeps years of samples in a
+few hundred KB once downsampled.
+
+Two kinds of series:
+    gauge    a level read at poll time (followers) — downsampled to the
+             last value of each bucket
+    counter  events seen by one poll (new mentions) — downsampled to the
+             sum of each bucket
+
+Downsampling (compact(), run at most once an hour by record()):
+    raw samples      kept RAW_RETENTION_S   then → hourly buckets
+    hourly buckets   kept HOURLY_RETENTION_S then → daily buckets (kept forever)
+
+Usage:
+    store = MetricsStore(vault / METRICS_DB_NAME)
+    store.record({"twitter.followers": 1234}, kind="gauge")
+    store.record({"twitter.mentions": 3}, kind="counter")
+    store.value_at("twitter.followers", time.time() - 86400)
+    store.daily("twitter.mentions", days=14)
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+METRICS_DB_NAME = ".social_metrics.db"
+
+HOUR = 3600
+DAY  = 86400
+
+RAW_RETENTION_S    = 7 * DAY      # full poll resolution for a week
+HOURLY_RETENTION_S = 90 * DAY     # hourly for a quarter, daily after that
+COMPACT_EVERY_S    = HOUR
+
+KINDS = ("gauge", "counter")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    name TEXT PRIMARY KEY,
+    kind TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS samples (
+    series TEXT    NOT NULL,
+    step   INTEGER NOT NULL,     -- 0 = raw, HOUR / DAY = downsampled bucket
+    ts     INTEGER NOT NULL,     -- epoch seconds (bucket start when step > 0)
+    value  REAL    NOT NULL,
+    PRIMARY KEY (series, step, ts)
+) WITHOUT ROWID;
+"""
+
+
+class MetricsStore:
+    """
+    Append-only gauges and counters in one SQLite file.
+
+    A connection is opened per call, so one instance can be shared between
+    threads and several processes can write the same file.
+
+    Args:
+        path: SQLite file (created on first use).
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._last_compact = 0.0
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=10)
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def record(self, values: dict[str, float], kind: str = "gauge", ts: Optional[float] = None) -> None:
+        """Append one sample per series (all stamped `ts`, default now)."""
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}, not {kind!r}")
+        if not values:
+            return
+        now = int(ts if ts is not None else time.time())
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO series (name, kind) VALUES (?, ?)",
+                [(name, kind) for name in values],
+            )
+            # Two polls within one second: the later sample wins (gauge)
+            # or adds up (counter)
+            conn.executemany(
+                "INSERT INTO samples (series, step, ts, value) VALUES (?, 0, ?, ?) "
+                "ON CONFLICT (series, step, ts) DO UPDATE SET value = "
+                + ("value + excluded.value" if kind == "counter" else "excluded.value"),
+                [(name, now, float(v)) for name, v in values.items()],
+            )
+        if time.time() - self._last_compact >= COMPACT_EVERY_S:
+            self.compact()
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """Downsample old samples; returns how many rows were folded."""
+        now = now if now is not None else time.time()
+        self._last_compact = time.time()
+        folded = 0
+        with closing(self._connect()) as conn, conn:
+            kinds = dict(conn.execute("SELECT name, kind FROM series"))
+            for src, dst, keep in ((0, HOUR, RAW_RETENTION_S), (HOUR, DAY, HOURLY_RETENTION_S)):
+                # Bucket-aligned cutoff: a bucket is folded whole or not at all
+                cutoff = int((now - keep) // dst * dst)
+                rows = conn.execute(
+                    "SELECT series, ts, value FROM samples WHERE step = ? AND ts < ? "
+                    "ORDER BY series, ts",
+                    (src, cutoff),
+                ).fetchall()
+                if not rows:
+                    continue
+                buckets: dict[tuple[str, int], float] = {}
+                for series, ts, value in rows:
+                    key = (series, ts // dst * dst)
+                    if kinds.get(series) == "counter":
+                        buckets[key] = buckets.get(key, 0.0) + value
+                    else:
+                        buckets[key] = value        # rows are in time order — last wins
+                conn.executemany(
+                    "INSERT OR REPLACE INTO samples (series, step, ts, value) VALUES (?, ?, ?, ?)",
+                    [(series, dst, ts, value) for (series, ts), value in buckets.items()],
+                )
+                conn.execute("DELETE FROM samples WHERE step = ? AND ts < ?", (src, cutoff))
+                folded += len(rows)
+        if folded:
+            logger.debug("Metrics store: folded %d sample(s) into coarser buckets", folded)
+        return folded
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def kind(self, series: str) -> Optional[str]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT kind FROM series WHERE name = ?", (series,)).fetchone()
+        return row[0] if row else None
+
+    def latest(self, series: str) -> Optional[tuple[int, float]]:
+        """(ts, value) of the newest sample, or None."""
+        with closing(self._connect()) as conn:
+            return conn.execute(
+                "SELECT ts, value FROM samples WHERE series = ? ORDER BY ts DESC LIMIT 1",
+                (series,),
+            ).fetchone()
+
+    def value_at(self, series: str, ts: float) -> Optional[float]:
+        """Gauge value as of `ts` (newest sample at or before it), or None."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT value FROM samples WHERE series = ? AND ts <= ? ORDER BY ts DESC LIMIT 1",
+                (series, int(ts)),
+            ).fetchone()
+        return row[0] if row else None
+
+    def total(self, series: str, since: float, until: Optional[float] = None) -> float:
+        """Counter sum over [since, until)."""
+        until = until if until is not None else time.time() + 1
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT COALESCE(SUM(value), 0) FROM samples WHERE series = ? AND ts >= ? AND ts < ?",
+                (series, int(since), int(until)),
+            ).fetchone()
+        return row[0]
+
+    def daily(self, series: str, days: int, now: Optional[float] = None) -> list[Optional[float]]:
+        """
+        One value per UTC day, oldest first, ending today: the last sample
+        of the day for a gauge, the day's sum for a counter. Days without
+        samples are None.
+        """
+        now = now if now is not None else time.time()
+        today = int(now // DAY * DAY)
+        start = today - (days - 1) * DAY
+        counter = self.kind(series) == "counter"
+        values: list[Optional[float]] = [None] * days
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT ts, value FROM samples WHERE series = ? AND ts >= ? ORDER BY ts",
+                (series, start),
+            ).fetchall()
+        for ts, value in rows:
+            i = (ts - start) // DAY
+            if i >= days:
+                continue
+            values[i] = (values[i] or 0.0) + value if counter else value
+        return values
@@ -9,6 +9,9 @@ Polls Odoo every N minutes for:
 Creates structured .md files in Needs_Action/ for Claude to process.
 All Odoo write operations go through the HITL gate (odoo-mcp).
 
+Reads use one web session (cookie auth, no password per call) over the
+shared keep-alive pool; OdooRPC.batch() sends several calls at once.
+
 State is persisted in .odoo_watcher_state.json.
 
 Usage:
@@ -21,16 +24,20 @@ Dependencies (install via uv):
 
 import argparse
 import hashlib
+import itertools
 import json
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date, timezone
 from pathlib import Path
 
-import requests
+import httpx
 
 from base_watcher import BaseWatcher
 from audit_logger import log_action, log_watcher_start, log_watcher_stop, log_error
+from http_pool import PER_HOST_LIMIT, shared_client
 
 # ---------------------------------------------------------------------------
 # State
@@ -65,54 +72,154 @@ def _save_state(vault_path: Path, state: dict) -> None:
 # Odoo JSON-RPC client (minimal Python version — mirrors odoo-client.js)
 # ---------------------------------------------------------------------------
 
-class OdooRPC:
-    """Minimal Odoo JSON-RPC client for Python watchers."""
+SESSION_EXPIRED = "odoo.http.SessionExpiredException"
+
+
+class OdooRPCError(RuntimeError):
+    """An Odoo JSON-RPC call answered with an error."""
+
+    def __init__(self, error: dict):
+        data = error.get("data") or {}
+        self.code = error.get("code")
+        self.name = data.get("name", "")
+        super().__init__(f"Odoo RPC error: {data.get('message') or error.get('message') or error}")
 
-    def __init__(self, url: str, db: str, username: str, password: str):
+
+class OdooRPC:
+    """
+    Odoo JSON-RPC client for Python watchers.
+
+    - Session auth: authenticate() logs in once via /web/session/authenticate;
+      model calls then go to /web/dataset/call_kw carrying the session
+      cookie, so the password is not re-sent with every call. An expired
+      session is renewed (once) and the call retried.
+    - Every request gets its own id, and the reply must echo it.
+    - batch() / search_read_many() run several calls concurrently, up to
+      max_in_flight at once. Odoo answers one call per HTTP request (it
+      does not accept JSON-RPC batch arrays), so this is what makes a
+      multi-model read cost about one round trip instead of one per call.
+
+    Calls go through the shared keep-alive pool (http_pool.py), so the
+    connections and TLS sessions survive between polls.
+    """
+
+    def __init__(
+        self, url: str, db: str, username: str, password: str, max_in_flight: int = PER_HOST_LIMIT
+    ):
         self.url = url.rstrip("/")
         self.db = db
         self.username = username
         self.password = password
         self.uid: int | None = None
-        self._session = requests.Session()
-        self._session.headers["Content-Type"] = "application/json"
-
-    def _call(self, service: str, method: str, args: list) -> object:
-        payload = {
-            "jsonrpc": "2.0",
-            "method": "call",
-            "id": 1,
-            "params": {"service": service, "method": method, "args": args},
-        }
-        resp = self._session.post(f"{self.url}/jsonrpc", json=payload, timeout=30)
+        self._session_id: str | None = None
+        self._http = shared_client()
+        self._ids = itertools.count(1)
+        self._ids_lock = threading.Lock()
+        self._auth_lock = threading.RLock()
+        self._pool = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="OdooRPC")
+
+    def _post(self, path: str, params: dict, session_id: str | None = None) -> tuple[object, httpx.Response]:
+        """One JSON-RPC request; returns (result, response)."""
+        with self._ids_lock:
+            request_id = next(self._ids)
+        resp = self._http.post(
+            f"{self.url}{path}",
+            json={"jsonrpc": "2.0", "method": "call", "id": request_id, "params": params},
+            headers={"Cookie": f"session_id={session_id}"} if session_id else None,
+            timeout=30,
+        )
         resp.raise_for_status()
         data = resp.json()
         if data.get("error"):
-            raise RuntimeError(f"Odoo RPC error: {data['error']['data']['message']}")
-        return data["result"]
+            raise OdooRPCError(data["error"])
+        if data.get("id") != request_id:
+            raise OdooRPCError({"message": f"reply id {data.get('id')!r} for request {request_id}"})
+        return data.get("result"), resp
+
+    def _call(self, service: str, method: str, args: list) -> object:
+        """Call a /jsonrpc service method that needs no session (common.version)."""
+        return self._post("/jsonrpc", {"service": service, "method": method, "args": args})[0]
 
     def authenticate(self) -> int:
-        self.uid = self._call(
-            "common", "authenticate",
-            [self.db, self.username, self.password, {}]
-        )
-        if not self.uid:
-            raise RuntimeError("Odoo authentication failed — check credentials in .env")
+        """Log in and keep the session cookie for later calls."""
+        with self._auth_lock:
+            try:
+                result, resp = self._post(
+                    "/web/session/authenticate",
+                    {"db": self.db, "login": self.username, "password": self.password},
+                )
+            except OdooRPCError as exc:
+                raise RuntimeError(f"Odoo authentication failed — check credentials in .env ({exc})") from exc
+            uid = (result or {}).get("uid")
+            session_id = resp.cookies.get("session_id")
+            if not uid or not session_id:
+                raise RuntimeError("Odoo authentication failed — check credentials in .env")
+            self.uid, self._session_id = uid, session_id
         return self.uid
 
+    def _renew_session(self, stale: str | None) -> None:
+        """Log in again unless another thread already replaced the stale session."""
+        with self._auth_lock:
+            if self._session_id == stale:
+                self.authenticate()
+
+    def execute_kw(self, model: str, method: str, args: list, kwargs: dict | None = None) -> object:
+        """Call a model method over the session (logs in on first use)."""
+        if self._session_id is None:
+            self._renew_session(None)
+        session_id = self._session_id
+        path = f"/web/dataset/call_kw/{model}/{method}"
+        params = {"model": model, "method": method, "args": args, "kwargs": kwargs or {}}
+        try:
+            return self._post(path, params, session_id)[0]
+        except OdooRPCError as exc:
+            if exc.name != SESSION_EXPIRED:
+                raise
+        self._renew_session(session_id)
+        return self._post(path, params, self._session_id)[0]
+
+    def batch(self, calls: dict[str, tuple]) -> dict[str, object]:
+        """
+        Run several execute_kw calls concurrently.
+
+        Args:
+            calls: name → (model, method, args) or (model, method, args, kwargs).
+
+        Returns name → result, or the exception that call raised.
+        """
+        if self._session_id is None:
+            self._renew_session(None)       # log in once, before fanning out
+        futures = {name: self._pool.submit(self.execute_kw, *call) for name, call in calls.items()}
+        results: dict[str, object] = {}
+        for name, future in futures.items():
+            try:
+                results[name] = future.result()
+            except Exception as exc:
+                results[name] = exc
+        return results
+
     def search_read(self, model: str, domain: list, fields: list, limit: int = 100) -> list[dict]:
-        if self.uid is None:
-            self.authenticate()
-        return self._call(
-            "object", "execute_kw",
-            [self.db, self.uid, self.password, model, "search_read",
-             [domain], {"fields": fields, "limit": limit}]
-        )
+        return self.execute_kw(model, "search_read", [domain], {"fields": fields, "limit": limit})
+
+    def search_read_many(self, queries: dict[str, tuple]) -> dict[str, list[dict] | Exception]:
+        """
+        search_read on several models in one concurrent batch.
+
+        Args:
+            queries: name → (model, domain, fields, limit).
+        """
+        return self.batch({
+            name: (model, "search_read", [domain], {"fields": fields, "limit": limit})
+            for name, (model, domain, fields, limit) in queries.items()
+        })
 
     def ping(self) -> str:
         result = self._call("common", "version", [])
         return result.get("server_version", "unknown") if isinstance(result, dict) else str(result)
 
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
 
 # ---------------------------------------------------------------------------
 # Watcher class
@@ -336,6 +443,7 @@ This is a read-only operation — no Odoo records will be modified.
         return file_path
 
     def shutdown(self) -> None:
+        self._odoo.close()
         _save_state(self.vault_path, self.state)
         log_watcher_stop("odoo_watcher")
 
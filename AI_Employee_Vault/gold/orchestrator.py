@@ -12,6 +12,14 @@ Modes:
   python orchestrator.py --now        daemon + immediate Claude run on startup
   python orchestrator.py --cron       one-shot: run daily Claude cycle once and exit
   python orchestrator.py --briefing   one-shot: run weekly CEO briefing once and exit
+  python orchestrator.py --asyncio    daemon, with the browser watchers (WhatsApp,
+                                      LinkedIn) on playwright.async_api as tasks
+                                      of one asyncio event loop instead of threads
+
+In --asyncio mode the API watchers (Gmail, Twitter, Facebook, Odoo) still run
+as threads under the watchdog; the event loop supervises the browser watchers
+(restart after WATCHDOG_INTERVAL when one ends) and runs the schedule loop,
+handing each Claude cycle to a worker thread so the watchers keep polling.
 
 Cron fallback (add to Task Scheduler / crontab):
   Daily:   0 8 * * 1-6  cd /path/to/gold && uv run python orchestrator.py --cron
@@ -25,6 +33,7 @@ Run:  uv run python orchestrator.py
 """
 
 import argparse
+import asyncio
 import logging
 import os
 import platform
@@ -68,34 +77,62 @@ WEEKLY_BRIEFING_PROMPT = (
 )
 
 WATCHDOG_INTERVAL = 30    # seconds between thread health checks
+ASYNC_CAPABLE     = {"LinkedIn", "WhatsApp"}    # watchers with a playwright.async_api variant
 CLAUDE_TIMEOUT    = 900   # 15-minute cap per Claude cycle (Gold has more work)
 
 # ── Watcher registry ──────────────────────────────────────────────────────────
 
 def _watcher_registry(vault: Path) -> list:
+    """
+    (name, guard, fn) per watcher. fn() runs the watcher in the calling
+    thread; for ASYNC_CAPABLE watchers fn(asyncio_mode=True) instead returns
+    a coroutine running the async variant.
+    """
     iv = lambda k, d: int(os.getenv(k, d))
     hl = os.getenv("HEADLESS", "true").lower() != "false"
 
     def gmail():
         sys.path.insert(0, str(vault))
         from gmail_watcher import GmailWatcher
+        accounts = os.getenv("GMAIL_ACCOUNTS", "").replace(",", " ").split()
+        push_port = iv("GMAIL_PUSH_PORT", "0") or None
+        # With push enabled, polling is only a slow safety net
+        interval = iv("GMAIL_PUSH_POLL_INTERVAL", "900") if push_port else iv("GMAIL_INTERVAL", "120")
         GmailWatcher(vault_path=str(vault),
-                     check_interval=iv("GMAIL_INTERVAL", "120")).run()
-
-    def linkedin():
+                     check_interval=interval,
+                     accounts=accounts or None,
+                     attachments=os.getenv("GMAIL_ATTACHMENTS", "false").lower() == "true",
+                     push_port=push_port,
+                     push_token=os.getenv("GMAIL_PUSH_TOKEN") or None,
+                     push_topic=os.getenv("GMAIL_PUSH_TOPIC") or None).run()
+
+    def linkedin(asyncio_mode=False):
         sys.path.insert(0, str(vault))
-        from linkedin_watcher import LinkedInWatcher
-        LinkedInWatcher(vault_path=str(vault),
-                        check_interval=iv("LINKEDIN_INTERVAL", "300"),
-                        headless=hl).run()
-
-    def whatsapp():
+        if asyncio_mode:
+            from linkedin_watcher_async import AsyncLinkedInWatcher as LinkedInWatcher
+        else:
+            from linkedin_watcher import LinkedInWatcher
+        watcher = LinkedInWatcher(vault_path=str(vault),
+                                  check_interval=iv("LINKEDIN_INTERVAL", "300"),
+                                  headless=hl,
+                                  extract=os.getenv("LINKEDIN_EXTRACT", "network"))
+        return watcher.run_async() if asyncio_mode else watcher.run()
+
+    def whatsapp(asyncio_mode=False):
         sys.path.insert(0, str(vault))
-        from whatsapp_watcher import WhatsAppWatcher
-        WhatsAppWatcher(vault_path=str(vault),
-                        session_path=str(vault / "whatsapp_session"),
-                        check_interval=iv("WHATSAPP_INTERVAL", "30"),
-                        headless=hl).run()
+        if asyncio_mode:
+            from whatsapp_watcher_async import AsyncWhatsAppWatcher as WhatsAppWatcher
+        else:
+            from whatsapp_watcher import WhatsAppWatcher
+        event_mode = os.getenv("WHATSAPP_EVENT_MODE", "false").lower() == "true"
+        # In event mode the timer is only a reconciliation pass
+        interval = iv("WHATSAPP_RECONCILE_INTERVAL", "300") if event_mode else iv("WHATSAPP_INTERVAL", "30")
+        watcher = WhatsAppWatcher(vault_path=str(vault),
+                                  session_path=str(vault / "whatsapp_session"),
+                                  check_interval=interval,
+                                  headless=hl,
+                                  event_mode=event_mode)
+        return watcher.run_async() if asyncio_mode else watcher.run()
 
     def twitter():
         sys.path.insert(0, str(vault))
@@ -106,8 +143,13 @@ def _watcher_registry(vault: Path) -> list:
     def facebook():
         sys.path.insert(0, str(vault))
         from facebook_watcher import FacebookWatcher
+        webhook_port = iv("FACEBOOK_WEBHOOK_PORT", "0") or None
+        # With webhooks enabled, polling is only a reconciliation pass
+        interval = (iv("FACEBOOK_WEBHOOK_POLL_INTERVAL", "1800") if webhook_port
+                    else iv("FACEBOOK_INTERVAL", "600"))
         FacebookWatcher(vault_path=str(vault),
-                        check_interval=iv("FACEBOOK_INTERVAL", "600")).run()
+                        check_interval=interval,
+                        webhook_port=webhook_port).run()
 
     def odoo():
         sys.path.insert(0, str(vault))
@@ -189,12 +231,30 @@ def _spawn(name: str, fn) -> threading.Thread:
     return t
 
 
-def run_watchdog(vault: Path) -> None:
+def _start_browser_broker(vault: Path) -> None:
+    """
+    BROWSER_SHARED=true: one Chromium for the WhatsApp + LinkedIn watchers.
+    Its DevTools port is unauthenticated — see the security note in browser_pool.py.
+    """
+    sys.path.insert(0, str(vault))
+    from browser_pool import BrowserBroker
+    try:
+        BrowserBroker.configure(user_data_dir=vault / "whatsapp_session",
+                                headless=os.getenv("HEADLESS", "true").lower() != "false")
+    except Exception as exc:
+        log.warning(f"Shared browser unavailable ({exc}) — watchers will launch their own")
+
+
+def run_watchdog(vault: Path, skip: frozenset[str] = frozenset()) -> None:
     """
     Start all watchers whose guards pass, then restart any that die.
-    Runs in its own daemon thread.
+    Runs in its own daemon thread. Watchers named in skip are left to
+    the asyncio supervisor.
     """
-    registry = _watcher_registry(vault)
+    if os.getenv("BROWSER_SHARED", "false").lower() == "true":
+        _start_browser_broker(vault)
+
+    registry = [w for w in _watcher_registry(vault) if w[0] not in skip]
     threads: dict[str, threading.Thread] = {}
 
     for name, guard, fn in registry:
@@ -214,6 +274,57 @@ def run_watchdog(vault: Path) -> None:
                 log.warning(f"{name} watcher is dead — restarting…")
                 threads[name] = _spawn(name, fn)
 
+# ── asyncio mode ──────────────────────────────────────────────────────────────
+
+async def _supervise(name: str, fn) -> None:
+    """Run an async watcher; restart it WATCHDOG_INTERVAL after it ends or crashes."""
+    while True:
+        log.info(f"{name} watcher started (asyncio task)")
+        try:
+            await fn(asyncio_mode=True)
+        except (Exception, SystemExit) as exc:
+            # A watcher's sys.exit() (missing playwright, bad credentials) ends
+            # that watcher only — in a task it would otherwise stop the loop
+            log.error(f"{name} watcher crashed: {exc!r}", exc_info=True)
+        await asyncio.sleep(WATCHDOG_INTERVAL)
+        log.warning(f"{name} watcher is dead — restarting…")
+
+
+async def run_async_daemon(vault: Path) -> None:
+    """
+    --asyncio daemon: browser watchers as tasks on this event loop, the
+    other watchers as watchdog threads, and the schedule loop.
+    """
+    if os.getenv("BROWSER_SHARED", "false").lower() == "true":
+        # Before the watchdog thread, so both sides attach to the same Chromium
+        await asyncio.to_thread(_start_browser_broker, vault)
+
+    threading.Thread(target=run_watchdog, args=(vault, frozenset(ASYNC_CAPABLE)),
+                     name="Watchdog", daemon=True).start()
+
+    tasks = []
+    for name, guard, fn in _watcher_registry(vault):
+        if name not in ASYNC_CAPABLE:
+            continue
+        if guard():
+            tasks.append(asyncio.create_task(_supervise(name, fn), name=name))
+        else:
+            log.warning(
+                f"{name} watcher skipped — prerequisite missing "
+                f"(check .env / credentials / session files)"
+            )
+
+    try:
+        while True:
+            # Claude cycles block for minutes — keep them off the loop
+            await asyncio.to_thread(schedule.run_pending)
+            await asyncio.sleep(10)
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Cancelled watchers still close their browsers (run_async's finally)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
 # ── Entry point ───────────────────────────────────────────────────────────────
 
 def main() -> None:
@@ -222,6 +333,8 @@ def main() -> None:
     parser.add_argument("--now",       action="store_true", help="Run daily Claude cycle immediately on startup")
     parser.add_argument("--cron",      action="store_true", help="One-shot: run daily cycle once then exit")
     parser.add_argument("--briefing",  action="store_true", help="One-shot: run weekly CEO briefing once then exit")
+    parser.add_argument("--asyncio",   action="store_true",
+                        help="Run the WhatsApp/LinkedIn watchers on one asyncio loop (playwright.async_api)")
     args = parser.parse_args()
 
     vault = Path(args.vault).resolve()
@@ -242,9 +355,6 @@ def main() -> None:
     if args.now:
         run_daily(vault)
 
-    # Watchdog runs in background; schedule loop runs in main thread
-    threading.Thread(target=run_watchdog, args=(vault,), name="Watchdog", daemon=True).start()
-
     # Daily triage at 08:00
     schedule.every().day.at("08:00").do(run_daily, vault=vault)
     # Weekly CEO briefing every Sunday at 23:00
@@ -257,9 +367,14 @@ def main() -> None:
     )
 
     try:
-        while True:
-            schedule.run_pending()
-            time.sleep(10)
+        if args.asyncio:
+            asyncio.run(run_async_daemon(vault))
+        else:
+            # Watchdog runs in background; schedule loop runs in main thread
+            threading.Thread(target=run_watchdog, args=(vault,), name="Watchdog", daemon=True).start()
+            while True:
+                schedule.run_pending()
+                time.sleep(10)
     except KeyboardInterrupt:
         log.info("Orchestrator stopped (KeyboardInterrupt)")
 
@@ -0,0 +1,141 @@
+"""
+rate_budget.py — Gold Tier per-endpoint rate-limit budget
+
+APIs such as Twitter/X report their limits on every response:
+
+    x-rate-limit-limit      requests allowed per window
+    x-rate-limit-remaining  requests left in the current window
+    x-rate-limit-reset      epoch seconds when the window resets
+
+tweepy's wait_on_rate_limit=True reacts to a 429 by sleeping inside the call
+until the reset — up to 15 minutes during which the watcher thread cannot
+poll anything else or shut down. RateLimitBudget instead tracks those
+headers per endpoint and decides BEFORE a request:
+
+  - exhausted (remaining 0, reset in the future) → RateLimitSkip, the
+    caller skips that endpoint for this poll and keeps its cursor;
+  - paced → the first request of a poll is only allowed once
+    (time to reset) / remaining seconds (less PACING_SLACK) have passed
+    since the last one, so the remaining budget is spread evenly over the
+    window instead of being spent by early polls.
+
+Follow-up requests within one poll (pagination) are not paced, only checked
+against the hard budget. State is a plain dict so callers can persist it
+(a restart inside a window then still knows the budget).
+
+Usage:
+    budget = RateLimitBudget(saved=state.get("rate_limits"))
+    key = budget.key("GET", "/2/users/123/mentions")   # "GET /2/users/:id/mentions"
+    budget.acquire(key)              # raises RateLimitSkip
+    response = send()
+    budget.update(key, response.headers)
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import time
+from datetime import datetime, timezone
+from typing import Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+LIMIT_HEADER     = "x-rate-limit-limit"
+REMAINING_HEADER = "x-rate-limit-remaining"
+RESET_HEADER     = "x-rate-limit-reset"
+PACING_SLACK     = 0.9     # a poll arriving slightly early is not skipped
+
+# Numeric path segments after the leading API version ("/2/users/123/...")
+_ID_SEGMENT = re.compile(r"(?<!^)/\d+(?=/|$)")
+
+
+class RateLimitSkip(Exception):
+    """Raised instead of sending a request the budget cannot afford."""
+
+    def __init__(self, key: str, reset: float, reason: str):
+        self.key = key
+        self.reset = reset
+        super().__init__(
+            f"{key}: {reason} until "
+            f"{datetime.fromtimestamp(reset, timezone.utc).strftime('%H:%M:%S')} UTC"
+        )
+
+
+class RateLimitBudget:
+    """
+    Per-endpoint budget from x-rate-limit-* response headers.
+
+    Args:
+        saved: Output of a previous to_dict(), or None.
+    """
+
+    def __init__(self, saved: Optional[dict] = None):
+        now = time.time()
+        # key → {limit, remaining, reset, last}; windows already over are dropped
+        self.endpoints: dict[str, dict] = {
+            key: dict(entry)
+            for key, entry in (saved or {}).items()
+            if isinstance(entry, dict) and entry.get("reset", 0) > now
+        }
+
+    @staticmethod
+    def key(method: str, route: str) -> str:
+        """Endpoint key with numeric path segments (user IDs) collapsed."""
+        return f"{method.upper()} {_ID_SEGMENT.sub('/:id', route.split('?', 1)[0])}"
+
+    def acquire(self, key: str, paced: bool = True) -> None:
+        """
+        Allow one request to `key` or raise RateLimitSkip. paced=False skips
+        the spacing rule (continuation pages of a poll already under way).
+        """
+        entry = self.endpoints.get(key)
+        now = time.time()
+        if not entry or entry["reset"] <= now:
+            self._mark(key, now)
+            return
+
+        remaining = entry["remaining"]
+        if remaining <= 0:
+            raise RateLimitSkip(key, entry["reset"], "rate-limit budget exhausted")
+
+        if paced and entry.get("last"):
+            gap = (entry["reset"] - now) / remaining
+            if now - entry["last"] < gap * PACING_SLACK:
+                raise RateLimitSkip(
+                    key, entry["last"] + gap,
+                    f"pacing {remaining} request(s) left in this window",
+                )
+
+        # Count the request now so concurrent callers see it
+        entry["remaining"] = remaining - 1
+        self._mark(key, now)
+
+    def update(self, key: str, headers: Mapping[str, str]) -> None:
+        """Record the limit headers of a response (including a 429)."""
+        try:
+            limit     = int(headers[LIMIT_HEADER])
+            remaining = int(headers[REMAINING_HEADER])
+            reset     = float(headers[RESET_HEADER])
+        except (KeyError, TypeError, ValueError):
+            return
+        entry = self.endpoints.setdefault(key, {})
+        entry.update(limit=limit, remaining=remaining, reset=reset)
+        entry.setdefault("last", time.time())
+        if remaining <= 0:
+            logger.warning(
+                "%s: rate limit reached (%d/window) — skipped until %s UTC",
+                key, limit, datetime.fromtimestamp(reset, timezone.utc).strftime("%H:%M:%S"),
+            )
+        else:
+            logger.debug("%s: %d/%d requests left in window", key, remaining, limit)
+
+    def _mark(self, key: str, now: float) -> None:
+        entry = self.endpoints.get(key)
+        if entry is not None:
+            entry["last"] = now
+
+    def to_dict(self) -> dict:
+        """Serializable state (windows still open)."""
+        now = time.time()
+        return {key: dict(e) for key, e in self.endpoints.items() if e.get("reset", 0) > now}
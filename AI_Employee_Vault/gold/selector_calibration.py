@@ -0,0 +1,192 @@
+"""
+selector_calibration.py — Gold Tier self-calibrating selector lists
+
+Browser watchers keep ordered fallback lists of CSS selectors because sites
+like WhatsApp Web change their DOM without notice. Walking a list in its
+hand-written order is slow once the first entries stop matching: every miss
+in a wait_for_selector() costs a timeout, on every poll and after every
+restart.
+
+SelectorCalibrator records, per list, how often each selector matched
+(hits) or was tried and missed (misses), and returns each list ranked by
+hit rate so the selector that works now is tried first. Counts decay (they
+are halved once a selector has WINDOW observations), so a DOM change
+re-ranks a list within a few polls rather than after its whole history.
+Selectors whose hit rates are within RATE_BUCKET of each other keep the
+hand-written order, which encodes which selector is the most precise.
+
+The calibrator does not probe pages itself. The watcher reports what its
+extraction saw via record(), and runs a full probe of every selector when
+recalibration_due() says so (catching a better selector that the
+first-match walk never reaches). to_dict() output, passed back as `saved`,
+restores the rankings, so the watcher persists them in its own state file.
+
+Usage:
+    cal = SelectorCalibrator({"chat_list": CHAT_LIST_SELECTORS, ...},
+                             saved=state.get("selectors"))
+    for sel in cal.ordered("chat_list"): ...
+    cal.record("chat_list", hits={winner: 1}, misses={loser: 1})
+    if cal.changed:
+        save(cal.to_dict())
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+WINDOW      = 200     # observations per selector before counts are halved
+RATE_BUCKET = 0.1     # hit-rate resolution; within a bucket, list order wins
+
+
+class SelectorCalibrator:
+    """
+    Hit-rate ranking for named fallback selector lists.
+
+    Args:
+        defaults:          list name → selectors in their hand-written order.
+                           Only these selectors are ever returned; saved
+                           stats for selectors no longer listed are dropped.
+        saved:             Output of a previous to_dict(), or None.
+        recalibrate_every: Seconds between full probes (0 disables).
+    """
+
+    def __init__(
+        self,
+        defaults: dict[str, list[str]],
+        saved: Optional[dict] = None,
+        recalibrate_every: int = 0,
+    ):
+        self.defaults = {name: list(sels) for name, sels in defaults.items()}
+        self.recalibrate_every = recalibrate_every
+        self.stats: dict[str, dict[str, dict]] = {name: {} for name in self.defaults}
+        self.last_calibrated: Optional[str] = None
+        self._last_probe = 0.0
+        self._order: dict[str, list[str]] = {}
+        #: True when a ranking changed or a probe ran since the last to_dict()
+        self.changed = False
+
+        for name, per_sel in ((saved or {}).get("lists") or {}).items():
+            if name not in self.defaults:
+                continue
+            for sel, counts in per_sel.items():
+                if sel in self.defaults[name]:
+                    self.stats[name][sel] = {
+                        "hits":   int(counts.get("hits", 0)),
+                        "misses": int(counts.get("misses", 0)),
+                    }
+        self.last_calibrated = (saved or {}).get("last_calibrated")
+        for name in self.defaults:
+            self._order[name] = self._rank(name)
+
+    # ------------------------------------------------------------------
+    # Ranking
+    # ------------------------------------------------------------------
+
+    def rate(self, name: str, selector: str) -> float:
+        """Smoothed hit rate; an untried selector scores 0.5."""
+        s = self.stats[name].get(selector) or {"hits": 0, "misses": 0}
+        return (s["hits"] + 1) / (s["hits"] + s["misses"] + 2)
+
+    def _rank(self, name: str) -> list[str]:
+        default = self.defaults[name]
+        return sorted(
+            default,
+            key=lambda sel: (-round(self.rate(name, sel) / RATE_BUCKET), default.index(sel)),
+        )
+
+    def ordered(self, name: str) -> list[str]:
+        """The list's selectors, best first."""
+        return list(self._order[name])
+
+    # ------------------------------------------------------------------
+    # Observations
+    # ------------------------------------------------------------------
+
+    def record(
+        self,
+        name: str,
+        hits: Optional[dict[str, int]] = None,
+        misses: Optional[dict[str, int]] = None,
+    ) -> None:
+        """Add hit/miss counts for selectors of one list and re-rank it."""
+        for sel, n in (hits or {}).items():
+            self._count(name, sel, "hits", n)
+        for sel, n in (misses or {}).items():
+            self._count(name, sel, "misses", n)
+
+        order = self._rank(name)
+        if order != self._order[name]:
+            logger.info(
+                "Selector list %r re-ranked: %r now first (was %r)",
+                name, order[0], self._order[name][0],
+            )
+            self._order[name] = order
+            self.changed = True
+
+    def record_first_match(self, name: str, tried: list[str], winner: Optional[str]) -> None:
+        """
+        Record a first-match walk: every selector tried before the winner
+        missed. A walk where nothing matched says nothing about the
+        selectors (the page may just not be there yet) and is ignored.
+        """
+        if winner is None:
+            return
+        before = tried[: tried.index(winner)] if winner in tried else []
+        self.record(name, hits={winner: 1}, misses={sel: 1 for sel in before})
+
+    def record_probe(self, counts: dict[str, dict[str, int]]) -> None:
+        """
+        Apply a full probe: counts[name][selector] is how many elements (or
+        rows) the selector matched. Lists where nothing matched at all, e.g.
+        no unread badges right now, are skipped.
+        """
+        for name, per_sel in counts.items():
+            if name not in self.defaults or not any(per_sel.values()):
+                continue
+            self.record(
+                name,
+                hits={sel: 1 for sel, n in per_sel.items() if n},
+                misses={sel: 1 for sel, n in per_sel.items() if not n},
+            )
+        self._last_probe = time.monotonic()
+        self.last_calibrated = datetime.now(timezone.utc).isoformat()
+        self.changed = True
+
+    def _count(self, name: str, sel: str, key: str, n: int) -> None:
+        if n <= 0 or sel not in self.defaults.get(name, ()):
+            return
+        s = self.stats[name].setdefault(sel, {"hits": 0, "misses": 0})
+        s[key] += n
+        if s["hits"] + s["misses"] > WINDOW:
+            s["hits"] //= 2
+            s["misses"] //= 2
+
+    # ------------------------------------------------------------------
+    # Re-calibration schedule and persistence
+    # ------------------------------------------------------------------
+
+    def recalibration_due(self) -> bool:
+        """True when a full probe is due (always true before the first one this run)."""
+        if not self.recalibrate_every:
+            return False
+        return (
+            self._last_probe == 0.0
+            or time.monotonic() - self._last_probe >= self.recalibrate_every
+        )
+
+    def to_dict(self) -> dict:
+        """Serializable state; clears `changed`."""
+        self.changed = False
+        return {
+            "lists": {
+                name: {sel: dict(counts) for sel, counts in per_sel.items()}
+                for name, per_sel in self.stats.items()
+            },
+            "order": {name: self.ordered(name) for name in self.defaults},
+            "last_calibrated": self.last_calibrated,
+        }
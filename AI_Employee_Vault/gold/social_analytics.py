@@ -0,0 +1,238 @@
+"""
+social_analytics.py — Gold Tier Social_Analytics trend generator
+
+Renders the numbers in the metrics store (metrics_store.py) into the
+Social_Analytics/ summaries, so follower growth and activity trends are
+always current without Claude redoing the arithmetic from action files.
+
+Only the block between the SECTION_START / SECTION_END markers is
+generated. Everything else in a summary (post tables, notes written by
+SKILL_Twitter_Draft or SKILL_Facebook_Instagram) is left untouched; a
+summary without the markers gets the block inserted before its first "## "
+section. A file is only rewritten when a number in its block changed.
+
+The watchers call render_summary() after every poll. Run by hand to
+regenerate every summary:
+
+Usage:
+    uv run python social_analytics.py
+    uv run python social_analytics.py --vault /path/to/gold --platform twitter
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from metrics_store import DAY, METRICS_DB_NAME, MetricsStore
+
+logger = logging.getLogger(__name__)
+
+SECTION_START = "<!-- social-metrics:start -->"
+SECTION_END   = "<!-- social-metrics:end -->"
+
+SPARK_DAYS = 14
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+# platform key → summary file and the series it shows.
+# gauges: (series, label); counters: (series, label)
+PLATFORMS: dict[str, dict] = {
+    "twitter": {
+        "file": "Twitter_Summary.md",
+        "platform": "twitter",
+        "title": "Twitter/X Engagement Summary",
+        "gauges": [
+            ("twitter.followers", "Followers"),
+            ("twitter.following", "Following"),
+            ("twitter.tweets",    "Tweets"),
+            ("twitter.listed",    "Listed"),
+        ],
+        "counters": [
+            ("twitter.mentions", "Mentions"),
+            ("twitter.dms",      "DMs received"),
+        ],
+    },
+    "facebook": {
+        "file": "Facebook_Instagram_Summary.md",
+        "platform": "facebook_instagram",
+        "title": "Facebook & Instagram Engagement Summary",
+        "gauges": [
+            ("facebook.fans",       "Facebook Page likes"),
+            ("instagram.followers", "Instagram followers"),
+        ],
+        "counters": [
+            ("facebook.messages",  "Facebook messages"),
+            ("facebook.comments",  "Facebook comments"),
+            ("instagram.comments", "Instagram comments"),
+        ],
+    },
+}
+
+_UPDATED_LINE = re.compile(r"^_Generated .*_$", re.MULTILINE)
+
+
+# ---------------------------------------------------------------------------
+# Formatting
+# ---------------------------------------------------------------------------
+
+def _num(value: Optional[float]) -> str:
+    return "—" if value is None else f"{value:,.0f}"
+
+
+def _delta(now: Optional[float], then: Optional[float]) -> str:
+    if now is None or then is None:
+        return "—"
+    change = now - then
+    if not then:
+        return f"{change:+,.0f}"
+    return f"{change:+,.0f} ({change / then:+.1%})"
+
+
+def sparkline(values: list[Optional[float]]) -> str:
+    """Unicode sparkline; days without data are blank."""
+    known = [v for v in values if v is not None]
+    if not known:
+        return ""
+    low, high = min(known), max(known)
+    span = (high - low) or 1
+    return "".join(
+        " " if v is None else SPARK_CHARS[int((v - low) / span * (len(SPARK_CHARS) - 1))]
+        for v in values
+    )
+
+
+# ---------------------------------------------------------------------------
+# Rendering
+# ---------------------------------------------------------------------------
+
+def render_section(store: MetricsStore, platform: str, now: Optional[float] = None) -> str:
+    """The generated Markdown block (markers included) for one platform."""
+    now = now if now is not None else time.time()
+    spec = PLATFORMS[platform]
+    stamp = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+
+    lines = [
+        SECTION_START,
+        "## Trends",
+        "",
+        f"_Generated by `social_analytics.py` from every watcher poll — {stamp}_",
+        "",
+        "### Audience",
+        "",
+        f"| Metric | Now | 24h | 7 days | 30 days | Last {SPARK_DAYS} days |",
+        "|--------|-----|-----|--------|---------|----------------|",
+    ]
+    for series, label in spec["gauges"]:
+        latest = store.latest(series)
+        if latest is None:
+            continue
+        current = latest[1]
+        lines.append(
+            f"| {label} | {_num(current)} "
+            f"| {_delta(current, store.value_at(series, now - DAY))} "
+            f"| {_delta(current, store.value_at(series, now - 7 * DAY))} "
+            f"| {_delta(current, store.value_at(series, now - 30 * DAY))} "
+            f"| `{sparkline(store.daily(series, SPARK_DAYS, now))}` |"
+        )
+
+    lines += [
+        "",
+        "### Activity",
+        "",
+        f"| Metric | 24h | 7 days | vs previous 7 days | 30 days | Last {SPARK_DAYS} days |",
+        "|--------|-----|--------|--------------------|---------|----------------|",
+    ]
+    for series, label in spec["counters"]:
+        if store.latest(series) is None:
+            continue
+        week = store.total(series, now - 7 * DAY)
+        prev_week = store.total(series, now - 14 * DAY, now - 7 * DAY)
+        lines.append(
+            f"| {label} | {_num(store.total(series, now - DAY))} "
+            f"| {_num(week)} "
+            f"| {_delta(week, prev_week)} "
+            f"| {_num(store.total(series, now - 30 * DAY))} "
+            f"| `{sparkline(store.daily(series, SPARK_DAYS, now))}` |"
+        )
+
+    lines.append(SECTION_END)
+    return "\n".join(lines)
+
+
+def _splice(text: str, section: str) -> str:
+    """Replace the marked block in `text`, or insert it before the first section."""
+    start, end = text.find(SECTION_START), text.find(SECTION_END)
+    if start != -1 and end > start:
+        return text[:start] + section + text[end + len(SECTION_END):]
+    match = re.search(r"^## ", text, re.MULTILINE)
+    if match:
+        return text[:match.start()] + section + "\n\n---\n\n" + text[match.start():]
+    return text.rstrip("\n") + "\n\n" + section + "\n"
+
+
+def render_summary(
+    vault_path: Path,
+    platform: str,
+    store: Optional[MetricsStore] = None,
+    now: Optional[float] = None,
+) -> Optional[Path]:
+    """
+    Refresh the trend block of one platform's summary. Returns the path
+    when the file was written, None when nothing changed.
+    """
+    vault_path = Path(vault_path)
+    store = store or MetricsStore(vault_path / METRICS_DB_NAME)
+    spec = PLATFORMS[platform]
+    path = vault_path / "Social_Analytics" / spec["file"]
+
+    section = render_section(store, platform, now)
+    if path.exists():
+        text = path.read_text(encoding="utf-8")
+    else:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = (
+            f"---\ntype: social_analytics\nplatform: {spec['platform']}\n"
+            f"updated: \nupdated_by: system\n---\n\n# {spec['title']}\n"
+        )
+
+    start, end = text.find(SECTION_START), text.find(SECTION_END)
+    if start != -1 and end > start:
+        old = text[start:end + len(SECTION_END)]
+        if _UPDATED_LINE.sub("", old) == _UPDATED_LINE.sub("", section):
+            return None
+
+    text = _splice(text, section)
+    updated = datetime.fromtimestamp(
+        now if now is not None else time.time(), timezone.utc
+    ).strftime("%Y-%m-%dT%H:%M:%SZ")
+    text = re.sub(r"^updated:.*$", f"updated: {updated}", text, count=1, flags=re.MULTILINE)
+    path.write_text(text, encoding="utf-8")
+    logger.debug("Social_Analytics/%s trends refreshed", spec["file"])
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Render Social_Analytics trend sections")
+    parser.add_argument("--vault", default=str(Path(__file__).parent))
+    parser.add_argument("--platform", choices=sorted(PLATFORMS), action="append",
+                        help="Only this platform (repeatable; default: all)")
+    args = parser.parse_args()
+
+    vault = Path(args.vault)
+    store = MetricsStore(vault / METRICS_DB_NAME)
+    for platform in args.platform or sorted(PLATFORMS):
+        written = render_summary(vault, platform, store)
+        print(f"{platform}: {written or 'unchanged'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+ttl_cache.py — Gold Tier LRU cache with per-entry expiry
+
+Watchers that turn API IDs into something readable (Twitter user IDs →
+@username) see the same few IDs over and over. LRUTTLCache keeps the most
+recently used `max_size` entries, each valid for `ttl` seconds, so the
+watcher only asks the API about IDs it has not seen lately and batches
+those into one lookup.
+
+Entries are plain JSON values and to_dict() is ordered least → most
+recently used, so the cache survives a restart inside the watcher's own
+state file with its LRU order intact.
+
+Usage:
+    cache = LRUTTLCache(max_size=1000, ttl=86400, saved=state.get("users"))
+    missing = cache.missing(ids)               # expired or never seen
+    for user in lookup(missing): cache.put(user.id, {...})
+    cache.get(some_id)                         # None when missing/expired
+    state["users"] = cache.to_dict()
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional
+
+
+class LRUTTLCache:
+    """
+    Least-recently-used cache whose entries also expire after `ttl` seconds.
+
+    Args:
+        max_size: Entries kept; the least recently used is evicted first.
+        ttl:      Seconds an entry stays valid (wall clock, survives restarts).
+        saved:    Output of a previous to_dict(), or None.
+    """
+
+    def __init__(self, max_size: int, ttl: float, saved: Optional[dict] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        # key → {"value": ..., "at": epoch seconds}, least recently used first
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        now = time.time()
+        for key, entry in (saved or {}).items():
+            if isinstance(entry, dict) and now - entry.get("at", 0) < ttl:
+                self._entries[key] = {"value": entry.get("value"), "at": entry["at"]}
+        self._trim()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key) -> Any:
+        """The cached value (marked as recently used), or None."""
+        key = str(key)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.time() - entry["at"] >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry["value"]
+
+    def put(self, key, value) -> None:
+        key = str(key)
+        self._entries[key] = {"value": value, "at": time.time()}
+        self._entries.move_to_end(key)
+        self._trim()
+
+    def missing(self, keys: Iterable) -> list[str]:
+        """Keys (deduplicated, in order) with no valid entry."""
+        seen: dict[str, None] = {}
+        for key in keys:
+            key = str(key)
+            if key not in seen and self.get(key) is None:
+                seen[key] = None
+        return list(seen)
+
+    def _trim(self) -> None:
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def to_dict(self) -> dict:
+        """Serializable state (unexpired entries, least recently used first)."""
+        now = time.time()
+        return {
+            key: dict(entry)
+            for key, entry in self._entries.items()
+            if now - entry["at"] < self.ttl
+        }
@@ -7,7 +7,32 @@ Polls Twitter/X for:
   - Follower count changes (for Social_Analytics)
 
 Creates structured .md files in Needs_Action/ for Claude to process.
-Uses Tweepy with Twitter API v2 (Basic tier or higher required).
+Uses Tweepy's AsyncClient with Twitter API v2 (Basic tier or higher required).
+
+Each poll runs the mentions, DM and follower requests concurrently over one
+aiohttp session. Mentions and DMs are paginated (newest first) back to the
+last-seen ID, so a burst larger than one page is not skipped. A burst deeper
+than MAX_PAGES pages moves the cursor to the newest item and saves where it
+stopped (resume_mentions / resume_dms: the old cursor plus until_id or the
+page token); the next poll reads on from there. On the very first run, with
+no cursor yet, only the latest FIRST_RUN_MAX items are read.
+
+Rate limits are budgeted per endpoint from the x-rate-limit-* response
+headers (rate_budget.py) instead of tweepy's wait_on_rate_limit, which slept
+inside the call for up to 15 minutes. An endpoint that is out of budget, or
+whose remaining budget must be spread over the rest of the window, is
+skipped for that poll with its cursor unchanged; the other endpoints and
+shutdown are never held up.
+
+Mention authors and DM senders are resolved to @username through an LRU+TTL
+user cache (ttl_cache.py) kept in the state file. Mention pages already
+expand their authors, which fills the cache for free; IDs still unknown
+after a poll, typically DM senders, are looked up with one batched
+get_users call per USER_LOOKUP_MAX IDs rather than one request per message.
+
+Every poll also records its numbers (follower/tweet counts, mentions and DMs
+seen) in the metrics store and refreshes the trend section of
+Social_Analytics/Twitter_Summary.md (social_analytics.py).
 
 State is persisted in .twitter_watcher_state.json to avoid duplicate files.
 
@@ -20,23 +45,42 @@ Dependencies (install via uv):
 """
 
 import argparse
+import asyncio
 import hashlib
 import json
 import os
+import sqlite3
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
+import aiohttp
 import tweepy
+from tweepy.asynchronous import AsyncClient
 
 from base_watcher import BaseWatcher
 from audit_logger import log_action, log_watcher_start, log_watcher_stop, log_error
+from metrics_store import METRICS_DB_NAME, MetricsStore
+from rate_budget import RateLimitBudget, RateLimitSkip
+from social_analytics import render_summary
+from ttl_cache import LRUTTLCache
 
 # ---------------------------------------------------------------------------
 # State file — tracks last-seen IDs so we never duplicate
 # ---------------------------------------------------------------------------
 STATE_FILE_NAME = ".twitter_watcher_state.json"
 
+PAGE_SIZE     = 100     # API maximum for mentions and DM events
+FIRST_RUN_MAX = 10      # no cursor yet — read only the latest few
+MAX_PAGES     = 10      # safety cap per endpoint per poll
+
+USER_CACHE_SIZE  = 1000         # users kept for @username lookups
+USER_CACHE_TTL_S = 7 * 86400    # re-fetch after a week (renames)
+USER_LOOKUP_MAX  = 100          # IDs per get_users call (API maximum)
+
+# Failures that skip one endpoint for this poll rather than the whole poll
+POLL_ERRORS = (tweepy.TweepyException, aiohttp.ClientError, asyncio.TimeoutError)
+
 
 def _load_state(vault_path: Path) -> dict:
     state_file = vault_path / STATE_FILE_NAME
@@ -53,6 +97,32 @@ def _save_state(vault_path: Path, state: dict) -> None:
     state_file.write_text(json.dumps(state, indent=2), encoding="utf-8")
 
 
+class BudgetedAsyncClient(AsyncClient):
+    """
+    AsyncClient that consults a RateLimitBudget before every request and
+    feeds it the x-rate-limit-* headers of every response (429s included).
+    Raises RateLimitSkip instead of sending a request that is over budget.
+    """
+
+    def __init__(self, *args, budget: RateLimitBudget, **kwargs):
+        super().__init__(*args, wait_on_rate_limit=False, **kwargs)
+        self.budget = budget
+
+    async def request(self, method, route, params=None, json=None, user_auth=False):
+        key = self.budget.key(method, route)
+        # Continuation pages belong to a poll already under way — not paced
+        self.budget.acquire(key, paced="pagination_token" not in (params or {}))
+        try:
+            response = await super().request(
+                method, route, params=params, json=json, user_auth=user_auth
+            )
+        except tweepy.HTTPException as exc:
+            self.budget.update(key, exc.response.headers)
+            raise
+        self.budget.update(key, response.headers)
+        return response
+
+
 # ---------------------------------------------------------------------------
 # Watcher class
 # ---------------------------------------------------------------------------
@@ -63,7 +133,10 @@ class TwitterWatcher(BaseWatcher):
     def __init__(self, vault_path: str, check_interval: int = 300):
         super().__init__(vault_path, check_interval)
         self.state = _load_state(self.vault_path)
-        self._client: tweepy.Client | None = None
+        self.budget = RateLimitBudget(saved=self.state.get("rate_limits"))
+        self.users = LRUTTLCache(USER_CACHE_SIZE, USER_CACHE_TTL_S, saved=self.state.get("users"))
+        self.metrics = MetricsStore(self.vault_path / METRICS_DB_NAME)
+        self._client: AsyncClient | None = None
         self._me: tweepy.User | None = None
         self._setup_client()
 
@@ -87,22 +160,22 @@ class TwitterWatcher(BaseWatcher):
             )
             sys.exit(1)
 
-        self._client = tweepy.Client(
+        self._client = BudgetedAsyncClient(
             bearer_token=bearer,
             consumer_key=api_key,
             consumer_secret=api_sec,
             access_token=acc_tok,
             access_token_secret=acc_sec,
-            wait_on_rate_limit=True,
+            budget=self.budget,
         )
 
         try:
-            me_resp = self._client.get_me(user_fields=["public_metrics"])
+            me_resp = asyncio.run(self._client.get_me(user_fields=["public_metrics"]))
             self._me = me_resp.data
             self.logger.info(
                 "Authenticated as @%s (id=%s)", self._me.username, self._me.id
             )
-        except tweepy.TweepyException as exc:
+        except (RateLimitSkip, *POLL_ERRORS) as exc:
             self.logger.error("Twitter auth failed: %s", exc)
             sys.exit(1)
 
@@ -112,88 +185,189 @@ class TwitterWatcher(BaseWatcher):
 
     def check_for_updates(self) -> list[dict]:
         """Poll Twitter for new mentions, DMs, and follower changes."""
-        items: list[dict] = []
-
-        # Mentions
-        try:
-            items.extend(self._poll_mentions())
-        except tweepy.TweepyException as exc:
-            self.logger.warning("Mentions poll failed: %s", exc)
-            log_error("twitter_watcher", "mentions_poll", str(exc))
-
-        # DMs
-        try:
-            items.extend(self._poll_dms())
-        except tweepy.TweepyException as exc:
-            self.logger.warning("DM poll failed: %s", exc)
-            log_error("twitter_watcher", "dm_poll", str(exc))
-
-        # Follower count change
-        try:
-            follower_item = self._check_follower_count()
-            if follower_item:
-                items.append(follower_item)
-        except tweepy.TweepyException as exc:
-            self.logger.warning("Follower check failed: %s", exc)
+        return asyncio.run(self.check_for_updates_async())
+
+    async def check_for_updates_async(self) -> list[dict]:
+        """Run the three polls concurrently over one HTTP session."""
+        async with aiohttp.ClientSession() as session:
+            self._client.session = session
+            try:
+                mentions, dms, followers = await asyncio.gather(
+                    self._poll_mentions(),
+                    self._poll_dms(),
+                    self._check_follower_count(),
+                    return_exceptions=True,
+                )
+
+                mentions = self._poll_result(mentions, "Mentions poll", "mentions_poll")
+                dms = self._poll_result(dms, "DM poll", "dm_poll")
+                items: list[dict] = [*(mentions or []), *(dms or [])]
+                await self._resolve_users(items)
+                follower_item = self._poll_result(followers, "Follower check")
+                if follower_item:
+                    items.append(follower_item)
+            finally:
+                self._client.session = None
+
+        # A skipped or failed poll records nothing — a gap, not a zero
+        self._record_metrics("counter", {
+            series: len(result)
+            for series, result in (("twitter.mentions", mentions), ("twitter.dms", dms))
+            if result is not None
+        })
+        self._save_state()
+        return items
 
+    def _save_state(self) -> None:
+        self.state["rate_limits"] = self.budget.to_dict()
+        self.state["users"] = self.users.to_dict()
         _save_state(self.vault_path, self.state)
-        return items
 
-    def _poll_mentions(self) -> list[dict]:
-        """Fetch new mentions since last seen ID."""
-        kwargs: dict = {
+    def _poll_result(self, result, label: str, error_op: str | None = None):
+        """Unwrap one gathered result; poll errors are logged and yield None."""
+        if isinstance(result, RateLimitSkip):
+            # Cursor untouched — the next poll in budget picks everything up
+            self.logger.info("%s skipped — %s", label, result)
+            return None
+        if isinstance(result, POLL_ERRORS):
+            self.logger.warning("%s failed: %s", label, result)
+            if error_op:
+                log_error("twitter_watcher", error_op, str(result))
+            return None
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    async def _pages(self, method, first_run: bool, more: dict, **kwargs):
+        """
+        Yield response pages, newest first, following next_token. Without a
+        cursor (first run) only one page of FIRST_RUN_MAX items is read.
+        If MAX_PAGES run out first, more["next_token"] is set to where the
+        walk stopped.
+        """
+        kwargs["max_results"] = FIRST_RUN_MAX if first_run else PAGE_SIZE
+        for _ in range(1 if first_run else MAX_PAGES):
+            resp = await method(**kwargs)
+            yield resp
+            token = (resp.meta or {}).get("next_token")
+            if not token:
+                return
+            kwargs["pagination_token"] = token
+        if not first_run:
+            more["next_token"] = kwargs["pagination_token"]
+
+    def _warn_resume(self, label: str, resume: list) -> None:
+        if resume:
+            self.logger.warning(
+                "%s: more than %d pages — the rest is read from there next poll",
+                label, MAX_PAGES,
+            )
+
+    async def _poll_mentions(self) -> list[dict]:
+        """
+        Fetch all mentions since the last seen ID (every page), then the
+        older stretches earlier polls ran out of pages for.
+        """
+        since = self.state["last_mention_id"]
+        base: dict = {
             "id": self._me.id,
             "tweet_fields": ["created_at", "text", "author_id", "conversation_id"],
             "expansions": ["author_id"],
             "user_fields": ["username", "name"],
-            "max_results": 10,
         }
-        if self.state["last_mention_id"]:
-            kwargs["since_id"] = self.state["last_mention_id"]
-
-        resp = self._client.get_users_mentions(**kwargs)
-        if not resp.data:
+        # (floor, extra kwargs): new mentions above the cursor, then each saved
+        # stretch between an old cursor and the oldest mention read so far
+        walks = [(since, {})] + [
+            (r["floor"], {"until_id": r["until_id"]}) for r in self.state.get("resume_mentions", [])
+        ]
+
+        tweets, resume = [], []
+        for floor, extra in walks:
+            kwargs = {**base, **extra}
+            if floor:
+                kwargs["since_id"] = floor
+            walked, more = [], {}
+            async for resp in self._pages(self._client.get_users_mentions, not floor, more, **kwargs):
+                walked.extend(resp.data or [])
+                # Expanded authors come with the page — cache them for DMs too
+                self._cache_users((resp.includes or {}).get("users"))
+            if more and walked:
+                resume.append({"floor": floor, "until_id": str(walked[-1].id)})
+            tweets.extend(walked)
+
+        self._warn_resume("Mentions", resume)
+        self.state["resume_mentions"] = resume
+        if not tweets:
             return []
 
-        # Build author lookup
-        users = {u.id: u for u in (resp.includes.get("users") or [])}
-
         items = []
-        for tweet in resp.data:
-            author = users.get(tweet.author_id)
+        for tweet in tweets:
             items.append({
                 "event_type": "mention",
                 "tweet_id": str(tweet.id),
                 "author_id": str(tweet.author_id),
-                "author_username": author.username if author else "unknown",
-                "author_name": author.name if author else "Unknown",
                 "text": tweet.text,
                 "created_at": tweet.created_at.isoformat() if tweet.created_at else datetime.now(timezone.utc).isoformat(),
                 "conversation_id": str(tweet.conversation_id) if tweet.conversation_id else None,
             })
 
-        # Track newest
-        self.state["last_mention_id"] = str(resp.data[0].id)
+        # Track newest — resumed stretches are older, never move the cursor back
+        newest = max(int(tweet.id) for tweet in tweets)
+        if not since or newest > int(since):
+            self.state["last_mention_id"] = str(newest)
         self.logger.info("Found %d new mention(s)", len(items))
         return items
 
-    def _poll_dms(self) -> list[dict]:
-        """Fetch new direct messages."""
-        kwargs: dict = {"dm_event_fields": ["created_at", "text", "sender_id"], "max_results": 10}
-        if self.state["last_dm_id"]:
-            kwargs["since_id"] = self.state["last_dm_id"]
-
+    async def _poll_dms(self) -> list[dict]:
+        """
+        Fetch new direct messages. /2/dm_events has no since_id, so pages
+        are read newest first until the last seen event ID; stretches an
+        earlier poll ran out of pages for continue from their page token.
+        """
+        since = self.state["last_dm_id"]
+        walks = [(since, {})] + [
+            (r["floor"], {"pagination_token": r["pagination_token"]})
+            for r in self.state.get("resume_dms", [])
+        ]
+
+        events, resume = [], []
         try:
-            resp = self._client.get_direct_message_events(**kwargs)
+            for floor, extra in walks:
+                walked, more = [], {}
+                try:
+                    async for resp in self._pages(
+                        self._client.get_direct_message_events, not floor, more,
+                        dm_event_fields=["created_at", "text", "sender_id"],
+                        event_types="MessageCreate",
+                        **extra,
+                    ):
+                        fresh = [dm for dm in (resp.data or []) if not floor or int(dm.id) > int(floor)]
+                        walked.extend(fresh)
+                        if len(fresh) < len(resp.data or []):
+                            break       # reached the cursor
+                except tweepy.errors.BadRequest as exc:
+                    if not extra:
+                        raise
+                    # Page tokens do not live forever; nothing else can reach that stretch
+                    self.logger.warning(
+                        "DM poll: saved page token rejected (%s) — DMs between %s and the "
+                        "last one read are not recovered", exc, floor,
+                    )
+                    continue
+                if more:
+                    resume.append({"floor": floor, "pagination_token": more["next_token"]})
+                events.extend(walked)
         except tweepy.errors.Forbidden:
             # DM access requires Elevated API access — skip silently
             return []
 
-        if not resp.data:
+        self._warn_resume("DMs", resume)
+        self.state["resume_dms"] = resume
+        if not events:
             return []
 
         items = []
-        for dm in resp.data:
+        for dm in events:
             if str(dm.sender_id) == str(self._me.id):
                 continue  # Skip our own outbound DMs
             items.append({
@@ -204,21 +378,30 @@ class TwitterWatcher(BaseWatcher):
                 "created_at": dm.created_at.isoformat() if dm.created_at else datetime.now(timezone.utc).isoformat(),
             })
 
-        if resp.data:
-            self.state["last_dm_id"] = str(resp.data[0].id)
+        newest = max(int(dm.id) for dm in events)
+        if not since or newest > int(since):
+            self.state["last_dm_id"] = str(newest)
 
         self.logger.info("Found %d new DM(s)", len(items))
         return items
 
-    def _check_follower_count(self) -> dict | None:
+    async def _check_follower_count(self) -> dict | None:
         """Check for significant follower count change (±10 or more)."""
-        resp = self._client.get_user(
+        resp = await self._client.get_user(
             id=self._me.id, user_fields=["public_metrics"]
         )
         if not resp.data or not resp.data.public_metrics:
             return None
 
-        current = resp.data.public_metrics.get("followers_count", 0)
+        metrics = resp.data.public_metrics
+        self._record_metrics("gauge", {
+            "twitter.followers": metrics.get("followers_count", 0),
+            "twitter.following": metrics.get("following_count", 0),
+            "twitter.tweets":    metrics.get("tweet_count", 0),
+            "twitter.listed":    metrics.get("listed_count", 0),
+        })
+
+        current = metrics.get("followers_count", 0)
         previous = self.state.get("last_follower_count", 0)
         change = current - previous
 
@@ -239,6 +422,54 @@ class TwitterWatcher(BaseWatcher):
             }
         return None
 
+    def _record_metrics(self, kind: str, values: dict) -> None:
+        """Append to the metrics store and refresh the summary; never fails a poll."""
+        try:
+            self.metrics.record(values, kind=kind)
+            if kind == "counter":       # once per poll, after the gauges
+                render_summary(self.vault_path, "twitter", self.metrics)
+        except (sqlite3.Error, OSError) as exc:
+            self.logger.warning("Could not record Twitter metrics: %s", exc)
+
+    # ------------------------------------------------------------------
+    # User lookup (LRU+TTL cache, batched get_users)
+    # ------------------------------------------------------------------
+
+    def _cache_users(self, users) -> None:
+        for user in users or []:
+            self.users.put(user.id, {"username": user.username, "name": user.name})
+
+    async def _resolve_users(self, items: list[dict]) -> None:
+        """
+        Add <role>_username / <role>_name to mention and DM items. Cached
+        users cost nothing; the rest are fetched USER_LOOKUP_MAX per request.
+        A failed lookup leaves "unknown" — the items are never held back.
+        """
+        roles = {"mention": "author", "dm": "sender"}
+        people = [(item, roles[item["event_type"]]) for item in items if item["event_type"] in roles]
+        missing = self.users.missing(item[f"{role}_id"] for item, role in people)
+
+        for start in range(0, len(missing), USER_LOOKUP_MAX):
+            try:
+                resp = await self._client.get_users(
+                    ids=missing[start:start + USER_LOOKUP_MAX],
+                    user_fields=["username", "name"],
+                )
+            except RateLimitSkip as exc:
+                self.logger.info("User lookup skipped — %s", exc)
+                break
+            except POLL_ERRORS as exc:
+                self.logger.warning("User lookup failed: %s", exc)
+                break
+            self._cache_users(resp.data)
+        if missing:
+            self.logger.debug("User lookup: %d ID(s) were not cached", len(missing))
+
+        for item, role in people:
+            user = self.users.get(item[f"{role}_id"]) or {}
+            item[f"{role}_username"] = user.get("username", "unknown")
+            item[f"{role}_name"] = user.get("name", "Unknown")
+
     # ------------------------------------------------------------------
     # File creation
     # ------------------------------------------------------------------
@@ -320,11 +551,14 @@ status: pending
 created: {datetime.now(timezone.utc).isoformat()}
 dm_id: "{item['dm_id']}"
 sender_id: "{item['sender_id']}"
+sender_username: "@{item['sender_username']}"
+sender_name: "{item['sender_name']}"
 logged: false
 ---
 
-# Twitter DM — Sender ID {item['sender_id']}
+# Twitter DM — @{item['sender_username']}
 
+**From:** {item['sender_name']} (@{item['sender_username']})
 **Sender ID:** {item['sender_id']}
 **Time:** {item['created_at']}
 
@@ -345,9 +579,9 @@ _Add triage notes here after review._
         log_action(
             action_type="twitter_dm_received",
             source="twitter_watcher",
-            target=f"sender:{item['sender_id']}",
+            target=f"@{item['sender_username']}",
             approval_status="not_required",
-            notes=f"DM ID {item['dm_id']}",
+            notes=f"DM ID {item['dm_id']}, sender ID {item['sender_id']}",
         )
         return file_path
 
@@ -376,7 +610,8 @@ logged: false
 
 ## Action Required
 
-Update `Social_Analytics/Twitter_Summary.md` with the new follower count.
+`Social_Analytics/Twitter_Summary.md` already shows the new count and its
+trend (generated by `social_analytics.py`) — no manual update needed.
 
 If significant growth (+50 or more), consider:
 - Drafting a thank-you tweet via `SKILL_Twitter_Draft`
@@ -392,7 +627,7 @@ If significant growth (+50 or more), consider:
         return file_path
 
     def shutdown(self) -> None:
-        _save_state(self.vault_path, self.state)
+        self._save_state()
         log_watcher_stop("twitter_watcher")
 
 
@@ -0,0 +1,211 @@
+"""
+webhook_replay.py — Gold AI Employee local push/webhook stand-in
+================================================================
+
+Posts sample push notifications to a watcher's local receiver so push mode
+can be exercised end-to-end without any Google or Meta services.
+
+  gmail — Pub/Sub push envelope, as delivered by a Gmail users.watch()
+          subscription, to GmailWatcher's /gmail/push endpoint
+  meta  — Meta webhook delivery (Page message, Page comment or Instagram
+          comment, or any JSON file), signed with X-Hub-Signature-256 like
+          Meta signs it, to FacebookWatcher's /meta/webhook endpoint
+
+Usage:
+    # Terminal 1 — watcher with push receiver
+    python gmail_watcher.py --push-port 8765 --push-token secret --interval 900
+
+    # Terminal 2 — send one notification (watcher polls immediately)
+    python webhook_replay.py gmail --port 8765 --token secret
+    python webhook_replay.py gmail --port 8765 --email sales@example.com --count 3
+
+    # Meta — watcher with webhook receiver (META_APP_SECRET=secret in .env)
+    python facebook_watcher.py --webhook-port 8766 --interval 1800
+    python webhook_replay.py meta --port 8766 --app-secret secret --event message
+    python webhook_replay.py meta --port 8766 --app-secret secret --event ig_comment
+    python webhook_replay.py meta --port 8766 --app-secret secret --file sample.json
+    python webhook_replay.py meta --port 8766 --verify-token change-me   # subscription handshake
+"""
+
+import argparse
+import base64
+import hashlib
+import hmac
+import json
+import os
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime, timezone
+
+
+def _post(url: str, body: bytes, headers: dict[str, str]) -> tuple[int, str]:
+    req = urllib.request.Request(url, data=body, method="POST", headers=headers)
+    return _send(req)
+
+
+def _send(req: urllib.request.Request) -> tuple[int, str]:
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status, resp.read().decode("utf-8", errors="replace")
+    except urllib.error.HTTPError as exc:
+        return exc.code, exc.read().decode("utf-8", errors="replace")
+
+
+def gmail_envelope(email: str, history_id: int) -> dict:
+    """Build a Pub/Sub push envelope carrying a Gmail notification."""
+    data = json.dumps({"emailAddress": email, "historyId": history_id}).encode()
+    return {
+        "message": {
+            "data": base64.b64encode(data).decode("ascii"),
+            "messageId": str(int(time.time() * 1000)),
+            "publishTime": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        },
+        "subscription": "projects/local-test/subscriptions/gmail-push",
+    }
+
+
+def replay_gmail(args: argparse.Namespace) -> int:
+    url = f"http://{args.host}:{args.port}/gmail/push"
+    if args.token:
+        url += f"?token={args.token}"
+
+    failures = 0
+    for i in range(args.count):
+        envelope = gmail_envelope(args.email, args.history_id + i)
+        status, text = _post(
+            url, json.dumps(envelope).encode(), {"Content-Type": "application/json"}
+        )
+        ok = 200 <= status < 300
+        failures += not ok
+        print(f"[{'OK' if ok else 'FAIL'}] POST {url} → {status} {text}".rstrip())
+    return 1 if failures else 0
+
+
+def meta_payload(event: str, page_id: str, ig_id: str, text: str, seq: int) -> dict:
+    """Build a Meta webhook delivery carrying one new message or comment."""
+    now = time.time()
+    uid = f"{int(now * 1000)}{seq}"
+    if event == "message":
+        return {
+            "object": "page",
+            "entry": [{
+                "id": page_id,
+                "time": int(now * 1000),
+                "messaging": [{
+                    "sender": {"id": f"99{uid}"},
+                    "recipient": {"id": page_id},
+                    "timestamp": int(now * 1000),
+                    "message": {"mid": f"m_replay{uid}", "text": text},
+                }],
+            }],
+        }
+    if event == "comment":
+        return {
+            "object": "page",
+            "entry": [{
+                "id": page_id,
+                "time": int(now),
+                "changes": [{
+                    "field": "feed",
+                    "value": {
+                        "item": "comment",
+                        "verb": "add",
+                        "post_id": f"{page_id}_1000",
+                        "comment_id": f"{page_id}_1000_{uid}",
+                        "created_time": int(now),
+                        "from": {"id": f"99{uid}", "name": "Replay Visitor"},
+                        "message": text,
+                    },
+                }],
+            }],
+        }
+    return {
+        "object": "instagram",
+        "entry": [{
+            "id": ig_id,
+            "time": int(now),
+            "changes": [{
+                "field": "comments",
+                "value": {
+                    "id": f"18{uid}",
+                    "text": text,
+                    "from": {"id": f"17{uid}", "username": "replay_visitor"},
+                    "media": {"id": "17900000000000000", "media_product_type": "FEED"},
+                },
+            }],
+        }],
+    }
+
+
+def replay_meta(args: argparse.Namespace) -> int:
+    url = f"http://{args.host}:{args.port}/meta/webhook"
+
+    if args.verify_token:
+        query = urllib.parse.urlencode({
+            "hub.mode": "subscribe",
+            "hub.verify_token": args.verify_token,
+            "hub.challenge": "replay-challenge",
+        })
+        status, text = _send(urllib.request.Request(f"{url}?{query}", method="GET"))
+        ok = status == 200 and text == "replay-challenge"
+        print(f"[{'OK' if ok else 'FAIL'}] GET {url} (handshake) → {status} {text}".rstrip())
+        return 0 if ok else 1
+
+    failures = 0
+    for i in range(args.count):
+        if args.file:
+            with open(args.file, "rb") as f:
+                body = f.read()
+        else:
+            payload = meta_payload(args.event, args.page_id, args.ig_id, args.text, i)
+            body = json.dumps(payload).encode()
+        signature = hmac.new(args.app_secret.encode(), body, hashlib.sha256).hexdigest()
+        status, text = _post(url, body, {
+            "Content-Type": "application/json",
+            "X-Hub-Signature-256": f"sha256={signature}",
+        })
+        ok = status == 200
+        failures += not ok
+        print(f"[{'OK' if ok else 'FAIL'}] POST {url} → {status} {text}".rstrip())
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay sample push notifications to a local watcher")
+    sub = parser.add_subparsers(dest="source", required=True)
+
+    gmail = sub.add_parser("gmail", help="Gmail Pub/Sub push notification")
+    gmail.add_argument("--host", default="127.0.0.1")
+    gmail.add_argument("--port", type=int, default=8765)
+    gmail.add_argument("--token", default=None, help="Value for ?token= (matches --push-token)")
+    gmail.add_argument("--email", default="me@example.com", help="emailAddress in the notification")
+    gmail.add_argument("--history-id", type=int, default=100000, dest="history_id")
+    gmail.add_argument("--count", type=int, default=1, help="Number of notifications to send")
+    gmail.set_defaults(func=replay_gmail)
+
+    meta = sub.add_parser("meta", help="Meta (Facebook/Instagram) webhook delivery")
+    meta.add_argument("--host", default="127.0.0.1")
+    meta.add_argument("--port", type=int, default=8766)
+    meta.add_argument("--app-secret", default="", dest="app_secret",
+                      help="Signs the body (matches META_APP_SECRET)")
+    meta.add_argument("--event", choices=["message", "comment", "ig_comment"], default="message")
+    meta.add_argument("--page-id", default=os.environ.get("FACEBOOK_PAGE_ID", "1000"), dest="page_id",
+                      help="Entry id; must match the watcher's FACEBOOK_PAGE_ID")
+    meta.add_argument("--ig-id", default=os.environ.get("INSTAGRAM_ACCOUNT_ID", "1784"), dest="ig_id",
+                      help="Entry id for ig_comment; must match INSTAGRAM_ACCOUNT_ID")
+    meta.add_argument("--text", default="Hi! Do you ship to Ireland?")
+    meta.add_argument("--file", default=None, help="Send this JSON file as the body instead")
+    meta.add_argument("--count", type=int, default=1, help="Number of deliveries to send")
+    meta.add_argument("--verify-token", default=None, dest="verify_token",
+                      help="Only run the GET subscription handshake (matches META_VERIFY_TOKEN)")
+    meta.set_defaults(func=replay_meta)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+webhook_server.py — Gold Tier Local Webhook Receiver
+
+A tiny threaded HTTP server that watchers embed to receive push
+notifications (Gmail via Pub/Sub push, Meta webhooks) instead of waiting
+for their next poll. Standard library only — no web framework needed.
+
+Expose it to the internet through your reverse proxy or tunnel of choice;
+by default it binds to 127.0.0.1 only.
+
+Usage:
+    from webhook_server import WebhookServer, WebhookRequest
+
+    def handle(req: WebhookRequest) -> tuple[int, str]:
+        payload = req.json()
+        ...
+        return 204, ""
+
+    server = WebhookServer(port=8765, routes={"/gmail/push": handle})
+    server.start()      # serves from a background daemon thread
+    ...
+    server.stop()
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qsl, urlsplit
+
+logger = logging.getLogger(__name__)
+
+#: Largest request body accepted (push payloads are a few KB at most)
+MAX_BODY_BYTES = 1024 * 1024
+
+
+@dataclass
+class WebhookRequest:
+    """One incoming request, already read off the socket."""
+
+    method: str
+    path: str
+    query: dict[str, str] = field(default_factory=dict)
+    headers: dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    def json(self) -> Any:
+        """Decode the body as JSON (raises ValueError on malformed input)."""
+        return json.loads(self.body or b"null")
+
+
+Handler = Callable[[WebhookRequest], tuple[int, str]]
+
+
+class WebhookServer:
+    """
+    Route GET/POST requests by exact path to handler callables.
+
+    Handlers return (status_code, body_text). Unknown paths get 404,
+    oversized bodies 413, and handler exceptions 500 (logged, never raised
+    into the serving thread).
+
+    Args:
+        port:   TCP port to bind. 0 picks a free port (see .port after start()).
+        routes: Mapping of path → handler.
+        host:   Interface to bind. Default 127.0.0.1 (local only).
+    """
+
+    def __init__(self, port: int, routes: dict[str, Handler], host: str = "127.0.0.1"):
+        self.host = host
+        self.routes = dict(routes)
+        self._requested_port = port
+        self._httpd: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        """The bound port (resolves port 0 once the server has started)."""
+        if self._httpd:
+            return self._httpd.server_address[1]
+        return self._requested_port
+
+    def start(self) -> None:
+        """Bind the socket and serve forever from a daemon thread."""
+        routes = self.routes
+
+        class _Handler(BaseHTTPRequestHandler):
+            def _dispatch(self) -> None:
+                parts = urlsplit(self.path)
+                handler = routes.get(parts.path)
+                if handler is None:
+                    self._reply(404, "not found")
+                    return
+
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_BODY_BYTES:
+                    self._reply(413, "payload too large")
+                    return
+
+                request = WebhookRequest(
+                    method=self.command,
+                    path=parts.path,
+                    query=dict(parse_qsl(parts.query)),
+                    headers={k.lower(): v for k, v in self.headers.items()},
+                    body=self.rfile.read(length) if length else b"",
+                )
+                try:
+                    status, text = handler(request)
+                except Exception as exc:
+                    logger.error("Webhook handler for %s failed: %s", parts.path, exc, exc_info=True)
+                    status, text = 500, "internal error"
+                self._reply(status, text)
+
+            def _reply(self, status: int, text: str) -> None:
+                body = text.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            do_GET = _dispatch
+            do_POST = _dispatch
+
+            def log_message(self, fmt: str, *args: Any) -> None:
+                logger.debug("webhook %s — " + fmt, self.address_string(), *args)
+
+        self._httpd = ThreadingHTTPServer((self.host, self._requested_port), _Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name=f"Webhook:{self.port}", daemon=True
+        )
+        self._thread.start()
+        logger.info("Webhook receiver listening on http://%s:%d %s",
+                    self.host, self.port, sorted(self.routes))
+
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
@@ -41,6 +41,10 @@ Usage:
     # Custom vault path and poll interval
     python whatsapp_watcher.py --vault /path/to/silver --interval 60
 
+    # Event mode — react to sidebar changes as they happen; the interval
+    # becomes a slow reconciliation pass
+    python whatsapp_watcher.py --events --interval 300
+
 Setup:
     1. uv sync  (playwright already in pyproject.toml)
     2. uv run playwright install chromium  (one-time browser download)
@@ -61,6 +65,27 @@ Notes:
       keeping WhatsApp logged in between runs.
     - WhatsApp may occasionally show a "Use Here" popup if another device
       connects — the watcher handles this automatically.
+    - The browser runs with the lean profile from browser_profile.py: images,
+      media, fonts and trackers are blocked (images stay on with
+      --no-headless), plus extra Chromium flags. BROWSER_LEAN=false disables.
+    - Memory watchdog: every WHATSAPP_MEMORY_CHECK_S the watcher samples its
+      Chromium process tree (PSS) and the page's JS heap. Past
+      WHATSAPP_MAX_BROWSER_MB / WHATSAPP_MAX_JS_HEAP_MB the context is closed
+      and relaunched from the same session folder (no QR re-scan). Recycles
+      are written to the audit log (browser_recycled) and counted under
+      "browser" in .whatsapp_watcher_state.json.
+    - Event mode installs a MutationObserver on the chat list and reports
+      unread-badge changes through page.expose_binding(). The sync Playwright
+      API only dispatches such callbacks while it is servicing a call, so
+      between polls the watcher idles inside page.wait_for_timeout() slices
+      rather than a plain sleep.
+    - Selector lists are self-calibrating (selector_calibration.py): each
+      poll records which selector in every list matched, the lists are
+      re-ranked by hit rate and persisted under "selectors" in the state
+      file, so after a restart the working selectors are tried first. Every
+      WHATSAPP_SELECTOR_RECALIBRATE_S all selectors are probed at once to
+      pick up DOM changes. A chat list that is already rendered is found
+      with one in-page check, without any wait_for_selector() timeouts.
     - WhatsApp ToS: use this for personal business automation only.
 """
 
@@ -69,6 +94,7 @@ import json
 import os
 import re
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional
@@ -92,7 +118,17 @@ except ImportError:
     )
     sys.exit(1)
 
+from audit_logger import log_action
 from base_watcher import BaseWatcher
+from browser_pool import DESKTOP_USER_AGENT, BrowserBroker
+from browser_profile import (
+    block_heavy_resources,
+    find_browser_pid,
+    js_heap_mb,
+    launch_args,
+    process_tree_usage,
+)
+from selector_calibration import SelectorCalibrator
 
 
 # ---------------------------------------------------------------------------
@@ -118,6 +154,8 @@ PRIORITY_TIERS: list[tuple[str, list[str]]] = [
 # WhatsApp updates its DOM frequently. We use ordered fallback lists so the
 # watcher keeps working even when specific data-testid attributes disappear.
 # If all selectors in a list fail, the watcher warns and skips the poll.
+# The order below is the starting point — SelectorCalibrator re-ranks each
+# list by observed hit rate (see SELECTOR_LISTS).
 # ---------------------------------------------------------------------------
 
 # Chat list sidebar — try each in order until one is visible
@@ -148,6 +186,13 @@ LAST_MSG_SELECTORS: list[str] = [
     "div[role='gridcell'] span",
 ]
 
+# Last-activity time inside a chat row ("10:42", "Yesterday", a date)
+CHAT_TIME_SELECTORS: list[str] = [
+    '[data-testid="cell-frame-primary-detail"]',
+    "div._ak8i",                            # Internal class (changes with deploys)
+    "div[role='gridcell'] + div span",
+]
+
 # Unread count badge inside a chat row
 UNREAD_BADGE_SELECTORS: list[str] = [
     '[data-testid="icon-unread-count"]',
@@ -165,6 +210,187 @@ SEL_QR_CODE = (
     '[data-testid="qrcode"]'
 )
 
+# Pin icon inside a chat row — pinned chats sit above newer activity
+PINNED_ICON_SELECTORS: list[str] = [
+    "span[data-icon='pinned']",
+    "span[data-icon='pinned2']",
+    '[data-testid="icon-pinned"]',
+]
+
+#: Calibrated selector lists, by the names used in the state file
+SELECTOR_LISTS: dict[str, list[str]] = {
+    "chat_list": CHAT_LIST_SELECTORS,
+    "chat_row":  CHAT_ROW_SELECTORS,
+    "title":     CHAT_TITLE_SELECTORS,
+    "preview":   LAST_MSG_SELECTORS,
+    "time":      CHAT_TIME_SELECTORS,
+    "badge":     UNREAD_BADGE_SELECTORS,
+    "pinned":    PINNED_ICON_SELECTORS,
+}
+
+# In-page extractor: applies the fallback selector lists above inside the
+# browser and returns chat rows as {sender, preview, unread, pinned} in a
+# single CDP round trip (unread is the badge text, or null when the chat is
+# read). Rows are ordered by last activity, so extraction stops at the
+# unpinned row matching stopAt (the top unpinned row of the last fully
+# processed poll); pinned rows are always read. `head` is the current top
+# unpinned row — the next marker. A row's key is sender, preview, time and
+# unread count: a chat that jumps back to the top with the same preview
+# ("ok", "Photo") must not match its old key, or the chats that changed
+# below it would be skipped. If stopAt is not found every row is read.
+# `stats` counts, per list, which selector matched first (hits) and which
+# were tried before it (misses), for SelectorCalibrator.
+EXTRACT_CHAT_ROWS_JS = """
+({rowSelectors, titleSelectors, previewSelectors, timeSelectors, badgeSelectors, pinnedSelectors, stopAt}) => {
+    const stats = {};
+    const tally = (name, selectors, i) => {
+        const s = stats[name] || (stats[name] = {hits: {}, misses: {}});
+        s.hits[selectors[i]] = (s.hits[selectors[i]] || 0) + 1;
+        for (let j = 0; j < i; j++) s.misses[selectors[j]] = (s.misses[selectors[j]] || 0) + 1;
+    };
+    const first = (root, selectors, name) => {
+        for (let i = 0; i < selectors.length; i++) {
+            try {
+                const el = root.querySelector(selectors[i]);
+                if (el) { tally(name, selectors, i); return el; }
+            } catch (e) { /* invalid selector in this DOM — try the next */ }
+        }
+        return null;
+    };
+
+    let rows = [], matched = null;
+    for (let i = 0; i < rowSelectors.length; i++) {
+        try { rows = Array.from(document.querySelectorAll(rowSelectors[i])); } catch (e) { rows = []; }
+        if (rows.length) { matched = rowSelectors[i]; tally("chat_row", rowSelectors, i); break; }
+    }
+
+    const out = [];
+    let head = null, stopped = null;
+    for (let i = 0; i < rows.length; i++) {
+        const row     = rows[i];
+        const badge   = first(row, badgeSelectors, "badge");
+        const titleEl = first(row, titleSelectors, "title");
+        const msgEl   = first(row, previewSelectors, "preview");
+        const timeEl  = first(row, timeSelectors, "time");
+        const pinned  = first(row, pinnedSelectors, "pinned") !== null;
+
+        let sender  = titleEl
+            ? (titleEl.getAttribute("title") || titleEl.innerText.trim())
+            : "Unknown";
+        let preview = msgEl ? msgEl.innerText.trim() : "";
+
+        // Nothing useful from the selectors — fall back to the row text
+        if (!sender && !preview) {
+            const lines = row.innerText.split("\\n").map((l) => l.trim()).filter(Boolean);
+            sender  = lines[0] || "Unknown";
+            preview = lines.slice(1).join(" ");
+        }
+
+        const unread = badge ? (badge.innerText.trim() || "?") : null;
+        if (!pinned) {
+            const time = timeEl ? timeEl.innerText.trim() : "";
+            const key  = [sender, preview, time, unread || ""].join("\\n");
+            if (head === null) head = key;
+            if (stopAt && key === stopAt) { stopped = i; break; }
+        }
+        out.push({sender, preview, pinned, unread});
+    }
+    return {selector: matched, rows: out, head, stopped, stats};
+}
+"""
+
+# First selector whose element is present and rendered, or null — finds an
+# already-loaded chat list in one round trip instead of per-selector waits.
+FIRST_VISIBLE_JS = """
+(selectors) => {
+    for (const sel of selectors) {
+        try {
+            const el = document.querySelector(sel);
+            if (el && el.getClientRects().length) return sel;
+        } catch (e) { /* invalid selector in this DOM — try the next */ }
+    }
+    return null;
+}
+"""
+
+# Re-calibration probe: runs EVERY selector of every list, not just up to the
+# first match. Document-level lists count matching elements; per-row lists
+# count how many of the first sampleRows chat rows contain a match.
+PROBE_SELECTORS_JS = """
+({documentLists, rowLists, rowSelectors, sampleRows}) => {
+    const count = (root, sel) => {
+        try { return root.querySelectorAll(sel).length; } catch (e) { return 0; }
+    };
+    const out = {};
+    for (const [name, sels] of Object.entries(documentLists)) {
+        out[name] = Object.fromEntries(sels.map((s) => [s, count(document, s)]));
+    }
+    let rows = [];
+    for (const sel of rowSelectors) {
+        if (count(document, sel)) { rows = Array.from(document.querySelectorAll(sel)).slice(0, sampleRows); break; }
+    }
+    for (const [name, sels] of Object.entries(rowLists)) {
+        out[name] = Object.fromEntries(sels.map((s) => [s, rows.filter((r) => count(r, s) > 0).length]));
+    }
+    return out;
+}
+"""
+
+# In-page observer for event mode: watches the chat list subtree and calls
+# the exposed binding whenever the set of unread badges (and their counts)
+# changes. Mutations are coalesced for OBSERVER_DEBOUNCE_MS so a burst of
+# re-renders produces one callback. Idempotent: re-running it is a no-op
+# while the observed node is still attached, and re-attaches if WhatsApp
+# replaced it.
+INSTALL_UNREAD_OBSERVER_JS = """
+({listSelector, badgeSelectors, binding, debounceMs}) => {
+    const target = document.querySelector(listSelector);
+    if (!target) return false;
+    const state = window.__aiEmployeeUnread || (window.__aiEmployeeUnread = {});
+    if (state.target === target && target.isConnected) return true;
+    if (state.observer) state.observer.disconnect();
+
+    const signature = () => {
+        const badges = new Set();
+        for (const sel of badgeSelectors) {
+            try { target.querySelectorAll(sel).forEach((b) => badges.add(b)); }
+            catch (e) { /* invalid selector in this DOM — skip */ }
+        }
+        return Array.from(badges, (b) => b.innerText.trim() || "?").join(",");
+    };
+
+    let last = signature(), timer = null;
+    state.observer = new MutationObserver(() => {
+        if (timer) return;
+        timer = setTimeout(() => {
+            timer = null;
+            const current = signature();
+            if (current !== last) {
+                last = current;
+                window[binding](current);
+            }
+        }, debounceMs);
+    });
+    state.observer.observe(target, {childList: true, subtree: true, characterData: true});
+    state.target = target;
+    return true;
+}
+"""
+
+UNREAD_BINDING       = "__aiEmployeeUnreadChanged"
+OBSERVER_DEBOUNCE_MS = 250      # coalesce re-render bursts into one callback
+EVENT_PUMP_MS        = 250      # idle slice while waiting for observer callbacks
+
+# Memory watchdog — 0 disables a limit
+MAX_BROWSER_MB        = int(os.getenv("WHATSAPP_MAX_BROWSER_MB", "1500"))
+MAX_JS_HEAP_MB        = int(os.getenv("WHATSAPP_MAX_JS_HEAP_MB", "768"))
+MEMORY_CHECK_S        = int(os.getenv("WHATSAPP_MEMORY_CHECK_S", "300"))
+RECYCLE_MIN_UPTIME_S  = 600     # never recycle a browser younger than this
+
+# Selector calibration — seconds between full probes of every selector (0 = off)
+SELECTOR_RECALIBRATE_S = int(os.getenv("WHATSAPP_SELECTOR_RECALIBRATE_S", "21600"))
+PROBE_SAMPLE_ROWS      = 20
+
 WHATSAPP_WEB_URL     = "https://web.whatsapp.com"
 CHAT_LIST_TIMEOUT_MS = 90_000   # 90 s — allow ample time for post-QR-scan load
 POLL_TIMEOUT_MS      = 10_000   # 10 s — page is already open, should be fast
@@ -194,6 +420,9 @@ class WhatsAppWatcher(BaseWatcher):
         headless:       Run Chromium without a visible window. Set False for
                         first run to scan the QR code. Default True.
         keywords:       Keyword filter list. Default FILTER_KEYWORDS.
+        event_mode:     Install a MutationObserver on the chat list and poll
+                        as soon as unread badges change. check_interval then
+                        only drives a reconciliation pass. Default False.
     """
 
     def __init__(
@@ -203,6 +432,7 @@ class WhatsAppWatcher(BaseWatcher):
         check_interval: int = 30,
         headless: bool = True,
         keywords: Optional[list[str]] = None,
+        event_mode: bool = False,
     ) -> None:
         super().__init__(vault_path, check_interval)
 
@@ -213,24 +443,36 @@ class WhatsAppWatcher(BaseWatcher):
         )
         self.headless = headless
         self.keywords = [kw.lower() for kw in (keywords or FILTER_KEYWORDS)]
+        self.event_mode = event_mode
 
         # Deduplication: persist hashes of processed message previews
         self.state_path: Path = self.vault_path / ".whatsapp_watcher_state.json"
+        # Watchdog counters (recycles, last sample) — persisted with the hashes
+        self.browser_metrics: dict = {}
+        # Top unpinned chat row of the last fully processed poll — extraction
+        # stops there. The candidate is promoted once its messages are written.
+        self.chat_list_marker: Optional[str] = None
+        self._marker_candidate: Optional[tuple[str, list[str]]] = None
+        # Hit-rate ranking of the selector lists — replaced by the saved one
+        self.selectors = SelectorCalibrator(SELECTOR_LISTS, recalibrate_every=SELECTOR_RECALIBRATE_S)
         self.processed_hashes: set[str] = self._load_state()
 
         # Playwright objects — initialised lazily in _ensure_browser()
         self._playwright = None
+        self._browser = None        # set only when attached to the shared broker
         self._context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
-        # Caches whichever CHAT_LIST_SELECTORS entry worked last, so we try
-        # it first on the next poll (avoids cycling through all fallbacks).
-        self._active_chat_list_sel: Optional[str] = None
+        # expose_binding() is per context — re-registered after a relaunch
+        self._binding_installed = False
+        self._browser_started = 0.0
+        self._last_memory_check = 0.0
 
         self.logger.info(
             f"WhatsAppWatcher ready | "
             f"session={self.session_path} | "
             f"headless={self.headless} | "
-            f"keywords={self.keywords}"
+            f"keywords={self.keywords} | "
+            f"events={self.event_mode}"
         )
 
     # ------------------------------------------------------------------
@@ -243,6 +485,13 @@ class WhatsAppWatcher(BaseWatcher):
             try:
                 data = json.loads(self.state_path.read_text(encoding="utf-8"))
                 hashes = set(data.get("processed_hashes", []))
+                self.browser_metrics = data.get("browser", {})
+                self.chat_list_marker = data.get("chat_list_marker")
+                self.selectors = SelectorCalibrator(
+                    SELECTOR_LISTS,
+                    saved=data.get("selectors"),
+                    recalibrate_every=SELECTOR_RECALIBRATE_S,
+                )
                 self.logger.info(
                     f"Loaded {len(hashes)} processed message hash(es) from state"
                 )
@@ -255,7 +504,12 @@ class WhatsAppWatcher(BaseWatcher):
         """Persist processed hashes to disk."""
         self.state_path.write_text(
             json.dumps(
-                {"processed_hashes": sorted(self.processed_hashes)},
+                {
+                    "processed_hashes": sorted(self.processed_hashes),
+                    "browser": self.browser_metrics,
+                    "chat_list_marker": self.chat_list_marker,
+                    "selectors": self.selectors.to_dict(),
+                },
                 indent=2,
             ),
             encoding="utf-8",
@@ -288,19 +542,26 @@ class WhatsAppWatcher(BaseWatcher):
 
         self._playwright = sync_playwright().start()
 
-        self._context = self._playwright.chromium.launch_persistent_context(
-            str(self.session_path),
-            headless=self.headless,
-            # Mimic a realistic desktop browser to avoid bot detection
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/121.0.0.0 Safari/537.36"
-            ),
-            viewport={"width": 1280, "height": 900},
-            locale="en-GB",
-            args=["--no-sandbox", "--disable-blink-features=AutomationControlled"],
-        )
+        # Orchestrator with BROWSER_SHARED=true: attach to the broker's
+        # Chromium, whose default context is backed by our session folder
+        broker = BrowserBroker.shared()
+        shared = broker.persistent_context(self._playwright, self.session_path) if broker else None
+        if shared:
+            self._browser, self._context = shared
+            self.logger.info("Attached to shared Chromium (BrowserBroker)")
+        else:
+            self._context = self._playwright.chromium.launch_persistent_context(
+                str(self.session_path),
+                headless=self.headless,
+                # Mimic a realistic desktop browser to avoid bot detection
+                user_agent=DESKTOP_USER_AGENT,
+                viewport={"width": 1280, "height": 900},
+                locale="en-GB",
+                args=launch_args("--no-sandbox", "--disable-blink-features=AutomationControlled"),
+            )
+
+        self._browser_started = time.monotonic()
+        self._last_memory_check = self._browser_started
 
         # Reuse an existing page or open a new one
         self._page = (
@@ -308,17 +569,32 @@ class WhatsAppWatcher(BaseWatcher):
             if self._context.pages
             else self._context.new_page()
         )
+        # Text previews only — keep avatars/media/fonts off the wire
+        block_heavy_resources(self._page, block_images=self.headless)
 
         self._navigate_to_whatsapp()
         return self._page
 
-    def _first_matching_selector(self, page: "Page", selectors: list[str], timeout_ms: int) -> Optional[str]:
+    def _first_matching_selector(
+        self, page: "Page", selectors: list[str], timeout_ms: int, list_name: Optional[str] = None
+    ) -> Optional[str]:
         """
         Try each selector in order with a short per-selector timeout.
         Returns the first selector that finds a visible element, or None.
         The total wall-clock time is at most timeout_ms.
+
+        An element that is already rendered is found by one in-page check
+        first, with no timeouts. The outcome is recorded for list_name.
         """
-        import time
+        try:
+            present = page.evaluate(FIRST_VISIBLE_JS, selectors)
+        except Exception as exc:
+            self.logger.debug(f"Selector presence check failed: {exc}")
+            present = None
+        if present:
+            self._record_selector_walk(list_name, selectors, present)
+            return present
+
         per_sel_ms  = max(1_000, timeout_ms // max(len(selectors), 1))
         deadline    = time.monotonic() + timeout_ms / 1000.0
 
@@ -329,6 +605,7 @@ class WhatsAppWatcher(BaseWatcher):
             try:
                 page.wait_for_selector(sel, timeout=min(per_sel_ms, remaining_ms))
                 self.logger.debug(f"Selector matched: {sel!r}")
+                self._record_selector_walk(list_name, selectors, sel)
                 return sel
             except PWTimeoutError:
                 self.logger.debug(f"Selector not found: {sel!r}")
@@ -338,6 +615,10 @@ class WhatsAppWatcher(BaseWatcher):
                 continue
         return None
 
+    def _record_selector_walk(self, list_name: Optional[str], selectors: list[str], winner: str) -> None:
+        if list_name:
+            self.selectors.record_first_match(list_name, selectors, winner)
+
     def _navigate_to_whatsapp(self) -> None:
         """
         Navigate to WhatsApp Web and wait for the chat list using fallback
@@ -382,11 +663,12 @@ class WhatsAppWatcher(BaseWatcher):
 
         # Wait for the chat list using multiple fallback selectors
         matched = self._first_matching_selector(
-            page, CHAT_LIST_SELECTORS, timeout_ms=CHAT_LIST_TIMEOUT_MS
+            page, self._chat_list_candidates(), timeout_ms=CHAT_LIST_TIMEOUT_MS,
+            list_name="chat_list",
         )
         if matched:
             self.logger.info(f"WhatsApp Web loaded — session active (matched: {matched!r})")
-            self._active_chat_list_sel = matched  # remember which one worked
+            self._install_unread_observer(matched)
         else:
             # Non-fatal: log and let the poll skip rather than crashing the loop
             self.logger.warning(
@@ -398,19 +680,162 @@ class WhatsAppWatcher(BaseWatcher):
             self._page = None
 
     # ------------------------------------------------------------------
-    # BaseWatcher interface — check_for_updates
+    # Memory watchdog
     # ------------------------------------------------------------------
 
-    def _query_any(self, element, selectors: list[str]) -> Optional[object]:
-        """Try each selector against an element, return the first match or None."""
-        for sel in selectors:
+    def _check_browser_memory(self) -> None:
+        """
+        Sample browser memory at most every MEMORY_CHECK_S and recycle the
+        context when a limit is exceeded. Cheap: one /proc scan plus one CDP
+        call.
+        """
+        if not self._memory_check_due():
+            return
+        sample = self._memory_sample(js_heap_mb(self._page))
+        reason = self._recycle_reason(sample)
+        if reason:
+            self._recycle_browser(reason, sample)
+
+    def _memory_check_due(self) -> bool:
+        """True (and restarts the clock) when a memory sample is due."""
+        if not self._page or self._page.is_closed():
+            return False
+        now = time.monotonic()
+        if now - self._last_memory_check < MEMORY_CHECK_S:
+            return False
+        self._last_memory_check = now
+        return True
+
+    def _memory_sample(self, heap_mb: Optional[float]) -> dict:
+        """Measure the browser process tree and record it with the JS heap size."""
+        pid    = find_browser_pid(self.session_path)
+        usage  = process_tree_usage(pid, include_root=True) if pid else None
+        sample = {
+            "at":          datetime.now(timezone.utc).isoformat(),
+            "browser_mb":  usage["pss_mb"] if usage else None,
+            "processes":   usage["processes"] if usage else None,
+            "js_heap_mb":  heap_mb,
+            "uptime_h":    round((time.monotonic() - self._browser_started) / 3600, 2),
+        }
+        self.browser_metrics["last_sample"] = sample
+        self.logger.debug(f"Browser memory: {sample}")
+        return sample
+
+    def _recycle_reason(self, sample: dict) -> Optional[str]:
+        """Why the browser should be recycled now, or None."""
+        over = []
+        if MAX_BROWSER_MB and sample["browser_mb"] and sample["browser_mb"] > MAX_BROWSER_MB:
+            over.append(f"browser {sample['browser_mb']} MB > {MAX_BROWSER_MB} MB")
+        if MAX_JS_HEAP_MB and sample["js_heap_mb"] and sample["js_heap_mb"] > MAX_JS_HEAP_MB:
+            over.append(f"JS heap {sample['js_heap_mb']} MB > {MAX_JS_HEAP_MB} MB")
+        if not over:
+            return None
+
+        reason = "; ".join(over)
+        age = time.monotonic() - self._browser_started
+        if age < RECYCLE_MIN_UPTIME_S:
+            self.logger.warning(
+                f"Browser memory over limit ({reason}) only "
+                f"{int(age)}s after launch — "
+                "not recycling; consider raising the limit"
+            )
+            return None
+        return reason
+
+    def _recycle_browser(self, reason: str, sample: dict) -> None:
+        """
+        Close the persistent context (flushing cookies/IndexedDB to
+        session_path) so the next _ensure_browser() starts a fresh Chromium
+        on the same profile — WhatsApp stays logged in.
+        """
+        self.logger.warning(
+            f"Recycling WhatsApp browser — {reason} (uptime {sample['uptime_h']}h)"
+        )
+        shared = self._browser is not None
+        self._teardown()
+        if shared:
+            # Our profile is the broker's Chromium — it has to restart it
+            BrowserBroker.shared().recycle(f"WhatsApp watchdog: {reason}")
+        self._record_recycle(reason, sample)
+
+    def _record_recycle(self, reason: str, sample: dict) -> None:
+        """Count the recycle in the state file and the audit log."""
+        self.browser_metrics["recycles"] = self.browser_metrics.get("recycles", 0) + 1
+        self.browser_metrics["last_recycle"] = {**sample, "reason": reason}
+        self._save_state()
+        log_action(
+            "browser_recycled",
+            "whatsapp_watcher",
+            str(self.session_path),
+            notes=(
+                f"{reason} | uptime {sample['uptime_h']}h | "
+                f"recycle #{self.browser_metrics['recycles']}"
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Event mode — MutationObserver → expose_binding → wake()
+    # ------------------------------------------------------------------
+
+    def _install_unread_observer(self, list_selector: str) -> None:
+        """
+        Attach the in-page unread observer to the chat list (event mode only).
+        Safe to call on every poll: the script re-attaches only when the
+        observed node was replaced or the page reloaded.
+        """
+        if not self.event_mode or not self._page:
+            return
+        try:
+            if not self._binding_installed:
+                self._context.expose_binding(UNREAD_BINDING, self._on_unread_changed)
+                self._binding_installed = True
+            attached = self._page.evaluate(
+                INSTALL_UNREAD_OBSERVER_JS, self._observer_args(list_selector)
+            )
+            if not attached:
+                self.logger.debug(f"Unread observer not attached — {list_selector!r} not found")
+        except Exception as exc:
+            # Interval polling still covers us; retry on the next poll
+            self.logger.warning(f"Could not install unread observer: {exc}")
+
+    def _observer_args(self, list_selector: str) -> dict:
+        return {
+            "listSelector":   list_selector,
+            "badgeSelectors": self.selectors.ordered("badge"),
+            "binding":        UNREAD_BINDING,
+            "debounceMs":     OBSERVER_DEBOUNCE_MS,
+        }
+
+    def _on_unread_changed(self, source: dict, signature: str) -> None:
+        """Binding callback — runs on the watcher thread while Playwright pumps events."""
+        self.logger.debug(f"Unread badges changed: [{signature}] — polling now")
+        self.wake()
+
+    def _sleep(self, seconds: float) -> None:
+        """
+        In event mode, idle inside short page.wait_for_timeout() slices so
+        Playwright dispatches observer callbacks (which call wake()) while we
+        wait. Falls back to the plain BaseWatcher wait when no page is open.
+        """
+        if not self.event_mode or not self._page or self._page.is_closed():
+            super()._sleep(seconds)
+            return
+
+        deadline = time.monotonic() + seconds
+        while not self._wake.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
             try:
-                el = element.query_selector(sel)
-                if el:
-                    return el
-            except Exception:
-                continue
-        return None
+                self._page.wait_for_timeout(min(EVENT_PUMP_MS, remaining * 1000))
+            except Exception as exc:
+                self.logger.debug(f"Event pump stopped ({exc}) — plain wait until next poll")
+                super()._sleep(max(0.0, deadline - time.monotonic()))
+                return
+
+    # ------------------------------------------------------------------
+    # BaseWatcher interface — check_for_updates
+    # ------------------------------------------------------------------
 
     def check_for_updates(self) -> list[dict]:
         """
@@ -429,7 +854,13 @@ class WhatsAppWatcher(BaseWatcher):
             navigate back (without a full browser restart).
           - Uses fallback selector lists for chat rows, titles, previews and
             unread badges so the watcher survives WhatsApp DOM updates.
+          - All rows are read by one page.evaluate() (EXTRACT_CHAT_ROWS_JS)
+            instead of several query_selector/inner_text round trips per row.
+          - Incremental: extraction stops at the last-seen top row
+            (chat_list_marker), so only chats with new activity since the
+            last poll — plus pinned chats — are read.
         """
+        self._check_browser_memory()
         page = self._ensure_browser()
         if page is None:
             # _navigate_to_whatsapp failed — will retry on next interval
@@ -444,12 +875,24 @@ class WhatsAppWatcher(BaseWatcher):
             page = self._page
 
         # Confirm the chat list is still rendered (no full reload needed)
-        active_sel = getattr(self, "_active_chat_list_sel", None)
-        candidates = ([active_sel] + CHAT_LIST_SELECTORS) if active_sel else CHAT_LIST_SELECTORS
-        matched = self._first_matching_selector(page, candidates, timeout_ms=POLL_TIMEOUT_MS)
+        matched = self._first_matching_selector(
+            page, self._chat_list_candidates(), timeout_ms=POLL_TIMEOUT_MS,
+            list_name="chat_list",
+        )
         if not matched:
             self.logger.warning("Chat list not visible — skipping this poll")
             return []
+        self._install_unread_observer(matched)
+
+        if self.selectors.recalibration_due():
+            try:
+                self.selectors.record_probe(page.evaluate(PROBE_SELECTORS_JS, self._probe_args()))
+                self.logger.debug(
+                    "Selectors re-calibrated: "
+                    + ", ".join(f"{n}={self.selectors.ordered(n)[0]!r}" for n in SELECTOR_LISTS)
+                )
+            except Exception as exc:
+                self.logger.debug(f"Selector probe failed: {exc}")
 
         # Dismiss any "Use Here" popup that appeared since last poll
         try:
@@ -460,85 +903,116 @@ class WhatsAppWatcher(BaseWatcher):
         except PWTimeoutError:
             pass
 
-        # ── Collect chat rows ────────────────────────────────────────────────
-        chat_rows = []
-        for row_sel in CHAT_ROW_SELECTORS:
-            try:
-                rows = page.query_selector_all(row_sel)
-                if rows:
-                    chat_rows = rows
-                    self.logger.debug(f"Chat rows ({len(rows)}) via {row_sel!r}")
-                    break
-            except Exception:
-                continue
+        # ── Extract new chat rows in one round trip ─────────────────────────
+        self._promote_marker()
+        try:
+            extracted = page.evaluate(EXTRACT_CHAT_ROWS_JS, self._extract_args())
+        except Exception as exc:
+            self.logger.warning(f"Chat row extraction failed: {exc}")
+            return []
+        return self._messages_from_extraction(extracted)
+
+    def _chat_list_candidates(self) -> list[str]:
+        """CHAT_LIST_SELECTORS, best hit rate first."""
+        return self.selectors.ordered("chat_list")
+
+    def _extract_args(self) -> dict:
+        """Arguments for EXTRACT_CHAT_ROWS_JS (calibrated selector order)."""
+        return {
+            "rowSelectors":     self.selectors.ordered("chat_row"),
+            "titleSelectors":   self.selectors.ordered("title"),
+            "previewSelectors": self.selectors.ordered("preview"),
+            "timeSelectors":    self.selectors.ordered("time"),
+            "badgeSelectors":   self.selectors.ordered("badge"),
+            "pinnedSelectors":  self.selectors.ordered("pinned"),
+            "stopAt":           self.chat_list_marker,
+        }
+
+    def _probe_args(self) -> dict:
+        """Arguments for PROBE_SELECTORS_JS."""
+        return {
+            "documentLists": {name: self.selectors.ordered(name) for name in ("chat_list", "chat_row")},
+            "rowLists":      {name: self.selectors.ordered(name) for name in ("title", "preview", "time", "badge", "pinned")},
+            "rowSelectors":  self.selectors.ordered("chat_row"),
+            "sampleRows":    PROBE_SAMPLE_ROWS,
+        }
+
+    def _messages_from_extraction(self, extracted: dict) -> list[dict]:
+        """
+        Turn EXTRACT_CHAT_ROWS_JS output into new message dicts: unread rows
+        that match a keyword and have not been processed yet. Also proposes
+        the next chat-list marker.
+        """
+        for name, counts in (extracted.get("stats") or {}).items():
+            self.selectors.record(name, hits=counts.get("hits"), misses=counts.get("misses"))
+        if self.selectors.changed:
+            self._save_state()
 
-        if not chat_rows:
+        chat_rows = extracted.get("rows") or []
+        if not chat_rows and extracted.get("stopped") is None:
             self.logger.warning("No chat rows found — WhatsApp DOM may have changed")
             return []
+        self.logger.debug(
+            f"Chat rows ({len(chat_rows)}) via {extracted.get('selector')!r}"
+            + (f", stopped at marker row {extracted['stopped']}" if extracted.get("stopped") is not None else "")
+        )
 
-        # ── Scan rows for unread + keyword matches ───────────────────────────
+        # ── Filter unread rows for keyword matches ───────────────────────────
         messages:    list[dict] = []
         total_unread = 0
 
         for row in chat_rows:
-            try:
-                # Unread badge — try each selector
-                badge = self._query_any(row, UNREAD_BADGE_SELECTORS)
-                if not badge:
-                    continue
-                total_unread += 1
-
-                unread_count_text = badge.inner_text().strip() or "?"
-
-                # Sender name — try each selector, also check span[title] attribute
-                title_el = self._query_any(row, CHAT_TITLE_SELECTORS)
-                if title_el:
-                    # prefer the title attribute (renders the full name without ellipsis)
-                    sender = title_el.get_attribute("title") or title_el.inner_text().strip()
-                else:
-                    sender = "Unknown"
-
-                # Message preview — try each selector
-                preview_el = self._query_any(row, LAST_MSG_SELECTORS)
-                preview    = preview_el.inner_text().strip() if preview_el else ""
-
-                # If we got nothing useful, fall back to the whole row text
-                if not sender and not preview:
-                    row_text = row.inner_text().strip()
-                    lines    = [l.strip() for l in row_text.splitlines() if l.strip()]
-                    sender   = lines[0] if lines else "Unknown"
-                    preview  = " ".join(lines[1:]) if len(lines) > 1 else ""
-
-                # Keyword filter
-                combined = f"{sender} {preview}".lower()
-                if not any(kw in combined for kw in self.keywords):
-                    self.logger.debug(f"Skipping unread from '{sender}' — no keyword match")
-                    continue
-
-                # Deduplication
-                msg_hash = self._make_hash(sender, preview)
-                if msg_hash in self.processed_hashes:
-                    self.logger.debug(f"Skipping already-seen message from '{sender}'")
-                    continue
-
-                messages.append({
-                    "hash":             msg_hash,
-                    "sender":           sender,
-                    "preview":          preview,
-                    "unread_count":     unread_count_text,
-                    "matched_keywords": [kw for kw in self.keywords if kw in combined],
-                })
+            if row.get("unread") is None:
+                continue
+            total_unread += 1
 
-            except Exception as exc:
-                self.logger.warning(f"Error reading chat row: {exc}")
+            sender  = row.get("sender") or "Unknown"
+            preview = row.get("preview") or ""
+
+            # Keyword filter
+            combined = f"{sender} {preview}".lower()
+            if not any(kw in combined for kw in self.keywords):
+                self.logger.debug(f"Skipping unread from '{sender}' — no keyword match")
                 continue
 
+            # Deduplication
+            msg_hash = self._make_hash(sender, preview)
+            if msg_hash in self.processed_hashes:
+                self.logger.debug(f"Skipping already-seen message from '{sender}'")
+                continue
+
+            messages.append({
+                "hash":             msg_hash,
+                "sender":           sender,
+                "preview":          preview,
+                "unread_count":     row["unread"],
+                "matched_keywords": [kw for kw in self.keywords if kw in combined],
+            })
+
+        head = extracted.get("head")
+        if head and head != self.chat_list_marker:
+            self._marker_candidate = (head, [m["hash"] for m in messages])
+
         self.logger.info(
             f"WhatsApp poll: {total_unread} unread chats scanned, "
             f"{len(messages)} new keyword-matching message(s)"
         )
         return messages
 
+    def _promote_marker(self) -> None:
+        """
+        Adopt last poll's top row as the stop marker once every message
+        returned with it has an action file — a failed write keeps the old
+        marker so the row is read (and offered) again.
+        """
+        if not self._marker_candidate:
+            return
+        head, hashes = self._marker_candidate
+        if all(h in self.processed_hashes for h in hashes):
+            self.chat_list_marker = head
+            self._marker_candidate = None
+            self._save_state()
+
     # ------------------------------------------------------------------
     # BaseWatcher interface — create_action_file
     # ------------------------------------------------------------------
@@ -671,7 +1145,9 @@ matched_keywords: [{", ".join(matched_kws)}]
     def _teardown(self) -> None:
         """Close Playwright resources cleanly."""
         try:
-            if self._context:
+            if self._browser:
+                self._browser.close()   # shared Chromium — disconnect only
+            elif self._context:
                 self._context.close()
         except Exception:
             pass
@@ -680,14 +1156,17 @@ matched_keywords: [{", ".join(matched_kws)}]
                 self._playwright.stop()
         except Exception:
             pass
+        self._browser   = None
         self._context   = None
         self._page      = None
         self._playwright = None
+        self._binding_installed = False
 
     def shutdown(self) -> None:
         """Called by BaseWatcher.run() on graceful exit."""
         self.logger.info("Closing Playwright browser...")
         self._teardown()
+        self._save_state()      # keep this run's selector hit counts
         self.logger.info("WhatsAppWatcher stopped.")
 
 
@@ -743,6 +1222,14 @@ if __name__ == "__main__":
             "Example: --keywords urgent invoice contract"
         ),
     )
+    parser.add_argument(
+        "--events",
+        action="store_true",
+        help=(
+            "Event mode: react to unread-badge changes via a MutationObserver; "
+            "--interval becomes a reconciliation pass (use e.g. 300)"
+        ),
+    )
     args = parser.parse_args()
 
     watcher = WhatsAppWatcher(
@@ -751,5 +1238,6 @@ if __name__ == "__main__":
         check_interval=args.interval,
         headless=not args.no_headless,
         keywords=args.keywords,
+        event_mode=args.events,
     )
     watcher.run()
@@ -0,0 +1,353 @@
+"""
+whatsapp_watcher_async.py — WhatsApp Watcher on playwright.async_api
+
+Same behaviour, state file and action files as whatsapp_watcher.py, but
+every browser call is awaited, so the watcher runs as a task on an asyncio
+event loop instead of owning a thread. The orchestrator's --asyncio mode runs
+it next to AsyncLinkedInWatcher on one loop.
+
+What changes compared with the sync watcher:
+    - Event mode needs no page.wait_for_timeout() pump: the event loop
+      dispatches observer callbacks while the watcher sleeps, and the
+      callback wakes the sleep directly.
+    - A QR code in headless mode stops this watcher only (the sync watcher
+      calls sys.exit(), which would end the whole event loop).
+    - With BROWSER_SHARED=true the shared Chromium is reached over CDP the
+      same way; waiting for a broker relaunch happens off the loop.
+
+Parsing, keyword filtering, deduplication, markers and memory limits are
+inherited from WhatsAppWatcher unchanged.
+
+Usage:
+    python whatsapp_watcher_async.py --no-headless      # first run (QR scan)
+    python whatsapp_watcher_async.py --events --interval 300
+"""
+
+import asyncio
+import sys
+import time
+from typing import Optional
+
+try:
+    from playwright.async_api import (
+        Page,
+        async_playwright,
+        TimeoutError as PWTimeoutError,
+    )
+except ImportError:
+    print(
+        "ERROR: playwright not installed.\n"
+        "Run: uv sync && uv run playwright install chromium",
+        file=sys.stderr,
+    )
+    sys.exit(1)
+
+from base_watcher import AsyncWatcherMixin
+from browser_pool import DESKTOP_USER_AGENT, BrowserBroker
+from browser_profile import block_heavy_resources_async, js_heap_mb_async, launch_args
+from whatsapp_watcher import (
+    CHAT_LIST_TIMEOUT_MS,
+    EXTRACT_CHAT_ROWS_JS,
+    FIRST_VISIBLE_JS,
+    INSTALL_UNREAD_OBSERVER_JS,
+    POLL_TIMEOUT_MS,
+    PROBE_SELECTORS_JS,
+    SEL_QR_CODE,
+    SEL_USE_HERE_BTN,
+    UNREAD_BINDING,
+    WHATSAPP_WEB_URL,
+    WhatsAppWatcher,
+)
+
+
+class AsyncWhatsAppWatcher(AsyncWatcherMixin, WhatsAppWatcher):
+    """
+    WhatsAppWatcher driven by playwright.async_api. Run with
+    `await watcher.run_async()`; run() is not supported.
+
+    Args: as WhatsAppWatcher.
+    """
+
+    # ------------------------------------------------------------------
+    # Browser lifecycle (keep-alive across polls)
+    # ------------------------------------------------------------------
+
+    async def _ensure_browser_async(self) -> Optional[Page]:
+        """Start Playwright + persistent context if needed; returns the WhatsApp page."""
+        if self._page and not self._page.is_closed():
+            return self._page
+
+        self.logger.info("Launching Playwright Chromium (persistent context, asyncio)...")
+
+        self.session_path.mkdir(parents=True, exist_ok=True)
+
+        self._playwright = await async_playwright().start()
+
+        broker = BrowserBroker.shared()
+        if broker and broker.owns(self.session_path):
+            # endpoint() blocks while the broker relaunches Chromium
+            endpoint = await asyncio.to_thread(broker.endpoint)
+            self._browser = await self._playwright.chromium.connect_over_cdp(endpoint)
+            self._context = self._browser.contexts[0]
+            self.logger.info("Attached to shared Chromium (BrowserBroker)")
+        else:
+            self._context = await self._playwright.chromium.launch_persistent_context(
+                str(self.session_path),
+                headless=self.headless,
+                user_agent=DESKTOP_USER_AGENT,
+                viewport={"width": 1280, "height": 900},
+                locale="en-GB",
+                args=launch_args("--no-sandbox", "--disable-blink-features=AutomationControlled"),
+            )
+
+        self._browser_started = time.monotonic()
+        self._last_memory_check = self._browser_started
+
+        self._page = (
+            self._context.pages[0]
+            if self._context.pages
+            else await self._context.new_page()
+        )
+        await block_heavy_resources_async(self._page, block_images=self.headless)
+
+        await self._navigate_to_whatsapp_async()
+        return self._page
+
+    async def _first_matching_selector_async(
+        self, page: Page, selectors: list[str], timeout_ms: int, list_name: Optional[str] = None
+    ) -> Optional[str]:
+        """Async _first_matching_selector(): first visible selector within timeout_ms."""
+        try:
+            present = await page.evaluate(FIRST_VISIBLE_JS, selectors)
+        except Exception as exc:
+            self.logger.debug(f"Selector presence check failed: {exc}")
+            present = None
+        if present:
+            self._record_selector_walk(list_name, selectors, present)
+            return present
+
+        per_sel_ms  = max(1_000, timeout_ms // max(len(selectors), 1))
+        deadline    = time.monotonic() + timeout_ms / 1000.0
+
+        for sel in selectors:
+            remaining_ms = int((deadline - time.monotonic()) * 1000)
+            if remaining_ms <= 0:
+                break
+            try:
+                await page.wait_for_selector(sel, timeout=min(per_sel_ms, remaining_ms))
+                self.logger.debug(f"Selector matched: {sel!r}")
+                self._record_selector_walk(list_name, selectors, sel)
+                return sel
+            except PWTimeoutError:
+                self.logger.debug(f"Selector not found: {sel!r}")
+            except Exception as exc:
+                self.logger.debug(f"Selector error ({sel!r}): {exc}")
+        return None
+
+    async def _dismiss_use_here(self, page: Page, timeout_ms: int) -> None:
+        """Click WhatsApp's "Use Here" popup if it shows up within timeout_ms."""
+        try:
+            btn = await page.wait_for_selector(SEL_USE_HERE_BTN, timeout=timeout_ms)
+            if btn:
+                self.logger.info('Dismissing "Use Here" popup')
+                await btn.click()
+        except PWTimeoutError:
+            pass
+
+    async def _navigate_to_whatsapp_async(self) -> None:
+        """Async _navigate_to_whatsapp(): load WhatsApp Web and wait for the chat list."""
+        page = self._page
+        self.logger.info(f"Navigating to {WHATSAPP_WEB_URL}")
+        await page.goto(WHATSAPP_WEB_URL, wait_until="domcontentloaded")
+
+        await self._dismiss_use_here(page, 3_000)
+
+        try:
+            qr = await page.wait_for_selector(SEL_QR_CODE, timeout=4_000)
+            if qr:
+                if self.headless:
+                    self.logger.error(
+                        "WhatsApp QR code detected in headless mode.\n"
+                        "  Fix: run once with --no-headless to scan the QR code,\n"
+                        "  then restart normally. Session will be saved automatically.\n"
+                        "  Stopping this watcher."
+                    )
+                    await self._teardown_async()
+                    self._running = False
+                    return
+                self.logger.info(
+                    "QR code displayed — scan it with your phone now.\n"
+                    "Waiting up to 90 seconds for you to scan..."
+                )
+        except PWTimeoutError:
+            pass
+
+        matched = await self._first_matching_selector_async(
+            page, self._chat_list_candidates(), timeout_ms=CHAT_LIST_TIMEOUT_MS,
+            list_name="chat_list",
+        )
+        if matched:
+            self.logger.info(f"WhatsApp Web loaded — session active (matched: {matched!r})")
+            await self._install_unread_observer_async(matched)
+        else:
+            self.logger.warning(
+                "Chat list did not appear within timeout. "
+                "WhatsApp may still be loading — will retry on next poll interval.\n"
+                "If this persists: run with --no-headless to inspect the browser state."
+            )
+            self._page = None
+
+    # ------------------------------------------------------------------
+    # Memory watchdog
+    # ------------------------------------------------------------------
+
+    async def _check_browser_memory_async(self) -> None:
+        if not self._memory_check_due():
+            return
+        heap_mb = await js_heap_mb_async(self._page)
+        # /proc scan — off the loop, it reads one file per Chromium process
+        sample = await asyncio.to_thread(self._memory_sample, heap_mb)
+        reason = self._recycle_reason(sample)
+        if not reason:
+            return
+
+        self.logger.warning(
+            f"Recycling WhatsApp browser — {reason} (uptime {sample['uptime_h']}h)"
+        )
+        shared = self._browser is not None
+        await self._teardown_async()
+        if shared:
+            await asyncio.to_thread(
+                BrowserBroker.shared().recycle, f"WhatsApp watchdog: {reason}"
+            )
+        self._record_recycle(reason, sample)
+
+    # ------------------------------------------------------------------
+    # Event mode — the binding callback runs on the event loop
+    # ------------------------------------------------------------------
+
+    async def _install_unread_observer_async(self, list_selector: str) -> None:
+        if not self.event_mode or not self._page:
+            return
+        try:
+            if not self._binding_installed:
+                await self._context.expose_binding(UNREAD_BINDING, self._on_unread_changed)
+                self._binding_installed = True
+            attached = await self._page.evaluate(
+                INSTALL_UNREAD_OBSERVER_JS, self._observer_args(list_selector)
+            )
+            if not attached:
+                self.logger.debug(f"Unread observer not attached — {list_selector!r} not found")
+        except Exception as exc:
+            self.logger.warning(f"Could not install unread observer: {exc}")
+
+    # ------------------------------------------------------------------
+    # AsyncWatcherMixin interface
+    # ------------------------------------------------------------------
+
+    async def check_for_updates_async(self) -> list[dict]:
+        """Async check_for_updates(): new keyword-matching unread previews."""
+        await self._check_browser_memory_async()
+        page = await self._ensure_browser_async()
+        if page is None:
+            return []
+
+        if "web.whatsapp.com" not in page.url:
+            self.logger.info("Page left WhatsApp Web — navigating back...")
+            await self._navigate_to_whatsapp_async()
+            if self._page is None:
+                return []
+            page = self._page
+
+        matched = await self._first_matching_selector_async(
+            page, self._chat_list_candidates(), timeout_ms=POLL_TIMEOUT_MS,
+            list_name="chat_list",
+        )
+        if not matched:
+            self.logger.warning("Chat list not visible — skipping this poll")
+            return []
+        await self._install_unread_observer_async(matched)
+
+        if self.selectors.recalibration_due():
+            try:
+                self.selectors.record_probe(await page.evaluate(PROBE_SELECTORS_JS, self._probe_args()))
+            except Exception as exc:
+                self.logger.debug(f"Selector probe failed: {exc}")
+
+        await self._dismiss_use_here(page, 1_500)
+
+        self._promote_marker()
+        try:
+            extracted = await page.evaluate(EXTRACT_CHAT_ROWS_JS, self._extract_args())
+        except Exception as exc:
+            self.logger.warning(f"Chat row extraction failed: {exc}")
+            return []
+        return self._messages_from_extraction(extracted)
+
+    def check_for_updates(self) -> list[dict]:
+        raise RuntimeError("AsyncWhatsAppWatcher runs under asyncio — use run_async()")
+
+    # ------------------------------------------------------------------
+    # Graceful shutdown
+    # ------------------------------------------------------------------
+
+    async def _teardown_async(self) -> None:
+        try:
+            if self._browser:
+                await self._browser.close()
+            elif self._context:
+                await self._context.close()
+        except Exception:
+            pass
+        try:
+            if self._playwright:
+                await self._playwright.stop()
+        except Exception:
+            pass
+        self._browser   = None
+        self._context   = None
+        self._page      = None
+        self._playwright = None
+        self._binding_installed = False
+
+    async def shutdown_async(self) -> None:
+        self.logger.info("Closing Playwright browser...")
+        await self._teardown_async()
+        self._save_state()      # keep this run's selector hit counts
+        self.logger.info("AsyncWhatsAppWatcher stopped.")
+
+    def shutdown(self) -> None:
+        # Playwright objects belong to the event loop — shutdown_async() closes them
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="AsyncWhatsAppWatcher — WhatsApp watcher on playwright.async_api",
+    )
+    parser.add_argument("--vault", default=".", help="Path to vault root (default: .)")
+    parser.add_argument("--session", default=None, help="Playwright session directory")
+    parser.add_argument("--interval", type=int, default=30, help="Seconds between polls (default: 30)")
+    parser.add_argument("--no-headless", action="store_true", dest="no_headless",
+                        help="Show browser window — required for first-run QR scan")
+    parser.add_argument("--keywords", nargs="+", default=None, metavar="WORD",
+                        help="Override keyword filter")
+    parser.add_argument("--events", action="store_true",
+                        help="Event mode: poll as soon as unread badges change")
+    args = parser.parse_args()
+
+    watcher = AsyncWhatsAppWatcher(
+        vault_path=args.vault,
+        session_path=args.session,
+        check_interval=args.interval,
+        headless=not args.no_headless,
+        keywords=args.keywords,
+        event_mode=args.events,
+    )
+    asyncio.run(watcher.run_async(handle_signals=True))
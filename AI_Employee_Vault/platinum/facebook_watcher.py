@@ -19,11 +19,11 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
-import httpx
 from dotenv import load_dotenv
 
 from base_watcher import BaseWatcher
 from audit_logger import log_action, log_watcher_start, log_watcher_stop, log_error
+from http_pool import shared_client
 
 GRAPH_API_BASE = "https://graph.facebook.com/v19.0"
 STATE_FILE_NAME = ".facebook_watcher_state.json"
@@ -75,7 +75,7 @@ class FacebookWatcher(BaseWatcher):
             self.logger.error("Missing FACEBOOK_PAGE_ID or FACEBOOK_ACCESS_TOKEN in .env")
             sys.exit(1)
 
-        self._http = httpx.Client(timeout=30.0)
+        self._http = shared_client()
 
     def _graph_get(self, path: str, params: dict | None = None) -> dict:
         full_params = {"access_token": self.page_token}
@@ -344,7 +344,6 @@ logged: false
 
     def shutdown(self) -> None:
         _save_state(self.vault_path, self.state)
-        self._http.close()
         log_watcher_stop("facebook_watcher")
 
 
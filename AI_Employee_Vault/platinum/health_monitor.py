@@ -25,9 +25,10 @@ import time
 from datetime import datetime, timezone
 from pathlib import Path
 
-import httpx
 from dotenv import load_dotenv
 
+from http_pool import shared_client
+
 # Vault root is platinum/ directory
 VAULT = Path(__file__).parent.resolve()
 load_dotenv(VAULT / ".env")
@@ -95,13 +96,14 @@ def check_odoo() -> str:
 
     Returns "healthy" if HTTP response < 500, or "unreachable: <error>" on failure.
     Uses verify=False because Odoo runs behind a self-signed certificate.
+    The shared pool keeps the connection between checks, and the page is
+    revalidated with its ETag, so an unchanged selector answers 304.
     """
     odoo_url = os.getenv("ODOO_URL", "https://localhost")
     try:
-        resp = httpx.get(
+        resp = shared_client(verify=False).get_conditional(
             f"{odoo_url}/web/database/selector",
             timeout=10,
-            verify=False,
             follow_redirects=True,
         )
         if resp.status_code < 500:
@@ -0,0 +1,203 @@
+"""
+http_pool.py — Platinum Tier shared HTTP client (same as Gold tier)
+
+Before this module, FacebookWatcher opened its own httpx.Client and
+health_monitor.check_odoo() a fresh connection (and TLS handshake) on every
+check. Now both share one process-wide pool:
+
+  - keep-alive: connections stay open for KEEPALIVE_EXPIRY seconds, so
+    polls a few minutes apart usually reuse the same TLS session;
+  - HTTP/2 when the `h2` package is installed and the server offers it
+    (graph.facebook.com does), several requests multiplexed on one
+    connection; HTTP/1.1 otherwise;
+  - per-host limits: at most PER_HOST_LIMIT requests in flight per host,
+    whichever thread sends them, so one busy watcher cannot take the whole
+    pool;
+  - conditional GETs: get_conditional() remembers ETag / Last-Modified and
+    revalidates with If-None-Match / If-Modified-Since. A 304 returns the
+    cached body, so data that rarely changes costs headers only. ETagCache
+    is also usable on its own, e.g. for Graph batch sub-requests.
+
+httpx.Client is thread-safe, so the watcher threads of the orchestrator all
+share one client (one per TLS-verification setting).
+
+Gmail keeps its own transport: the Google API client and its token refresh
+are built on httplib2/requests, not httpx.
+
+Usage:
+    from http_pool import shared_client
+    http = shared_client()                      # verify=False for self-signed
+    resp = http.post(url, json=payload, timeout=30)
+    resp = http.get_conditional(url, params={...})
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401 — httpx enables HTTP/2 only when h2 is importable
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+DEFAULT_TIMEOUT  = 30.0
+MAX_CONNECTIONS  = 20
+KEEPALIVE_EXPIRY = 120.0     # seconds an idle connection is kept for reuse
+PER_HOST_LIMIT   = 4         # requests in flight per host
+ETAG_CACHE_SIZE  = 256       # conditional-GET responses remembered
+
+
+class ETagCache:
+    """
+    Validators and bodies of cacheable responses, keyed by request (URL or
+    any string), least recently used evicted first.
+
+    Args:
+        max_entries: Responses kept.
+    """
+
+    def __init__(self, max_entries: int = ETAG_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def validators(self, key: str) -> dict[str, str]:
+        """Conditional request headers for `key` ({} when nothing cached)."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key: str, headers, content: bytes | str) -> None:
+        """Remember a 200 response if it carries ETag or Last-Modified."""
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            self._entries[key] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "content": content,
+                "content_type": headers.get("content-type"),
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def cached(self, key: str) -> Optional[dict]:
+        """The stored entry for a 304 answer to `key` (counts a hit), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        return entry
+
+
+class PooledClient(httpx.Client):
+    """httpx.Client with per-host concurrency limits and conditional GETs."""
+
+    def __init__(self, per_host_limit: int = PER_HOST_LIMIT, **kwargs):
+        super().__init__(**kwargs)
+        self.per_host_limit = per_host_limit
+        self.etags = ETagCache()
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._slots_lock = threading.Lock()
+
+    @contextmanager
+    def _host_slot(self, host: str):
+        with self._slots_lock:
+            slot = self._host_slots.setdefault(host, threading.BoundedSemaphore(self.per_host_limit))
+        with slot:
+            yield
+
+    def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        with self._host_slot(request.url.host):
+            return super().send(request, **kwargs)
+
+    def get_conditional(
+        self, url, *, params=None, headers=None, follow_redirects: bool | None = None, **kwargs
+    ) -> httpx.Response:
+        """
+        GET that revalidates a cached copy. A 304 is answered from the cache
+        as a 200 with response.extensions["from_cache"] = True.
+        """
+        request = self.build_request("GET", url, params=params, headers=headers, **kwargs)
+        key = str(request.url)
+        request.headers.update(self.etags.validators(key))
+        if follow_redirects is None:
+            response = self.send(request)
+        else:
+            response = self.send(request, follow_redirects=follow_redirects)
+
+        if response.status_code == 304:
+            entry = self.etags.cached(key)
+            if entry is not None:
+                cached = httpx.Response(
+                    200,
+                    content=entry["content"],
+                    headers={"content-type": entry["content_type"] or "application/octet-stream"},
+                    request=request,
+                    extensions={"from_cache": True},
+                )
+                logger.debug("304 Not Modified — served %s from cache", request.url.host)
+                return cached
+        elif response.status_code == 200:
+            self.etags.store(key, response.headers, response.content)
+        return response
+
+
+_clients: dict[bool, PooledClient] = {}
+_clients_lock = threading.Lock()
+
+
+def shared_client(verify: bool = True) -> PooledClient:
+    """
+    The process-wide client. TLS verification is a per-client setting in
+    httpx, so verify=False (self-signed Odoo) gets its own pool.
+    """
+    with _clients_lock:
+        client = _clients.get(verify)
+        if client is None or client.is_closed:
+            client = PooledClient(
+                http2=HTTP2_AVAILABLE,
+                verify=verify,
+                timeout=DEFAULT_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                ),
+            )
+            _clients[verify] = client
+            logger.debug(
+                "Shared HTTP client created (http2=%s, verify=%s)", HTTP2_AVAILABLE, verify
+            )
+        return client
+
+
+@atexit.register
+def close_all() -> None:
+    """Close every shared client (runs at interpreter exit)."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()